@@ -4,7 +4,16 @@ from librmm_cffi import librmm as rmm
 
 from cudf import core, datasets
 from cudf._version import get_versions
-from cudf.core import DataFrame, Index, MultiIndex, Series, from_pandas, merge
+from cudf.core import (
+    DataFrame,
+    Index,
+    JoinIndex,
+    MultiIndex,
+    Series,
+    from_pandas,
+    merge,
+)
+from cudf.core.memory import memory_profile
 from cudf.core.ops import (
     arccos,
     arcsin,
@@ -30,6 +39,7 @@ from cudf.io import (
     read_orc,
     read_parquet,
 )
+from cudf.utils.profiling import profile
 
 __version__ = get_versions()["version"]
 del get_versions
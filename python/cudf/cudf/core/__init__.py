@@ -9,5 +9,6 @@ from cudf.core.index import (
     Index,
     RangeIndex,
 )
+from cudf.core.join import JoinIndex
 from cudf.core.multiindex import MultiIndex
 from cudf.core.series import Series
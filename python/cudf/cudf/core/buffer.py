@@ -5,6 +5,7 @@ import numpy as np
 
 from librmm_cffi import librmm as rmm
 
+from cudf.core import memory, spill
 from cudf.utils import cudautils, utils
 
 
@@ -13,6 +14,10 @@ class Buffer(object):
     """
 
     _cached_ipch = None
+    _mem = None
+    _host = None
+    # Whether the device array was handed out by ``mem``
+    _exposed = False
 
     @classmethod
     def from_empty(cls, mem, size=0):
@@ -59,10 +64,38 @@ class Buffer(object):
             mem.shape = header.get("shape", len(mem))
             size = mem.shape[0]
         self.mem = cudautils.to_device(mem)
-        _BufferSentry(self.mem).ndim(1)
+        _BufferSentry(self._mem).ndim(1)
         self.size = size
         self.capacity = capacity
-        self.dtype = self.mem.dtype
+        self.dtype = self._mem.dtype
+
+    @property
+    def mem(self):
+        """The device array holding the data.
+
+        A buffer spilled by the ``cudf.core.spill`` manager is moved back
+        to the device when this is accessed. Since the caller may keep the
+        device pointer, the buffer is then exposed and never spilled.
+        """
+        mem = self._device_mem()
+        self._exposed = True
+        return mem
+
+    def _device_mem(self):
+        """The device array, without exposing it. Only for uses that do
+        not keep the array or its pointer.
+        """
+        if spill._manager is not None:
+            spill._manager.access(self)
+        return self._mem
+
+    @mem.setter
+    def mem(self, value):
+        self._mem = value
+        self._alloc_size = int(value.alloc_size)
+        memory.record_allocation(value)
+        if spill._manager is not None:
+            spill._manager.add(self)
 
     def serialize(self):
         """Called when dask.distributed is performing a serialization on this
@@ -118,17 +151,20 @@ class Buffer(object):
         return type(self), (cpumem,)
 
     def __sizeof__(self):
-        return int(self.mem.alloc_size)
+        # Do not move a spilled buffer back to the device just to size it
+        return self._alloc_size
 
     def __getitem__(self, arg):
         if isinstance(arg, slice):
             sliced = self.mem[arg]
             buf = Buffer(sliced)
+            # The slice shares the device memory of this buffer
+            buf._exposed = True
             buf.dtype = self.dtype  # for np.datetime64 support
             return buf
         elif isinstance(arg, (int, np.integer)):
             arg = utils.normalize_index(int(arg), self.size)
-            item = self.mem[arg]
+            item = self._device_mem()[arg]
             if isinstance(item, str):
                 return item
             # the dtype argument is necessary for datetime64 support
@@ -159,11 +195,12 @@ class Buffer(object):
 
         array = column.as_column(array).astype(self.dtype).data.mem
 
-        self.mem[self.size : self.size + needed].copy_to_device(array)
+        dest = self._device_mem()[self.size : self.size + needed]
+        dest.copy_to_device(array)
         self.size += needed
 
     def to_array(self):
-        return self.to_gpu_array().copy_to_host()
+        return self._device_mem()[: self.size].copy_to_host()
 
     def to_gpu_array(self):
         return self.mem[: self.size]
@@ -172,14 +209,14 @@ class Buffer(object):
         """Deep copy the buffer
         """
         return Buffer(
-            mem=cudautils.copy_array(self.mem),
+            mem=cudautils.copy_array(self._device_mem()),
             size=self.size,
             capacity=self.capacity,
         )
 
     def as_contiguous(self):
         out = Buffer(
-            mem=cudautils.as_contiguous(self.mem),
+            mem=cudautils.as_contiguous(self._device_mem()),
             size=self.size,
             capacity=self.capacity,
         )
@@ -187,7 +224,7 @@ class Buffer(object):
         return out
 
     def is_contiguous(self):
-        return self.mem.is_c_contiguous()
+        return self._device_mem().is_c_contiguous()
 
     def astype(self, dtype):
         from cudf.core.column import column
@@ -238,6 +238,9 @@ class CategoricalColumn(column.TypedColumnBase):
         self._categories = categories
         self._ordered = ordered
 
+    def __sizeof__(self):
+        return super().__sizeof__() + self._categories.__sizeof__()
+
     def __contains__(self, item):
         return self._encode(item) in self.as_numerical
 
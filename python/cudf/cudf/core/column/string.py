@@ -466,6 +466,16 @@ class StringColumn(column.TypedColumnBase):
     def __contains__(self, item):
         return True in self.str().contains(f"^{item}$")._column
 
+    def __sizeof__(self):
+        # The character data and offsets live in device memory owned by
+        # nvstrings, so ``self._data`` is not a Buffer here
+        n = self._data.device_memory()
+        if self._mask:
+            n += self._mask.__sizeof__()
+        if self._indices is not None:
+            n += self._indices.__sizeof__()
+        return n
+
     def __reduce__(self):
         cpumem = self.to_arrow()
         return column.as_column, (cpumem, False, np.dtype("object"))
@@ -28,9 +28,18 @@ from cudf.core.buffer import Buffer
 from cudf.core.column import CategoricalColumn
 from cudf.core.index import Index, RangeIndex, as_index
 from cudf.core.indexing import _DataFrameIlocIndexer, _DataFrameLocIndexer
+from cudf.core.join import JoinIndex, sort_join
+from cudf.core.memory import annotate
 from cudf.core.series import Series
 from cudf.core.window import Rolling
-from cudf.utils import applyutils, cudautils, ioutils, queryutils, utils
+from cudf.utils import (
+    applyutils,
+    cudautils,
+    ioutils,
+    profiling,
+    queryutils,
+    utils,
+)
 from cudf.utils.docutils import copy_docstring
 from cudf.utils.dtypes import (
     cudf_dtype_from_pydata_dtype,
@@ -40,6 +49,23 @@ from cudf.utils.dtypes import (
     is_scalar,
 )
 
+_MERGE_HOWS = ("left", "right", "inner", "outer", "leftsemi", "leftanti")
+
+
+def _frame_from_join_columns(names, cols):
+    """
+    Construct a DataFrame from the result columns of a join, which have
+    equal lengths and unique names, without the checks of adding columns
+    one by one
+    """
+    index = RangeIndex(len(cols[0]) if cols else 0)
+    df = DataFrame()
+    df._index = index
+    df._size = len(index)
+    for name, col in zip(names, cols):
+        df._cols[name] = Series(col, name=name, index=index)
+    return df
+
 
 def _unique_name(existing_names, suffix="_unique_name"):
     ret = suffix
@@ -340,14 +366,7 @@ class DataFrame(object):
                 mask = np.array(mask)
             df = DataFrame()
             if mask.dtype == "bool":
-                # New df-wide index
-                selvals, selinds = column.column_select_by_boolmask(
-                    column.as_column(self.index), Series(mask)
-                )
-                index = self.index.take(selinds.to_gpu_array())
-                for col in self._cols:
-                    df[col] = Series(self._cols[col][arg], index=index)
-                df = df.set_index(index)
+                return self._apply_boolean_mask(mask)
             else:
                 if len(arg) == 0:
                     df._size = len(self.index)
@@ -1151,6 +1170,7 @@ class DataFrame(object):
 
         return DataFrame(cols, idx)
 
+    @profiling.instrument()
     def set_index(self, index, drop=True):
         """Return a new DataFrame with a new index
 
@@ -1196,6 +1216,7 @@ class DataFrame(object):
             out = self
         return out.set_index(RangeIndex(len(self)))
 
+    @profiling.instrument()
     def take(self, positions, ignore_index=False):
         out = DataFrame()
         if self._cols:
@@ -1476,6 +1497,7 @@ class DataFrame(object):
             raise NameError("column {!r} does not exist".format(name))
         del self._cols[name]
 
+    @profiling.instrument()
     def drop_duplicates(self, subset=None, keep="first", inplace=False):
         """
         Return DataFrame with duplicate rows removed, optionally only
@@ -1520,6 +1542,7 @@ class DataFrame(object):
             outdf = outdf.set_index(new_index)
             return outdf
 
+    @profiling.instrument()
     def dropna(self, axis=0, how="any", subset=None, thresh=None):
         """
         Drops rows (or columns) containing nulls from a Column.
@@ -1596,6 +1619,58 @@ class DataFrame(object):
             )
         return df
 
+    def _apply_boolean_mask(self, mask):
+        """
+        Select the rows where *mask* is True, gathering the index and all
+        columns in a single call.
+        """
+        mask = column.as_column(mask, dtype="bool")
+        if len(mask) != len(self):
+            raise IndexError(
+                "boolean mask of length {} does not match DataFrame of "
+                "length {}".format(len(mask), len(self))
+            )
+        data_cols = self._columns
+
+        index_cols = []
+        if isinstance(self.index, cudf.MultiIndex):
+            index_cols.extend(self.index._source_data._columns)
+        else:
+            index_cols.append(self.index.as_column())
+
+        input_cols = index_cols + data_cols
+        result_cols = libcudf.stream_compaction.apply_boolean_mask(
+            input_cols, mask
+        )
+        if result_cols:
+            result_cols = [
+                col.replace(
+                    data=out.data, mask=out.mask, null_count=out.null_count
+                )
+                for col, out in zip(input_cols, result_cols)
+            ]
+        else:
+            result_cols = [
+                column.column_empty_like(col, newsize=0) for col in input_cols
+            ]
+
+        result_index_cols, result_data_cols = (
+            result_cols[: len(index_cols)],
+            result_cols[len(index_cols) :],
+        )
+
+        if isinstance(self.index, cudf.MultiIndex):
+            result_index = cudf.MultiIndex.from_frame(
+                DataFrame._from_columns(result_index_cols),
+                names=self.index.names,
+            )
+        else:
+            result_index = as_index(result_index_cols[0], name=self.index.name)
+
+        return DataFrame._from_columns(
+            result_data_cols, index=result_index, columns=self.columns
+        )
+
     def _drop_na_columns(self, how="any", subset=None, thresh=None):
         """
         Drop columns containing nulls
@@ -1697,10 +1772,8 @@ class DataFrame(object):
         return df
 
     @classmethod
+    @annotate("CUDF_CONCAT", "orange")
     def _concat(cls, objs, axis=0, ignore_index=False):
-
-        libcudf.nvtx.nvtx_range_push("CUDF_CONCAT", "orange")
-
         if ignore_index:
             index = RangeIndex(sum(map(len, objs)))
         elif isinstance(objs[0].index, cudf.core.multiindex.MultiIndex):
@@ -1735,7 +1808,6 @@ class DataFrame(object):
         ]
         out = cls(data)
         out._index = index
-        libcudf.nvtx.nvtx_range_pop()
         return out
 
     def as_gpu_matrix(self, columns=None, order="F"):
@@ -1908,11 +1980,13 @@ class DataFrame(object):
             cols, ascending=ascending, na_position=na_position
         )
 
+    @profiling.instrument()
     def sort_index(self, ascending=True):
         """Sort by the index
         """
         return self.take(self.index.argsort(ascending=ascending))
 
+    @profiling.instrument()
     def sort_values(self, by, ascending=True, na_position="last"):
         """
 
@@ -2050,6 +2124,7 @@ class DataFrame(object):
 
         return melt(self, **kwargs)
 
+    @annotate("CUDF_JOIN", "blue")
     def merge(
         self,
         right,
@@ -2080,15 +2155,22 @@ class DataFrame(object):
             If on is None and not merging on indexes then
             this defaults to the intersection of the columns
             in both DataFrames.
-        how : {‘left’, ‘outer’, ‘inner’}, default ‘inner’
-            Type of merge to be performed.
+        how : {‘left’, ‘right’, ‘outer’, ‘inner’, ‘leftsemi’, ‘leftanti’}
+            Type of merge to be performed, default ‘inner’.
                 left: use only keys from left frame, similar to a SQL left
                       outer join; preserve key order.
-                right: not supported.
+                right: use only keys from right frame, similar to a SQL
+                       right outer join.
                 outer: use union of keys from both frames, similar to a SQL
                        full outer join; sort keys lexicographically.
                 inner: use intersection of keys from both frames, similar to
                        a SQL inner join; preserve the order of the left keys.
+                leftsemi: the rows of the left frame whose keys are found
+                          in the right frame, without any right column;
+                          preserve the order of the left rows.
+                leftanti: the rows of the left frame whose keys are not
+                          found in the right frame, without any right
+                          column; preserve the order of the left rows.
         left_on : label or list, or array-like
             Column or index level names to join on in the left DataFrame.
             Can also be an array or list of arrays of the length of the
@@ -2110,6 +2192,10 @@ class DataFrame(object):
             sides
         method : {‘hash’, ‘sort’}, default ‘hash’
             The implementation method to be used for the operation.
+            ‘sort’ merges the sorted keys of inner, left and right joins
+            on a single numeric or datetime key without nulls, skipping
+            the sort of keys that are already monotonic increasing, and
+            returns the rows in key order.
 
         Returns
         -------
@@ -2135,7 +2221,6 @@ class DataFrame(object):
         """
         import nvstrings
 
-        libcudf.nvtx.nvtx_range_push("CUDF_JOIN", "blue")
         if indicator:
             raise NotImplementedError(
                 "Only indicator=False is currently supported"
@@ -2159,7 +2244,7 @@ class DataFrame(object):
                 DeprecationWarning,
             )
             method = type
-        if how not in ["left", "inner", "outer"]:
+        if how not in _MERGE_HOWS:
             raise NotImplementedError(
                 "{!r} merge not supported yet".format(how)
             )
@@ -2222,6 +2307,17 @@ class DataFrame(object):
                     "right_on and left_on must have same " "number of columns"
                 )
 
+        if how in ("leftsemi", "leftanti"):
+            # Only the existence of the keys in the right frame matters,
+            # so no right column is gathered
+            result = JoinIndex(rhs, on=right_on).probe(
+                lhs, how=how, left_on=left_on
+            )
+            for name in (merge_index_name, result_index_name):
+                if name in result.columns:
+                    result._drop_column(name)
+            return result
+
         # Fix column names by appending `suffixes`
         for name in same_named_columns:
             if name not in left_on and name not in right_on:
@@ -2247,78 +2343,68 @@ class DataFrame(object):
         org_names = list(itertools.chain(lhs._cols.keys(), rhs._cols.keys()))
 
         # Compute merge
-        gdf_result = libcudf.join.join(
-            lhs._cols, rhs._cols, left_on, right_on, how, method
+        if how == "right":
+            # libcudf has no right join, so the frames are swapped for a
+            # left join
+            join_args = (rhs._cols, lhs._cols, right_on, left_on, "left")
+            kept_on, dropped_on = right_on, left_on
+        else:
+            join_args = (lhs._cols, rhs._cols, left_on, right_on, how)
+            kept_on, dropped_on = left_on, right_on
+        gdf_result = None
+        if method == "sort":
+            gdf_result = sort_join(*join_args)
+        if gdf_result is None:
+            gdf_result = libcudf.join.join(*join_args, method)
+
+        columns = OrderedDict(
+            (name, (col, valid)) for col, valid, name in gdf_result
         )
 
-        # GDF always removes the "right_on" columns from the result
-        # whereas Pandas keeps the "right_on" columns if its name differ
-        # from the one in the "left_on". Thus, here we duplicate the column if
+        # GDF always removes the key columns of its right frame from the
+        # result whereas Pandas keeps them if their names differ from the
+        # keys of the other frame. Thus, here we duplicate the column if
         # the name differ.
-        for left, right in zip(left_on, right_on):
-            if left != right:
-                for col, valid, name in gdf_result:
-                    if name == left:
-                        gdf_result.append((col, valid, right))
-                        break
-                else:
-                    assert False
+        for kept, dropped in zip(kept_on, dropped_on):
+            if kept != dropped:
+                columns[dropped] = columns[kept]
 
         # Let's sort the columns of the GDF result. NB: Pandas doc says
         # that it sorts when how='outer' but this is NOT the case.
-        result = []
         if sort:
             # Pandas lexicographically sort is NOT a sort of all columns.
             # Instead, it sorts columns in lhs, then in "on", and then rhs.
-            left_of_on = []
-            for name in lhs._cols.keys():
-                if name not in left_on:
-                    for i in range(len(gdf_result)):
-                        if gdf_result[i][2] == name:
-                            left_of_on.append(gdf_result.pop(i))
-                            break
-            in_on = []
-            for name in itertools.chain(lhs._cols.keys(), rhs._cols.keys()):
-                if name in left_on or name in right_on:
-                    for i in range(len(gdf_result)):
-                        if gdf_result[i][2] == name:
-                            in_on.append(gdf_result.pop(i))
-                            break
-            right_of_on = []
-            for name in rhs._cols.keys():
-                if name not in right_on:
-                    for i in range(len(gdf_result)):
-                        if gdf_result[i][2] == name:
-                            right_of_on.append(gdf_result.pop(i))
-                            break
-            result = (
-                sorted(left_of_on, key=lambda x: str(x[2]))
-                + sorted(in_on, key=lambda x: str(x[2]))
-                + sorted(right_of_on, key=lambda x: str(x[2]))
+            on_names = set(left_on) | set(right_on)
+            left_of_on = [n for n in lhs._cols if n not in left_on]
+            in_on = [n for n in org_names if n in on_names]
+            right_of_on = [n for n in rhs._cols if n not in right_on]
+            names = (
+                sorted(left_of_on, key=str)
+                + sorted(in_on, key=str)
+                + sorted(right_of_on, key=str)
             )
         else:
-            for org_name in org_names:
-                for i in range(len(gdf_result)):
-                    if gdf_result[i][2] == org_name:
-                        result.append(gdf_result.pop(i))
-                        break
-            assert len(gdf_result) == 0
+            names = org_names
+        names = [n for n in OrderedDict.fromkeys(names) if n in columns]
+        if not sort:
+            assert len(names) == len(columns)
 
         # Build a new data frame based on the merged columns from GDF
-        df = DataFrame()
-        for col, valid, name in result:
+        result_cols = []
+        for name in names:
+            col, valid = columns[name]
             if isinstance(col, nvstrings.nvstrings):
-                df[name] = col
+                result_cols.append(column.as_column(col))
             else:
-                mask = None
-                if valid is not None:
-                    mask = Buffer(valid)
-                df[name] = column.build_column(
-                    Buffer(col),
-                    dtype=categorical_dtypes.get(name, col.dtype),
-                    mask=mask,
-                    categories=col_with_categories.get(name, None),
+                result_cols.append(
+                    column.build_column(
+                        Buffer(col),
+                        dtype=categorical_dtypes.get(name, col.dtype),
+                        mask=None if valid is None else Buffer(valid),
+                        categories=col_with_categories.get(name, None),
+                    )
                 )
+        df = _frame_from_join_columns(names, result_cols)
 
         # Let's make the "index as column" back into an index
         if left_index and right_index:
@@ -2337,10 +2423,9 @@ class DataFrame(object):
         if result_index_name in df.columns:
             df._drop_column(result_index_name)
 
-        libcudf.nvtx.nvtx_range_pop()
-
         return df
 
+    @annotate("CUDF_JOIN", "blue")
     def join(
         self,
         other,
@@ -2377,8 +2462,6 @@ class DataFrame(object):
         - *on* is not supported yet due to lack of multi-index support.
         """
 
-        libcudf.nvtx.nvtx_range_push("CUDF_JOIN", "blue")
-
         # Outer joins still use the old implementation
         if type != "":
             warnings.warn(
@@ -2578,7 +2661,30 @@ class DataFrame(object):
             win_type=win_type,
         )
 
-    def query(self, expr, local_dict={}):
+    def lazy(self):
+        """Defer the computation of new columns.
+
+        Returns a ``LazyFrame`` recording column expressions such as
+        ``(lf['a'] * lf['b'] + lf['c']) / lf['d'] > 0``. All of them are
+        computed by a single fused CUDA kernel when ``collect()`` is
+        called, without materializing intermediate columns.
+
+        Examples
+        --------
+        >>> import cudf
+        >>> df = cudf.DataFrame({'a': [1, 2], 'b': [3, 4]})
+        >>> lf = df.lazy()
+        >>> lf['c'] = lf['a'] * lf['b'] + 1
+        >>> lf.collect()
+           a  b  c
+        0  1  3  4
+        1  2  4  9
+        """
+        from cudf.core.lazy import LazyFrame
+
+        return LazyFrame(self)
+
+    def query(self, expr, local_dict={}, engine="jit"):
         """
         Query with a boolean expression using Numba to compile a GPU kernel.
 
@@ -2595,9 +2701,20 @@ class DataFrame(object):
             An output value will be `null` if any of the input values are
             `null` regardless of expression.
 
+            String columns can be compared with strings and tested for
+            membership in lists of strings, e.g. ``s in ['a', 'b']``, and
+            for equality with other string columns. Categorical columns
+            support equality and membership tests.
+
         local_dict : dict
             Containing the local variable to be used in query.
 
+        engine : {'jit', 'interpreter'}, default 'jit'
+            'jit' compiles the expression into a single GPU kernel, which
+            is cached for later queries of the same form. 'interpreter'
+            evaluates the expression with Series operations and compiles
+            nothing, which is faster for queries run only once.
+
         Returns
         -------
 
@@ -2649,8 +2766,13 @@ class DataFrame(object):
                     type(local_dict)
                 )
             )
+        if engine not in ("jit", "interpreter"):
+            raise ValueError(
+                "engine must be 'jit' or 'interpreter', got {!r}".format(
+                    engine
+                )
+            )
 
-        libcudf.nvtx.nvtx_range_push("CUDF_QUERY", "purple")
         # Get calling environment
         callframe = inspect.currentframe().f_back
         callenv = {
@@ -2658,17 +2780,14 @@ class DataFrame(object):
             "globals": callframe.f_globals,
             "local_dict": local_dict,
         }
-        # Run query
-        boolmask = queryutils.query_execute(self, expr, callenv)
-
-        selected = Series(boolmask)
-        newdf = DataFrame()
-        for col in self.columns:
-            newseries = self[col][selected]
-            newdf[col] = newseries
-        result = newdf
-        libcudf.nvtx.nvtx_range_pop()
-        return result
+        with annotate("CUDF_QUERY", "purple"):
+            # Run query
+            if engine == "jit":
+                boolmask = queryutils.query_execute(self, expr, callenv)
+            else:
+                boolmask = queryutils.query_evaluate(self, expr, callenv)
+            newdf = self._apply_boolean_mask(boolmask)
+        return newdf
 
     @applyutils.doc_apply()
     def apply_rows(
@@ -2899,6 +3018,7 @@ class DataFrame(object):
 
         return outdf
 
+    @profiling.instrument()
     def fillna(self, value, method=None, axis=None, inplace=False, limit=None):
         """Fill null values with ``value``.
 
@@ -3084,6 +3204,7 @@ class DataFrame(object):
         """
         return self._apply_support_method("notna", **kwargs)
 
+    @profiling.instrument()
     def to_pandas(self):
         """
         Convert to a Pandas DataFrame.
@@ -3111,6 +3232,7 @@ class DataFrame(object):
         return out
 
     @classmethod
+    @profiling.instrument()
     def from_pandas(cls, dataframe, nan_as_null=True):
         """
         Convert from a Pandas DataFrame.
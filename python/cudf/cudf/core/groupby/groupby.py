@@ -4,21 +4,20 @@ import collections
 import itertools
 import pickle
 
+import numpy as np
+from numba import cuda
+
+from librmm_cffi import librmm as rmm
+
 import cudf
 import cudf._lib as libcudf
 from cudf import MultiIndex
-from cudf.core.column import deserialize_columns, serialize_columns
+from cudf.core._sort import get_sorted_inds
+from cudf.core.column import as_column, deserialize_columns, serialize_columns
+from cudf.utils import cudautils, profiling
 from cudf.utils.dtypes import is_scalar
 
 
-def columns_from_dataframe(df):
-    cols = [sr._column for sr in df._cols.values()]
-    # strip column names
-    for col in cols:
-        col.name = None
-    return cols
-
-
 def dataframe_from_columns(cols, index_cols=None, index=None, columns=None):
     df = cudf.DataFrame(dict(zip(range(len(cols)), cols)), index=index)
     if columns is not None:
@@ -42,15 +41,121 @@ class _Groupby(object):
     def count(self):
         return self._apply_aggregation("count")
 
+    def var(self):
+        return self._apply_aggregation("var")
+
+    def std(self):
+        return self._apply_aggregation("std")
+
+    def nunique(self):
+        return self._apply_aggregation("nunique")
+
+    def first(self):
+        return self._apply_aggregation("first")
+
+    def last(self):
+        return self._apply_aggregation("last")
+
+    def median(self):
+        return self._apply_aggregation("median")
+
     def agg(self, func):
         return self._apply_aggregation(func)
 
+    def transform(self, func):
+        """
+        Aggregate each group with *func* and broadcast the result to the
+        rows of the group.
+
+        Parameters
+        ----------
+        func : str
+            The name of the aggregation, e.g. ``"mean"``.
+
+        Returns
+        -------
+        Series or DataFrame aligned with the grouped object
+        """
+        return self._groupby.compute_transform(func)
+
+    def cumsum(self):
+        """
+        Cumulative sum of the valid values of each group
+        """
+        return self._groupby.compute_scan("cumsum")
+
+    def cumcount(self):
+        """
+        Number of each row within its group, from 0
+        """
+        return self._groupby.compute_scan("cumcount")
+
+    def rank(self, method="average", ascending=True, na_option="keep"):
+        """
+        Rank of the values within each group
+
+        Parameters
+        ----------
+        method : {'average', 'min', 'max', 'first', 'dense'}
+        ascending : bool, default True
+        na_option : {'keep'}
+            Null values get a null rank.
+        """
+        if method not in _RANK_METHODS:
+            raise ValueError("invalid rank method {!r}".format(method))
+        if na_option != "keep":
+            raise NotImplementedError("na_option must be 'keep'")
+        return self._groupby.compute_scan(
+            "rank", method=method, ascending=ascending
+        )
+
+    def shift(self, periods=1, fill_value=None):
+        """
+        Shift the values of each group by *periods* rows
+
+        Rows shifted in from outside the group are null, or
+        *fill_value* if given.
+        """
+        return self._groupby.compute_scan(
+            "shift", periods=periods, fill_value=fill_value
+        )
+
+    def quantile(self, q=0.5, interpolation="linear"):
+        # Get Key_cols from _GroupbyHelper. It's generated at init.
+        key_cols = self._groupby.key_columns
+        # Do the things that'll make it generate the value columns
+        self._groupby.normalize_agg("quantile")
+        self._groupby.normalize_values()
+        # Get the value_columns
+        val_cols = self._groupby.value_columns
+
+        out_key_columns, out_value_columns = libcudf.quantile.group_quantile(
+            key_cols, val_cols, q, interpolation
+        )
+        return self._groupby.construct_result(
+            out_key_columns, out_value_columns
+        )
+
     def size(self):
-        from cudf.core.column import column_empty
+        groups = self._groupby.grouping()
+        sizes = groups.sizes()
+        index = self._groupby.compute_result_index(groups.keys, [sizes])
+        return cudf.Series(sizes, index=index)
 
-        nrows = len(self._groupby.obj)
-        data = cudf.Series(column_empty(nrows, "int8", masked=False))
-        return data.groupby(self._groupby.key_columns).count()
+    def __iter__(self):
+        """
+        Iterate over the (name, group) pairs, in key order
+        """
+        groups = self._groupby.grouping()
+        for i, name in enumerate(groups.names()):
+            yield name, self._groupby.obj.take(groups.rows(i))
+
+    def get_group(self, name):
+        """
+        The rows of the group *name*, a tuple for multiple keys
+        """
+        groups = self._groupby.grouping()
+        return self._groupby.obj.take(groups.rows(groups.find(name)))
 
     def serialize(self):
         header, frames = self._groupby.serialize()
@@ -87,12 +192,10 @@ class SeriesGroupBy(_Groupby):
             obj=self._sr, by=by, level=level, sort=sort, dropna=dropna
         )
 
+    @profiling.instrument("GroupBy.agg")
     def _apply_aggregation(self, agg):
         return self._groupby.compute_result(agg)
 
-    def quantile(self, q=0.5, interpolation="linear"):
-        raise NotImplementedError
-
 
 class DataFrameGroupBy(_Groupby):
     def __init__(
@@ -115,6 +218,7 @@ class DataFrameGroupBy(_Groupby):
             dropna=dropna,
         )
 
+    @profiling.instrument("GroupBy.agg")
     def _apply_aggregation(self, agg):
         """
         Applies the aggregation function(s) ``agg`` on all columns
@@ -133,12 +237,15 @@ class DataFrameGroupBy(_Groupby):
                 self._groupby.key_names, self._groupby.key_columns
             ):
                 by_list.append(cudf.Series(by, name=by_name))
-            return self._df[arg].groupby(
+            result = self._df[arg].groupby(
                 by_list,
                 as_index=self._groupby.as_index,
                 sort=self._groupby.sort,
                 dropna=self._groupby.dropna,
             )
+            # The selection is grouped by the same keys
+            result._groupby._cache = self._groupby._cache
+            return result
 
     def __getattr__(self, key):
         if key == "_df":
@@ -150,36 +257,39 @@ class DataFrameGroupBy(_Groupby):
                 self._groupby.key_names, self._groupby.key_columns
             ):
                 by_list.append(cudf.Series(by, name=by_name))
-            return self._df[key].groupby(
+            result = self._df[key].groupby(
                 by_list,
                 as_index=self._groupby.as_index,
                 sort=self._groupby.sort,
                 dropna=self._groupby.dropna,
             )
+            # The selection is grouped by the same keys
+            result._groupby._cache = self._groupby._cache
+            return result
         raise AttributeError(
             "'DataFrameGroupBy' object has no attribute " "'{}'".format(key)
         )
 
-    def quantile(self, q=0.5, interpolation="linear"):
-        # Get Key_cols from _GroupbyHelper. It's generated at init.
-        key_cols = self._groupby.key_columns
-        # Do the things that'll make it generate the value columns
-        self._groupby.normalize_agg("quantile")
-        self._groupby.normalize_values()
-        # Get the value_columns
-        val_cols = self._groupby.value_columns
-
-        out_key_columns, out_value_columns = libcudf.quantile.group_quantile(
-            key_cols, val_cols, q, interpolation
-        )
-        return self._groupby.construct_result(
-            out_key_columns, out_value_columns
-        )
-
 
 class _GroupbyHelper(object):
 
-    NAMED_AGGS = ("sum", "mean", "min", "max", "count", "quantile")
+    NAMED_AGGS = (
+        "sum",
+        "mean",
+        "min",
+        "max",
+        "count",
+        "quantile",
+        "var",
+        "std",
+        "nunique",
+        "first",
+        "last",
+        "median",
+    )
+
+    # Aggregations dropping string and categorical "nuisance columns"
+    NUMERIC_AGGS = ("mean", "sum", "var", "std", "median")
 
     def __init__(
         self, obj, by=None, level=None, as_index=True, sort=None, dropna=True
@@ -199,6 +309,8 @@ class _GroupbyHelper(object):
         self.sort = sort
         self.dropna = dropna
         self.normalize_keys()
+        # The materialized grouping, see ``grouping``
+        self._cache = {}
 
     def serialize(self):
         header = {}
@@ -304,16 +416,120 @@ class _GroupbyHelper(object):
         self.normalize_values()
         aggs_as_list = self.get_aggs_as_list()
 
-        out_key_columns, out_value_columns = _groupby_engine(
-            self.key_columns,
-            self.value_columns,
-            aggs_as_list,
-            self.sort,
-            self.dropna,
-        )
+        plan = _AggregationPlan(self.value_columns, aggs_as_list)
+        # The engine only depends on the requested aggregations, so that
+        # results do not depend on earlier operations of the groupby
+        if plan.is_segmented():
+            out_key_columns, out_value_columns = _segmented_engine(
+                self.key_columns,
+                plan.columns,
+                plan.aggs,
+                self.dropna,
+                self.grouping(),
+            )
+        else:
+            out_key_columns, out_value_columns = _groupby_engine(
+                self.key_columns,
+                plan.columns,
+                plan.aggs,
+                self.sort,
+                self.dropna,
+            )
+        out_value_columns = plan.assemble(out_value_columns)
 
         return self.construct_result(out_key_columns, out_value_columns)
 
+    def grouping(self):
+        """
+        The rows sorted into groups, computed on first use and shared by
+        all later operations of this groupby that need it: segmented
+        aggregations, transforms, scans, ``size``, iteration and
+        ``get_group``. Other aggregations always use the hash groupby.
+        """
+        groups = self._cache.get("groups")
+        if groups is None:
+            groups = _SortedGroups(self.key_columns, self.dropna)
+            self._cache["groups"] = groups
+        return groups
+
+    def compute_transform(self, func):
+        """
+        Computes the aggregation *func* of each group, broadcast to the
+        rows of the group
+        """
+        if func not in self.NAMED_AGGS or func == "quantile":
+            raise ValueError(
+                f"Aggregation function name {func} not recognized"
+            )
+        names, columns = self.row_value_columns(
+            numeric_only=func in self.NUMERIC_AGGS
+        )
+        groups = self.grouping()
+        plan = _AggregationPlan(columns, [func] * len(columns))
+        _, results = _segmented_engine(
+            self.key_columns, plan.columns, plan.aggs, self.dropna, groups
+        )
+        results = [groups.broadcast(col) for col in plan.assemble(results)]
+        return self.construct_row_result(names, results)
+
+    def compute_scan(self, op, **kwargs):
+        """
+        Computes the row-aligned group-wise operation *op*, one of
+        ``cumsum``, ``cumcount``, ``rank`` and ``shift``
+        """
+        groups = self.grouping()
+        if op == "cumcount":
+            result = groups.cumcount()
+            return cudf.Series(result, index=self.obj.index)
+        names, columns = self.row_value_columns(
+            numeric_only=op != "shift", exclude_datetime=op != "shift"
+        )
+        if op == "shift":
+            results = groups.shift(columns, **kwargs)
+        else:
+            results = [
+                getattr(groups, op)(col, **kwargs)
+                for col in groups.gather(columns)
+            ]
+        return self.construct_row_result(names, results)
+
+    def row_value_columns(self, numeric_only=False, exclude_datetime=False):
+        """
+        Names and columns of the values of row-aligned results,
+        dropping the "nuisance columns" of DataFrames
+        """
+        if isinstance(self.obj, cudf.Series):
+            col = self.obj._column
+            if numeric_only and _is_nuisance(col, exclude_datetime):
+                raise TypeError(
+                    "operation not supported for dtype {}".format(col.dtype)
+                )
+            return [self.obj.name], [col]
+        names = []
+        columns = []
+        for col_name in self.obj.columns:
+            if col_name in self.key_names:
+                continue
+            col = self.obj[col_name]._column
+            if numeric_only and _is_nuisance(col, exclude_datetime):
+                continue
+            names.append(col_name)
+            columns.append(col)
+        return names, columns
+
+    def construct_row_result(self, names, columns):
+        """
+        Series or DataFrame of the row-aligned *columns*, indexed like
+        the grouped object
+        """
+        if isinstance(self.obj, cudf.Series):
+            return cudf.Series(
+                columns[0], index=self.obj.index, name=self.obj.name
+            )
+        return dataframe_from_columns(
+            columns, index=self.obj.index, columns=names
+        )
+
     def normalize_agg(self, agg):
         """
         Normalize agg to a dictionary with column names
@@ -346,7 +562,7 @@ class _GroupbyHelper(object):
                         ),
                     ):
                         for agg_name in agg:
-                            if agg_name in ("mean", "sum"):
+                            if agg_name in self.NUMERIC_AGGS:
                                 drop = True
                     if not drop:
                         value_col_names.append(col_name)
@@ -472,6 +688,657 @@ class _GroupbyHelper(object):
         return aggs_as_list
 
 
+class _AggregationPlan(object):
+    """
+    Plans the aggregations sent to the groupby engine.
+
+    Each value column is aggregated once per distinct primitive
+    aggregation, however many times it is requested, and compound
+    aggregations are assembled from the shared primitives, e.g.
+    ``mean`` from ``sum`` and ``count``, and ``var`` and ``std`` from
+    ``count`` and the sum of squared deviations from the mean.
+
+    The primitives in ``SEGMENTED_AGGS`` are computed on the rows sorted
+    by key, see ``_segmented_engine``.
+
+    Parameters
+    ----------
+    value_columns : list of Columns
+        The value column of each requested aggregation
+    aggs : list of str
+        The requested aggregations
+    """
+
+    SEGMENTED_AGGS = ("m2", "nunique", "first", "last", "median")
+
+    def __init__(self, value_columns, aggs):
+        self.columns = []
+        self.aggs = []
+        self._positions = {}
+        self._outputs = [
+            self._plan(col, agg) for col, agg in zip(value_columns, aggs)
+        ]
+
+    def _primitive(self, col, agg):
+        """
+        Position of the engine output aggregating *col* with *agg*
+        """
+        key = (id(col), agg)
+        if key not in self._positions:
+            self._positions[key] = len(self.columns)
+            self.columns.append(col)
+            self.aggs.append(agg)
+        return self._positions[key]
+
+    def _plan(self, col, agg):
+        if agg == "mean":
+            return (
+                _assemble_mean,
+                self._primitive(col, "sum"),
+                self._primitive(col, "count"),
+            )
+        if agg in ("var", "std"):
+            return (
+                _assemble_var if agg == "var" else _assemble_std,
+                self._primitive(col, "m2"),
+                self._primitive(col, "count"),
+            )
+        return (None, self._primitive(col, agg))
+
+    def is_segmented(self):
+        """
+        Whether any primitive must be computed on the sorted groups
+        """
+        return any(agg in self.SEGMENTED_AGGS for agg in self.aggs)
+
+    def assemble(self, results):
+        """
+        Computes the requested aggregations from the engine outputs
+        *results*
+        """
+        out = []
+        for func, *positions in self._outputs:
+            cols = [results[i] for i in positions]
+            out.append(cols[0] if func is None else func(*cols))
+        return out
+
+
+def _assemble_mean(sums, counts):
+    # Groups without valid values have a null sum, hence a null mean
+    return sums.astype("float64").binary_operator(
+        "truediv", counts.astype("float64")
+    )
+
+
+def _assemble_var(m2, counts, ddof=1):
+    # Groups with at most ddof valid values get NaN, as in pandas
+    m2 = cudf.Series(m2)
+    counts = cudf.Series(counts).astype("float64")
+    return (m2 / (counts - ddof))._column
+
+
+def _assemble_std(m2, counts):
+    return cudf.Series(_assemble_var(m2, counts)).sqrt()._column
+
+
+@cuda.jit
+def gpu_segment_labels(offsets, labels):
+    i = cuda.grid(1)
+    if i < offsets.size:
+        s = offsets[i]
+        e = offsets[i + 1] if (i + 1) < offsets.size else labels.size
+        for j in range(s, e):
+            labels[j] = i
+
+
+@cuda.jit
+def gpu_segment_m2(data, valid, offsets, out, out_valid):
+    i = cuda.grid(1)
+    if i < offsets.size:
+        s = offsets[i]
+        e = offsets[i + 1] if (i + 1) < offsets.size else data.size
+        n = 0
+        total = 0.0
+        for j in range(s, e):
+            if valid[j]:
+                n += 1
+                total += data[j]
+        if n == 0:
+            out[i] = 0.0
+            out_valid[i] = 0
+        else:
+            # Two passes, to avoid the cancellation of sum of squares
+            mean = total / n
+            m2 = 0.0
+            for j in range(s, e):
+                if valid[j]:
+                    delta = data[j] - mean
+                    m2 += delta * delta
+            out[i] = m2
+            out_valid[i] = 1
+
+
+@cuda.jit
+def gpu_segment_first_valid(valid, offsets, out):
+    i = cuda.grid(1)
+    if i < offsets.size:
+        s = offsets[i]
+        e = offsets[i + 1] if (i + 1) < offsets.size else valid.size
+        # The start of groups without valid values, which is null
+        out[i] = s
+        for j in range(s, e):
+            if valid[j]:
+                out[i] = j
+                break
+
+
+@cuda.jit
+def gpu_segment_last_valid(valid, offsets, out):
+    i = cuda.grid(1)
+    if i < offsets.size:
+        s = offsets[i]
+        e = offsets[i + 1] if (i + 1) < offsets.size else valid.size
+        out[i] = e - 1
+        for j in range(e - 1, s - 1, -1):
+            if valid[j]:
+                out[i] = j
+                break
+
+
+@cuda.jit
+def gpu_count_labels(labels, out):
+    i = cuda.grid(1)
+    if i < labels.size:
+        cuda.atomic.add(out, labels[i], 1)
+
+
+@cuda.jit
+def gpu_row_positions(order, labels, positions, groups):
+    j = cuda.grid(1)
+    if j < order.size:
+        positions[order[j]] = j
+        groups[order[j]] = labels[j]
+
+
+@cuda.jit
+def gpu_invert_order(order, positions):
+    j = cuda.grid(1)
+    if j < order.size:
+        positions[order[j]] = j
+
+
+@cuda.jit
+def gpu_segment_cumsum(data, valid, offsets, out, out_valid):
+    i = cuda.grid(1)
+    if i < offsets.size:
+        s = offsets[i]
+        e = offsets[i + 1] if (i + 1) < offsets.size else data.size
+        acc = 0
+        for j in range(s, e):
+            if valid[j]:
+                acc += data[j]
+                out[j] = acc
+                out_valid[j] = 1
+            else:
+                out_valid[j] = 0
+
+
+@cuda.jit
+def gpu_segment_cumcount(offsets, out):
+    i = cuda.grid(1)
+    if i < offsets.size:
+        s = offsets[i]
+        e = offsets[i + 1] if (i + 1) < offsets.size else out.size
+        for j in range(s, e):
+            out[j] = j - s
+
+
+@cuda.jit
+def gpu_segment_shift_sources(order, offsets, periods, nrows, out):
+    i = cuda.grid(1)
+    if i < offsets.size:
+        s = offsets[i]
+        e = offsets[i + 1] if (i + 1) < offsets.size else order.size
+        for j in range(s, e):
+            src = j - periods
+            if s <= src and src < e:
+                out[order[j]] = order[src]
+            else:
+                out[order[j]] = nrows
+
+
+_RANK_METHODS = ("average", "min", "max", "first", "dense")
+
+
+@cuda.jit
+def gpu_segment_rank(data, valid, offsets, method, ascending, out, out_valid):
+    i = cuda.grid(1)
+    if i < offsets.size:
+        s = offsets[i]
+        e = offsets[i + 1] if (i + 1) < offsets.size else data.size
+        # Count the valid values and their distinct values, which are
+        # sorted within the group
+        nvalid = 0
+        ndistinct = 0
+        last = s
+        for j in range(s, e):
+            if valid[j]:
+                if nvalid == 0 or data[j] != data[last]:
+                    ndistinct += 1
+                nvalid += 1
+                last = j
+            out_valid[j] = valid[j]
+        seen = 0
+        dense = 0
+        j = s
+        while j < e:
+            if not valid[j]:
+                j += 1
+                continue
+            # The run of values tied with data[j]
+            k = j + 1
+            length = 1
+            while k < e and (not valid[k] or data[k] == data[j]):
+                if valid[k]:
+                    length += 1
+                k += 1
+            if ascending:
+                lo = seen + 1
+                hi = seen + length
+                drank = dense + 1
+            else:
+                lo = nvalid - seen - length + 1
+                hi = nvalid - seen
+                drank = ndistinct - dense
+            t = 0
+            for m in range(j, k):
+                if valid[m]:
+                    if method == 0:
+                        out[m] = (lo + hi) / 2.0
+                    elif method == 1:
+                        out[m] = lo
+                    elif method == 2:
+                        out[m] = hi
+                    elif method == 3:
+                        out[m] = lo + t
+                    else:
+                        out[m] = drank
+                    t += 1
+            seen += length
+            dense += 1
+            j = k
+
+
+def _scan_dtype(dtype):
+    if dtype.kind in "iub":
+        return np.dtype("int64")
+    return np.dtype("float64")
+
+
+def _is_nuisance(col, exclude_datetime=False):
+    from cudf.core.column import CategoricalColumn, StringColumn
+
+    if isinstance(col, (StringColumn, CategoricalColumn)):
+        return True
+    return exclude_datetime and col.dtype.kind == "M"
+
+
+def _gather_or_null(col, indices, has_sentinel):
+    """
+    Gather *col* with *indices*, where the index ``len(col)`` gives a
+    null
+    """
+    if has_sentinel:
+        from cudf.core.column import Column, column_empty_like
+
+        col = Column._concat(
+            [col, column_empty_like(col, masked=True, newsize=1)]
+        )
+    if len(indices) == 0:
+        return col[:0]
+    return libcudf.copying.gather(col, indices)
+
+
+def _validity(col):
+    """
+    Device array of 1 for valid and 0 for null elements of *col*
+    """
+    if col.has_null_mask:
+        return cudautils.expand_mask_bits(len(col), col.nullmask.mem)
+    return cudautils.ones(len(col), dtype=np.int32)
+
+
+class _SortedGroups(object):
+    """
+    The rows of the keys sorted into groups.
+
+    Attributes
+    ----------
+    order : device array
+        Positions of the input rows in sorted order. With ``dropna``,
+        rows with null keys are left out.
+    offsets : device array
+        Start of each group in the sorted rows.
+    labels : Column
+        Group number of each sorted row.
+    keys : list of Columns
+        The key of each group.
+    """
+
+    def __init__(self, key_columns, dropna):
+        nrows = len(key_columns[0])
+        self.nrows = nrows
+        self._positions = None
+        self._host = None
+        self._names = None
+        self._lookup = None
+        row_ids = as_column(cudautils.arange(nrows, dtype=np.int32))
+        cols = [row_ids] + list(key_columns)
+        if dropna and any(col.has_null_mask for col in key_columns):
+            cols = libcudf.stream_compaction.drop_nulls(
+                cols, how="any", subset=cols[1:]
+            )
+        if len(cols[0]) == 0:
+            self.order = rmm.device_array(0, dtype=np.int32)
+            self.offsets = rmm.device_array(0, dtype=np.int32)
+            self.keys = [col[:0] for col in key_columns]
+        else:
+            (
+                sorted_cols,
+                offsets,
+            ) = libcudf.groupby.groupby_without_aggregations(cols, cols[1:])
+            self.order = sorted_cols[0].data.mem
+            self.offsets = offsets.data.mem
+            self.keys = libcudf.copying.gather(sorted_cols[1:], self.offsets)
+        labels = rmm.device_array(len(self.order), dtype=np.int32)
+        if self.offsets.size:
+            gpu_segment_labels.forall(self.offsets.size)(self.offsets, labels)
+        self.labels = as_column(labels)
+
+    @property
+    def ngroups(self):
+        return self.offsets.size
+
+    def _host_offsets(self):
+        if self._host is None:
+            offsets = self.offsets.copy_to_host()
+            self._host = np.append(offsets, len(self.order))
+        return self._host
+
+    def sizes(self):
+        """
+        Number of rows of each group
+        """
+        return as_column(np.diff(self._host_offsets()).astype(np.int64))
+
+    def rows(self, i):
+        """
+        Positions of the input rows of group *i*
+        """
+        offsets = self._host_offsets()
+        return self.order[offsets[i] : offsets[i + 1]]
+
+    def names(self):
+        """
+        The key of each group on the host, a tuple for multiple keys
+        """
+        if self._names is None:
+            keys = [cudf.Series(col).to_pandas() for col in self.keys]
+            if len(keys) == 1:
+                self._names = list(keys[0])
+            else:
+                self._names = list(zip(*keys))
+        return self._names
+
+    def find(self, name):
+        """
+        Number of the group *name*
+        """
+        if self._lookup is None:
+            self._lookup = {n: i for i, n in enumerate(self.names())}
+        try:
+            return self._lookup[name]
+        except (KeyError, TypeError):
+            raise KeyError(name)
+
+    def gather(self, columns):
+        """
+        Sort *columns* into the groups, gathering each distinct column
+        once
+        """
+        distinct = collections.OrderedDict()
+        for col in columns:
+            distinct.setdefault(id(col), col)
+        if len(self.order):
+            gathered = libcudf.copying.gather(
+                list(distinct.values()), self.order
+            )
+        else:
+            gathered = [col[:0] for col in distinct.values()]
+        result = dict(zip(distinct, gathered))
+        return [result[id(col)] for col in columns]
+
+    def _row_positions(self):
+        """
+        Position in sorted order and group of each input row. Rows left
+        out of the groups get ``len(self.order)`` and ``self.ngroups``.
+        """
+        if self._positions is None:
+            positions = cudautils.full(
+                self.nrows, len(self.order), dtype=np.int32
+            )
+            groups = cudautils.full(self.nrows, self.ngroups, dtype=np.int32)
+            if len(self.order):
+                gpu_row_positions.forall(len(self.order))(
+                    self.order, self.labels.data.mem, positions, groups
+                )
+            self._positions = positions, groups
+        return self._positions
+
+    @property
+    def complete(self):
+        """
+        Whether every input row is in a group
+        """
+        return len(self.order) == self.nrows
+
+    def broadcast(self, col):
+        """
+        Broadcast the value of each group in *col* to its input rows
+        """
+        _, groups = self._row_positions()
+        return _gather_or_null(col, groups, not self.complete)
+
+    def scatter_back(self, col):
+        """
+        Reorder the sorted column *col* like the input rows
+        """
+        positions, _ = self._row_positions()
+        return _gather_or_null(col, positions, not self.complete)
+
+    def cumsum(self, col):
+        dtype = _scan_dtype(col.dtype)
+        data = col.astype(dtype).data.mem
+        out = rmm.device_array(len(col), dtype=dtype)
+        out_valid = rmm.device_array(len(col), dtype=np.int8)
+        if self.ngroups:
+            gpu_segment_cumsum.forall(self.ngroups)(
+                data, _validity(col), self.offsets, out, out_valid
+            )
+        result = as_column(out)
+        if col.has_null_mask:
+            result = result.set_mask(cudautils.compact_mask_bytes(out_valid))
+        return self.scatter_back(result)
+
+    def cumcount(self):
+        out = rmm.device_array(len(self.order), dtype=np.int64)
+        if self.ngroups:
+            gpu_segment_cumcount.forall(self.ngroups)(self.offsets, out)
+        return self.scatter_back(as_column(out))
+
+    def rank(self, col, method="average", ascending=True):
+        # Sort the values within each group, ties in input order
+        order = as_column(self.order)
+        inds = get_sorted_inds([self.labels, col, order])
+        col, order = libcudf.copying.gather([col, order], inds.data.mem)
+        data = col.data.mem
+        out = rmm.device_array(len(col), dtype=np.float64)
+        out_valid = rmm.device_array(len(col), dtype=np.int8)
+        if self.ngroups:
+            gpu_segment_rank.forall(self.ngroups)(
+                data,
+                _validity(col),
+                self.offsets,
+                _RANK_METHODS.index(method),
+                ascending,
+                out,
+                out_valid,
+            )
+        result = as_column(out)
+        if col.has_null_mask:
+            result = result.set_mask(cudautils.compact_mask_bytes(out_valid))
+        positions = cudautils.full(self.nrows, len(col), dtype=np.int32)
+        if len(col):
+            gpu_invert_order.forall(len(col))(order.data.mem, positions)
+        return _gather_or_null(result, positions, not self.complete)
+
+    def shift(self, columns, periods=1, fill_value=None):
+        """
+        The input *columns* shifted within each group. Rows shifted in
+        from outside the group are *fill_value*, or null if None, while
+        rows left out of the groups are null.
+        """
+        from cudf.core.column import Column, column_empty_like
+
+        # Rows shifted in from outside the group gather the row
+        # ``nrows`` and the rows left out of the groups ``nrows + 1``
+        sources = cudautils.full(self.nrows, self.nrows + 1, dtype=np.int32)
+        if self.ngroups:
+            gpu_segment_shift_sources.forall(self.ngroups)(
+                self.order, self.offsets, periods, self.nrows, sources
+            )
+        results = []
+        for col in columns:
+            if len(sources) == 0:
+                results.append(col[:0])
+                continue
+            fill = column_empty_like(col, masked=True, newsize=1)
+            if fill_value is not None:
+                fill = fill.fillna(fill_value)
+            null = column_empty_like(col, masked=True, newsize=1)
+            results.append(
+                libcudf.copying.gather(
+                    Column._concat([col, fill, null]), sources
+                )
+            )
+        return results
+
+    def m2(self, col):
+        """
+        Sum of squared deviations from the mean of each group
+        """
+        data = col.astype("float64").data.mem
+        out = rmm.device_array(self.ngroups, dtype=np.float64)
+        out_valid = rmm.device_array(self.ngroups, dtype=np.int8)
+        if self.ngroups:
+            gpu_segment_m2.forall(self.ngroups)(
+                data, _validity(col), self.offsets, out, out_valid
+            )
+        return as_column(out).set_mask(cudautils.compact_mask_bytes(out_valid))
+
+    def nunique(self, col):
+        """
+        Number of distinct valid values of each group
+        """
+        out = cudautils.zeros(self.ngroups, dtype=np.int32)
+        # The distinct (group, value) pairs, leaving out null values
+        pairs, _ = libcudf.groupby.groupby(
+            [self.labels, col], [self.labels], ["count"], dropna=True
+        )
+        if len(pairs[0]):
+            gpu_count_labels.forall(len(pairs[0]))(pairs[0].data.mem, out)
+        return as_column(out)
+
+    def _take_positions(self, col, kernel):
+        positions = rmm.device_array(self.ngroups, dtype=np.int32)
+        if self.ngroups == 0:
+            return col[:0]
+        kernel.forall(self.ngroups)(_validity(col), self.offsets, positions)
+        return libcudf.copying.gather(col, positions)
+
+    def first(self, col):
+        """
+        First valid value of each group
+        """
+        return self._take_positions(col, gpu_segment_first_valid)
+
+    def last(self, col):
+        """
+        Last valid value of each group
+        """
+        return self._take_positions(col, gpu_segment_last_valid)
+
+    def median(self, col):
+        """
+        Median of the valid values of each group
+        """
+        if self.ngroups == 0:
+            return as_column(rmm.device_array(0, dtype=np.float64))
+        _, [result] = libcudf.quantile.group_quantile(
+            [self.labels], [col], 0.5, "linear"
+        )
+        return result
+
+
+def _segmented_engine(key_columns, value_columns, aggs, dropna, groups=None):
+    """
+    Groupby computing the aggregations on the rows sorted by key.
+
+    Supports the aggregations of ``_AggregationPlan.SEGMENTED_AGGS`` in
+    addition to those of the hash groupby. The result is sorted by key.
+
+    Parameters
+    ----------
+    key_columns : list of Columns
+    value_columns : list of Columns
+    aggs : list of str
+    dropna : bool
+    groups : _SortedGroups, optional
+        The sorted groups of *key_columns*, if already computed
+
+    Returns
+    -------
+    out_key_columns : list of Columns
+    out_value_columns : list of Columns
+    """
+    if groups is None:
+        groups = _SortedGroups(key_columns, dropna)
+    values = groups.gather(value_columns)
+
+    results = [None] * len(aggs)
+    hashed = [
+        i
+        for i, agg in enumerate(aggs)
+        if agg not in _AggregationPlan.SEGMENTED_AGGS
+    ]
+    if hashed:
+        # Hash aggregations grouped by the group numbers come out in the
+        # order of the groups
+        _, hash_results = _groupby_engine(
+            [groups.labels],
+            [values[i] for i in hashed],
+            [aggs[i] for i in hashed],
+            sort=True,
+            dropna=False,
+        )
+        for i, result in zip(hashed, hash_results):
+            results[i] = result
+    for i, agg in enumerate(aggs):
+        if results[i] is None:
+            results[i] = getattr(groups, agg)(values[i])
+    return groups.keys, results
+
+
 def _groupby_engine(key_columns, value_columns, aggs, sort, dropna):
     """
     Parameters
@@ -491,40 +1358,14 @@ def _groupby_engine(key_columns, value_columns, aggs, sort, dropna):
         key_columns, value_columns, aggs, dropna=dropna
     )
 
-    if sort:
-        key_names = ["key_" + str(i) for i in range(len(key_columns))]
-        value_names = ["value_" + str(i) for i in range(len(value_columns))]
-        value_names = _add_prefixes(value_names, aggs)
-
-        # concatenate
-        result = cudf.concat(
-            [
-                dataframe_from_columns(out_key_columns, columns=key_names),
-                dataframe_from_columns(out_value_columns, columns=value_names),
-            ],
-            axis=1,
+    if sort and len(out_key_columns) and len(out_key_columns[0]) > 1:
+        # Sort a permutation of the result keys and gather the key and
+        # value columns with it at once
+        sort_inds = get_sorted_inds(out_key_columns)
+        nkeys = len(out_key_columns)
+        result = libcudf.copying.gather(
+            out_key_columns + out_value_columns, sort_inds.data.mem
         )
-
-        # sort values
-        result = result.sort_values(key_names)
-
-        # split
-        out_key_columns = columns_from_dataframe(result[key_names])
-        out_value_columns = columns_from_dataframe(result[value_names])
+        out_key_columns, out_value_columns = result[:nkeys], result[nkeys:]
 
     return out_key_columns, out_value_columns
-
-
-def _add_prefixes(names, prefixes):
-    """
-    Return a copy of ``names`` prefixed with ``prefixes``
-    """
-    prefixed_names = names.copy()
-    if isinstance(prefixes, str):
-        prefix = prefixes
-        for i, col_name in enumerate(names):
-            prefixed_names[i] = f"{prefix}_{col_name}"
-    else:
-        for i, (prefix, col_name) in enumerate(zip(prefixes, names)):
-            prefixed_names[i] = f"{prefix}_{col_name}"
-    return prefixed_names
@@ -10,7 +10,9 @@ from librmm_cffi import librmm as rmm
 
 import cudf
 import cudf._lib as libcudf
+from cudf.core.column import as_column
 from cudf.core.series import Series
+from cudf.utils import cudautils
 
 
 def _auto_generate_grouper_agg(members):
@@ -76,6 +78,7 @@ def group_min(data, segments, output):
 
 
 _dfsegs_pack = namedtuple("_dfsegs_pack", ["df", "segs"])
+_grouping_pack = namedtuple("_grouping_pack", ["order", "segs", "keys"])
 
 
 class Groupby(object):
@@ -107,6 +110,8 @@ class Groupby(object):
         self._val_columns = [
             idx for idx in self._df.columns if idx not in self._by
         ]
+        self._cached_grouping = None
+        self._group_lookup = None
 
     def serialize(self, serialize):
         header = {"by": self._by}
@@ -125,12 +130,77 @@ class Groupby(object):
     def _group_iterator(self):
         """Group iterator
 
-        Returns each group as a DataFrame.
+        Returns each group as a DataFrame. Only the rows of the current
+        group are gathered.
         """
-        grouped = self.as_df()
-        segs = grouped.segs.to_array()
-        for begin, end in zip(segs, chain(segs[1:], [len(grouped.df)])):
-            yield grouped.df[begin:end]
+        order, segs, _ = self._grouping()
+        for begin, end in zip(segs, chain(segs[1:], [len(order)])):
+            yield self._df.take(order[begin:end])
+
+    def get_group(self, key):
+        """Get the rows of a single group.
+
+        Parameters
+        ----------
+        key : scalar or tuple
+            The value of the grouping column, or a tuple of values when
+            grouping by several columns.
+
+        Returns
+        -------
+        result : DataFrame
+        """
+        order, segs, keys = self._grouping()
+        if self._group_lookup is None:
+            self._group_lookup = {k: i for i, k in enumerate(keys)}
+        try:
+            i = self._group_lookup[key]
+        except (KeyError, TypeError):
+            raise KeyError(key)
+        end = segs[i + 1] if i + 1 < len(segs) else len(order)
+        return self._df.take(order[segs[i] : end])
+
+    def _grouping(self):
+        """Sort the row positions into groups.
+
+        The grouping is computed on first use and cached, so that the
+        dataframe itself is only gathered group by group.
+
+        Returns
+        -------
+        (order, segs, keys) : namedtuple
+            * order : device array
+                Positions of the rows in grouped order.
+            * segs : numpy array
+                Group starting index in *order*.
+            * keys : list
+                Key of each group, a tuple when grouping by several
+                columns.
+        """
+        if self._cached_grouping is not None:
+            return self._cached_grouping
+        nrows = len(self._df)
+        if nrows == 0:
+            order = rmm.device_array(0, dtype=np.int32)
+            self._cached_grouping = _grouping_pack(
+                order=order, segs=np.empty(0, dtype=np.int32), keys=[]
+            )
+            return self._cached_grouping
+        row_ids = as_column(cudautils.arange(nrows, dtype=np.int32))
+        cols = [row_ids] + self._df[self._by]._columns
+        sorted_cols, offsets = libcudf.groupby.groupby_without_aggregations(
+            cols, cols[1:]
+        )
+        key_cols = libcudf.copying.gather(sorted_cols[1:], offsets.data.mem)
+        keys = [Series(col).to_pandas() for col in key_cols]
+        if len(keys) == 1:
+            keys = list(keys[0])
+        else:
+            keys = list(zip(*keys))
+        self._cached_grouping = _grouping_pack(
+            order=sorted_cols[0].data.mem, segs=offsets.to_array(), keys=keys,
+        )
+        return self._cached_grouping
 
     def as_df(self):
         """Get the intermediate dataframe after shuffling the rows into
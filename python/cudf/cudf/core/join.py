@@ -0,0 +1,485 @@
+# Copyright (c) 2019, NVIDIA CORPORATION.
+"""
+Joins against a prebuilt index of the right frame.
+
+``JoinIndex`` hashes the key columns of a DataFrame once and keeps the
+row positions sorted by hash value. Every ``probe`` then only hashes the
+left keys, finds the candidate right rows with a binary search of the
+sorted hashes and compares the keys of the candidates, so that joining
+many small frames against the same large one does not rebuild a hash
+table over it each time.
+"""
+import numpy as np
+from numba import cuda
+
+from librmm_cffi import librmm as rmm
+
+import cudf
+import cudf._lib as libcudf
+from cudf.core._sort import get_sorted_inds
+from cudf.core.column import (
+    CategoricalColumn,
+    Column,
+    DatetimeColumn,
+    NumericalColumn,
+    StringColumn,
+    as_column,
+    column_empty_like,
+)
+from cudf.core.column.numerical import column_hash_values
+from cudf.utils import cudautils
+
+
+@cuda.jit
+def gpu_expand_candidates(lower, offsets, out_left, out_right):
+    i = cuda.grid(1)
+    if i < lower.size:
+        start = offsets[i]
+        for j in range(offsets[i + 1] - start):
+            out_left[start + j] = i
+            out_right[start + j] = lower[i] + j
+
+
+@cuda.jit
+def gpu_count_matches(left, counts):
+    i = cuda.grid(1)
+    if i < left.size:
+        cuda.atomic.add(counts, left[i], 1)
+
+
+@cuda.jit
+def gpu_mark_rows(rows, out, value):
+    i = cuda.grid(1)
+    if i < rows.size:
+        out[rows[i]] = value
+
+
+@cuda.jit
+def gpu_unmatched_sizes(offsets, out):
+    i = cuda.grid(1)
+    if i < out.size:
+        out[i] = max(offsets[i + 1] - offsets[i], 1)
+
+
+@cuda.jit
+def gpu_merge_pairs(
+    lower, offsets, left_order, right_order, out_left, out_right
+):
+    i = cuda.grid(1)
+    if i < lower.size:
+        start = offsets[i]
+        for j in range(offsets[i + 1] - start):
+            out_left[start + j] = left_order[i]
+            out_right[start + j] = right_order[lower[i] + j]
+
+
+@cuda.jit
+def gpu_left_join_pairs(offsets, out_offsets, out_left, out_match):
+    i = cuda.grid(1)
+    if i < out_offsets.size - 1:
+        start = offsets[i]
+        pos = out_offsets[i]
+        if offsets[i + 1] == start:
+            # No match, point at the null row after the matches
+            out_left[pos] = i
+            out_match[pos] = offsets[offsets.size - 1]
+        for j in range(start, offsets[i + 1]):
+            out_left[pos + j - start] = i
+            out_match[pos + j - start] = j
+
+
+def _key_column(col):
+    """The values of the key column *col*, decoding categoricals
+    """
+    if isinstance(col, CategoricalColumn):
+        return col._get_decategorized_column()
+    return col
+
+
+def _hash_keys(cols):
+    """The int32 hash of each row of the key columns *cols*.
+
+    Strings are hashed by value, since their device representation
+    depends on the dictionary of each column.
+    """
+    hashed = []
+    for col in cols:
+        if isinstance(col, StringColumn):
+            out = rmm.device_array(len(col), dtype=np.int32)
+            if len(col):
+                col.data.hash(devptr=libcudf.cudf.get_ctype_ptr(out))
+            col = as_column(out)
+        hashed.append(col)
+    return column_hash_values(*hashed)
+
+
+def _gather(cols, indices):
+    if not cols:
+        return []
+    if len(indices) == 0:
+        return [col[:0] for col in cols]
+    return libcudf.copying.gather(cols, indices)
+
+
+def _gather_or_null(col, indices):
+    """Gather *col* with *indices*, where the index ``len(col)`` gives a
+    null
+    """
+    col = Column._concat([col, column_empty_like(col, masked=True, newsize=1)])
+    if len(indices) == 0:
+        return col[:0]
+    return libcudf.copying.gather(col, indices)
+
+
+def _left_join_rows(offsets):
+    """Expand the matches of a left join, given the *offsets* of the
+    matches of each left row.
+
+    Returns the left row and the match of each output row. Left rows
+    without any match get one output row, whose match is the number of
+    matches.
+    """
+    nleft = offsets.size - 1
+    sizes = rmm.device_array(nleft, dtype=np.int32)
+    if nleft:
+        gpu_unmatched_sizes.forall(nleft)(offsets, sizes)
+    out_offsets = cudautils.prefixsum(sizes)
+    nrows = int(out_offsets[-1])
+    left_rows = rmm.device_array(nrows, dtype=np.int32)
+    matches = rmm.device_array(nrows, dtype=np.int32)
+    if nleft:
+        gpu_left_join_pairs.forall(nleft)(
+            offsets, out_offsets, left_rows, matches
+        )
+    return left_rows, matches
+
+
+def _drop_null_keys(rows, keys):
+    """The positions *rows* and key columns *keys* of the rows without
+    null keys
+    """
+    if not any(col.has_null_mask for col in keys):
+        return rows, keys
+    cols = libcudf.stream_compaction.drop_nulls(
+        [rows] + keys, how="any", subset=keys
+    )
+    return cols[0], cols[1:]
+
+
+class JoinIndex(object):
+    """A hash index over the key columns of a DataFrame, built once and
+    probed by any number of joins.
+
+    Parameters
+    ----------
+    right : DataFrame
+        The frame to join against. It must not be modified while the
+        index is in use.
+    on : label or list of labels
+        The key columns of *right*.
+
+    Examples
+    --------
+    >>> import cudf
+    >>> right = cudf.DataFrame({'key': [1, 2, 3], 'name': ['a', 'b', 'c']})
+    >>> index = cudf.JoinIndex(right, on='key')
+    >>> left = cudf.DataFrame({'key': [3, 1, 4], 'x': [0.1, 0.2, 0.3]})
+    >>> index.probe(left, how='left')
+       key    x  name
+    0    3  0.1     c
+    1    1  0.2     a
+    2    4  0.3
+    """
+
+    def __init__(self, right, on):
+        on = [on] if not isinstance(on, (list, tuple)) else list(on)
+        if not on:
+            raise ValueError("on must name at least one column")
+        for name in on:
+            if name not in right.columns:
+                raise KeyError(name)
+        self.right = right
+        self.on = on
+
+        self._keys = [_key_column(right[name]._column) for name in on]
+        self._built = {}
+        self._build(tuple(col.dtype for col in self._keys))
+
+    def __len__(self):
+        return len(self.right)
+
+    def _build(self, dtypes):
+        """The sorted hashes of the right keys cast to *dtypes*, the right
+        rows they belong to and the cast keys.
+
+        Equal values only hash alike with the same dtype, so probing with
+        keys of a wider dtype builds the index again for it, once.
+        """
+        built = self._built.get(dtypes)
+        if built is not None:
+            return built
+        keys = [
+            col if col.dtype == dtype else col.astype(dtype)
+            for col, dtype in zip(self._keys, dtypes)
+        ]
+        rows = as_column(cudautils.arange(len(self.right), dtype=np.int32))
+        rows, valid_keys = _drop_null_keys(rows, keys)
+        if len(rows):
+            hashes = _hash_keys(valid_keys)
+            order = get_sorted_inds(hashes)
+            hashes, rows = libcudf.copying.gather(
+                [hashes, rows], order.data.mem
+            )
+        else:
+            hashes = as_column(rmm.device_array(0, dtype=np.int32))
+        built = hashes, rows.data.mem, keys
+        self._built[dtypes] = built
+        return built
+
+    def _left_keys(self, left, left_on):
+        """The left key columns cast to the common dtype of each pair of
+        keys, and these dtypes
+        """
+        keys = []
+        dtypes = []
+        for lname, rcol in zip(left_on, self._keys):
+            lcol = _key_column(left[lname]._column)
+            dtype = rcol.dtype
+            if isinstance(lcol, StringColumn) != isinstance(
+                rcol, StringColumn
+            ):
+                dtype = None
+            elif lcol.dtype != rcol.dtype:
+                try:
+                    dtype = np.result_type(lcol.dtype, rcol.dtype)
+                except TypeError:
+                    dtype = None
+            if dtype is None:
+                raise TypeError(
+                    "cannot join key {!r} of dtype {} with dtype {}".format(
+                        lname, lcol.dtype, rcol.dtype
+                    )
+                )
+            if lcol.dtype != dtype:
+                lcol = lcol.astype(dtype)
+            keys.append(lcol)
+            dtypes.append(dtype)
+        return keys, tuple(dtypes)
+
+    def _matches(self, left, left_on):
+        """Pairs of positions of the left and right rows with equal keys,
+        ordered by left row
+        """
+        empty = rmm.device_array(0, dtype=np.int32)
+        left_keys, dtypes = self._left_keys(left, left_on)
+        right_hashes, right_rows, right_keys = self._build(dtypes)
+        rows = as_column(cudautils.arange(len(left), dtype=np.int32))
+        rows, keys = _drop_null_keys(rows, left_keys)
+        if len(rows) == 0 or len(right_rows) == 0:
+            return empty, empty
+
+        hashes = _hash_keys(keys)
+        lower = libcudf.search.search_sorted(right_hashes, hashes, "left")
+        upper = libcudf.search.search_sorted(right_hashes, hashes, "right")
+        counts = upper.astype(np.int32).binary_operator(
+            "sub", lower.astype(np.int32)
+        )
+        offsets = cudautils.prefixsum(counts.data.mem)
+        ncandidates = int(offsets[-1])
+        if ncandidates == 0:
+            return empty, empty
+
+        cand_left = rmm.device_array(ncandidates, dtype=np.int32)
+        cand_right = rmm.device_array(ncandidates, dtype=np.int32)
+        lower = lower.astype(np.int32).data.mem
+        gpu_expand_candidates.forall(len(lower))(
+            lower, offsets, cand_left, cand_right
+        )
+        # Map the candidates back to the rows of both frames and keep
+        # those whose keys are equal and not only their hashes
+        cand_left = libcudf.copying.gather(rows, cand_left)
+        cand_right = libcudf.copying.gather(as_column(right_rows), cand_right)
+        lkeys = _gather(left_keys, cand_left.data.mem)
+        rkeys = _gather(right_keys, cand_right.data.mem)
+        equal = None
+        for lcol, rcol in zip(lkeys, rkeys):
+            eq = lcol.unordered_compare("eq", rcol)
+            equal = eq if equal is None else equal.binary_operator("and", eq)
+        pairs = libcudf.stream_compaction.apply_boolean_mask(
+            [cand_left, cand_right], equal
+        )
+        return pairs[0].data.mem, pairs[1].data.mem
+
+    def probe(self, left, how="inner", left_on=None, suffixes=("_x", "_y")):
+        """Join *left* against the indexed frame.
+
+        Parameters
+        ----------
+        left : DataFrame
+        how : {'inner', 'left', 'leftsemi', 'leftanti'}, default 'inner'
+            'inner' keeps the left rows with a match, 'left' keeps every
+            left row. 'leftsemi' and 'leftanti' keep the left rows with
+            and without a match, without any right column. The rows are
+            in the order of *left*.
+        left_on : label or list of labels, optional
+            The key columns of *left*, defaults to the ``on`` columns of
+            the index.
+        suffixes : tuple of str, default ('_x', '_y')
+            Suffixes of the overlapping non-key column names.
+
+        Returns
+        -------
+        merged : DataFrame
+            The left columns followed by the non-key right columns.
+            Semi and anti joins only have the left columns.
+        """
+        if how not in ("inner", "left", "leftsemi", "leftanti"):
+            raise NotImplementedError(
+                "{!r} join not supported by JoinIndex".format(how)
+            )
+        if left_on is None:
+            left_on = self.on
+        else:
+            left_on = (
+                [left_on]
+                if not isinstance(left_on, (list, tuple))
+                else list(left_on)
+            )
+        if len(left_on) != len(self.on):
+            raise ValueError(
+                "left_on and on must have the same number of columns"
+            )
+
+        left_rows, right_rows = self._matches(left, left_on)
+        if how in ("leftsemi", "leftanti"):
+            anti = how == "leftanti"
+            mask = cudautils.full(len(left), anti, dtype=np.bool_)
+            if len(left_rows):
+                gpu_mark_rows.forall(len(left_rows))(left_rows, mask, not anti)
+            return left._apply_boolean_mask(mask).reset_index(drop=True)
+
+        out_match = None
+        if how == "left":
+            counts = cudautils.zeros(len(left), dtype=np.int32)
+            if len(left_rows):
+                gpu_count_matches.forall(len(left_rows))(left_rows, counts)
+            left_rows, out_match = _left_join_rows(cudautils.prefixsum(counts))
+
+        right_names = [
+            name for name in self.right.columns if name not in self.on
+        ]
+        left_names = list(left.columns)
+        lsuffix, rsuffix = suffixes
+        overlap = set(left_names) & set(right_names)
+
+        out = cudf.DataFrame()
+        left_cols = _gather(
+            [left[name]._column for name in left_names], left_rows
+        )
+        for name, col in zip(left_names, left_cols):
+            if name in overlap:
+                name = "{}{}".format(name, lsuffix)
+            out[name] = col
+        right_cols = _gather(
+            [self.right[name]._column for name in right_names], right_rows
+        )
+        for name, col in zip(right_names, right_cols):
+            if out_match is not None:
+                # The right rows of the matches, and nulls for the left
+                # rows without any
+                col = _gather_or_null(col, out_match)
+            if name in overlap:
+                name = "{}{}".format(name, rsuffix)
+            out[name] = col
+        return out
+
+
+def _is_sorted(col):
+    return len(col) < 2 or col.is_monotonic_increasing
+
+
+def _sort_order(col):
+    """The positions of *col* in sorted order, and *col* sorted
+    """
+    if _is_sorted(col):
+        return cudautils.arange(len(col), dtype=np.int32), col
+    order = get_sorted_inds(col).data.mem
+    return order, libcudf.copying.gather(col, order)
+
+
+def sort_join(col_lhs, col_rhs, left_on, right_on, how):
+    """Join with a merge scan of the sorted keys.
+
+    Takes the arguments of ``libcudf.join.join`` but the method, and
+    returns its result, with the rows in key order. The sides whose keys
+    are already monotonic increasing are not sorted, and the matches of
+    each left key are found by a binary search for its bounds in the
+    right keys.
+
+    Only inner and left joins on a single numeric or datetime key
+    without nulls are supported; None is returned for other joins.
+    """
+    if how not in ("inner", "left") or len(left_on) != 1:
+        return None
+    lkey = col_lhs[left_on[0]]._column
+    rkey = col_rhs[right_on[0]]._column
+    for key in (lkey, rkey):
+        if type(key) not in (NumericalColumn, DatetimeColumn):
+            return None
+        if key.null_count:
+            return None
+    if lkey.dtype != rkey.dtype:
+        if isinstance(lkey, DatetimeColumn) or isinstance(
+            rkey, DatetimeColumn
+        ):
+            return None
+        dtype = np.result_type(lkey.dtype, rkey.dtype)
+        lkey, rkey = lkey.astype(dtype), rkey.astype(dtype)
+
+    left_order, lkey = _sort_order(lkey)
+    right_order, rkey = _sort_order(rkey)
+    if len(lkey) and len(rkey):
+        lower = libcudf.search.search_sorted(rkey, lkey, "left")
+        upper = libcudf.search.search_sorted(rkey, lkey, "right")
+        lower = lower.astype(np.int32)
+        counts = upper.astype(np.int32).binary_operator("sub", lower)
+        lower, counts = lower.data.mem, counts.data.mem
+    else:
+        lower = cudautils.zeros(len(lkey), dtype=np.int32)
+        counts = lower
+    offsets = cudautils.prefixsum(counts)
+
+    nmatches = int(offsets[-1])
+    left_rows = rmm.device_array(nmatches, dtype=np.int32)
+    right_rows = rmm.device_array(nmatches, dtype=np.int32)
+    if len(lkey):
+        gpu_merge_pairs.forall(len(lkey))(
+            lower, offsets, left_order, right_order, left_rows, right_rows
+        )
+    matches = None
+    if how == "left":
+        positions, matches = _left_join_rows(offsets)
+        left_rows = _gather([as_column(left_order)], positions)[0].data.mem
+
+    # The columns in the order of libcudf: the left values, the left
+    # keys and the right values
+    left_names = [name for name in col_lhs if name not in left_on]
+    left_names += list(left_on)
+    right_names = [name for name in col_rhs if name not in right_on]
+    left_cols = _gather(
+        [col_lhs[name]._column for name in left_names], left_rows
+    )
+    right_cols = _gather(
+        [col_rhs[name]._column for name in right_names], right_rows
+    )
+    if matches is not None:
+        right_cols = [_gather_or_null(col, matches) for col in right_cols]
+
+    result = []
+    for name, col in zip(left_names + right_names, left_cols + right_cols):
+        if isinstance(col, StringColumn):
+            result.append((col.data, None, name))
+        else:
+            mask = col.mask.mem if col.has_null_mask else None
+            result.append((col.data.mem, mask, name))
+    return result
@@ -0,0 +1,439 @@
+# Copyright (c) 2019, NVIDIA CORPORATION.
+"""
+Deferred evaluation of elementwise column expressions.
+
+``DataFrame.lazy()`` returns a ``LazyFrame`` whose columns are expression
+trees instead of data. Operators on them record the expression, and
+``collect()`` generates a single CUDA kernel computing every new column
+in one pass over the referenced input columns, so intermediate results
+are never materialized.
+"""
+import operator
+import time
+from collections import OrderedDict
+
+import numpy as np
+import six
+from numba import cuda
+
+from librmm_cffi import librmm as rmm
+
+from cudf.utils import applyutils, kernelcache, queryutils
+
+_BINARY_OPS = OrderedDict(
+    [
+        ("add", "+"),
+        ("sub", "-"),
+        ("mul", "*"),
+        ("truediv", "/"),
+        ("floordiv", "//"),
+        ("mod", "%"),
+        ("pow", "**"),
+        ("and", "&"),
+        ("or", "|"),
+        ("xor", "^"),
+        ("eq", "=="),
+        ("ne", "!="),
+        ("lt", "<"),
+        ("le", "<="),
+        ("gt", ">"),
+        ("ge", ">="),
+    ]
+)
+
+_UNARY_OPS = OrderedDict([("neg", "-"), ("invert", "~"), ("pos", "+")])
+
+# Python operators evaluating each symbol, used to infer result dtypes
+_SYMBOL_FUNCS = {
+    symbol: getattr(
+        operator, name if name not in ("and", "or") else name + "_"
+    )
+    for name, symbol in _BINARY_OPS.items()
+}
+_SYMBOL_FUNCS.update(
+    {"u-": operator.neg, "u~": operator.invert, "u+": operator.pos}
+)
+
+
+class Expr(object):
+    """A node of a deferred column expression.
+    """
+
+    __hash__ = None
+
+    def _binop(self, other, symbol, reflect=False):
+        other = other if isinstance(other, Expr) else Literal(other)
+        if reflect:
+            return BinOp(symbol, other, self)
+        return BinOp(symbol, self, other)
+
+
+def _make_binop(symbol, reflect=False):
+    def op(self, other):
+        return self._binop(other, symbol, reflect=reflect)
+
+    return op
+
+
+def _make_unaryop(symbol):
+    def op(self):
+        return UnaryOp(symbol, self)
+
+    return op
+
+
+for _name, _symbol in _BINARY_OPS.items():
+    setattr(Expr, "__{}__".format(_name), _make_binop(_symbol))
+    if _symbol not in ("==", "!=", "<", "<=", ">", ">="):
+        setattr(
+            Expr, "__r{}__".format(_name), _make_binop(_symbol, reflect=True)
+        )
+for _name, _symbol in _UNARY_OPS.items():
+    setattr(Expr, "__{}__".format(_name), _make_unaryop(_symbol))
+
+
+class Col(Expr):
+    def __init__(self, name):
+        self.name = name
+
+    def __repr__(self):
+        return "Col({!r})".format(self.name)
+
+
+class Literal(Expr):
+    def __init__(self, value):
+        self.value = value
+
+    def __repr__(self):
+        return "Literal({!r})".format(self.value)
+
+
+class BinOp(Expr):
+    def __init__(self, symbol, left, right):
+        self.symbol = symbol
+        self.left = left
+        self.right = right
+
+    def __repr__(self):
+        return "({!r} {} {!r})".format(self.left, self.symbol, self.right)
+
+
+class UnaryOp(Expr):
+    def __init__(self, symbol, operand):
+        self.symbol = symbol
+        self.operand = operand
+
+    def __repr__(self):
+        return "({}{!r})".format(self.symbol, self.operand)
+
+
+class _CodeGen(object):
+    """Translate expressions into kernel source and arguments.
+
+    Columns become array arguments indexed by the thread index, and
+    literals become scalar arguments, so that a kernel is reusable for
+    any literal values.
+    """
+
+    def __init__(self):
+        self.columns = OrderedDict()
+        self.literals = []
+
+    def visit(self, expr):
+        if isinstance(expr, Col):
+            if expr.name not in self.columns:
+                self.columns[expr.name] = "_args_col{}".format(
+                    len(self.columns)
+                )
+            return "{}[idx]".format(self.columns[expr.name])
+        if isinstance(expr, Literal):
+            self.literals.append(expr.value)
+            return "_args_lit{}".format(len(self.literals) - 1)
+        if isinstance(expr, BinOp):
+            return "({} {} {})".format(
+                self.visit(expr.left), expr.symbol, self.visit(expr.right)
+            )
+        if isinstance(expr, UnaryOp):
+            return "({}{})".format(expr.symbol, self.visit(expr.operand))
+        raise TypeError("unsupported expression {!r}".format(expr))
+
+
+def _result_dtype(expr, dtypes):
+    """Infer the dtype of *expr* by evaluating it on one-element arrays.
+    """
+
+    def evaluate(expr):
+        if isinstance(expr, Col):
+            return np.ones(1, dtype=dtypes[expr.name])
+        if isinstance(expr, Literal):
+            return expr.value
+        if isinstance(expr, BinOp):
+            func = _SYMBOL_FUNCS[expr.symbol]
+            return func(evaluate(expr.left), evaluate(expr.right))
+        func = _SYMBOL_FUNCS["u" + expr.symbol]
+        return func(evaluate(expr.operand))
+
+    with np.errstate(all="ignore"):
+        return np.asarray(evaluate(expr)).dtype
+
+
+_kernel_source = """
+@cuda.jit
+def {kernelname}({args}):
+    idx = cuda.grid(1)
+    if idx < _args_out0.size:
+{body}
+"""
+
+# Fused kernels keyed by their source
+_cache = queryutils._LRUCache(maxsize=256)
+
+
+def lazy_cache_info():
+    """Statistics of the fused kernel cache, like ``query_cache_info``.
+    """
+    return _cache.info()
+
+
+def set_lazy_cache_size(maxsize):
+    """Set the maximum number of fused kernels kept in memory.
+    """
+    if maxsize < 1:
+        raise ValueError("maxsize must be positive")
+    _cache.resize(maxsize)
+
+
+def clear_lazy_cache():
+    """Drop the fused kernels kept in memory.
+    """
+    _cache.clear()
+
+
+def _fused_kernel(exprs, literals, columns):
+    """Build the kernel evaluating the expression sources *exprs*.
+    """
+    outputs = ["_args_out{}".format(i) for i in range(len(exprs))]
+    args = (
+        outputs
+        + list(columns)
+        + ["_args_lit{}".format(i) for i in range(len(literals))]
+    )
+    body = "\n".join(
+        "        {} = {}".format("{}[idx]".format(out), src)
+        for out, src in zip(outputs, exprs)
+    )
+    src = _kernel_source.format(
+        kernelname="fused_kernel", args=", ".join(args), body=body
+    )
+    kernel = _cache.get(src)
+    if kernel is None:
+        start = time.perf_counter()
+        glbls = {"cuda": cuda}
+        six.exec_(src, glbls)
+        kernel = kernelcache.CachedKernel(glbls["fused_kernel"], key=src)
+        _cache.compile_time += time.perf_counter() - start
+        _cache.put(src, kernel)
+    return kernel
+
+
+def evaluate(df, exprs):
+    """Evaluate elementwise expressions over the columns of *df*.
+
+    Every expression is computed by a single fused kernel. Rows where any
+    referenced column is null are null in every result.
+
+    Parameters
+    ----------
+    df : DataFrame
+    exprs : list of Expr
+
+    Returns
+    -------
+    list of Series
+    """
+    from cudf.core.series import Series
+
+    codegen = _CodeGen()
+    sources = [codegen.visit(expr) for expr in exprs]
+    columns = list(codegen.columns)
+    for name in columns:
+        if name not in df.columns:
+            raise KeyError(name)
+        if not np.issubdtype(df[name].dtype, np.number) and not (
+            df[name].dtype == np.bool_
+        ):
+            raise TypeError(
+                "lazy expressions only support numeric columns, "
+                "column {!r} is of dtype {}".format(name, df[name].dtype)
+            )
+    dtypes = {name: df[name].dtype for name in columns}
+
+    nrows = len(df)
+    outputs = [
+        rmm.device_array(nrows, dtype=_result_dtype(expr, dtypes))
+        for expr in exprs
+    ]
+    kernel = _fused_kernel(sources, codegen.literals, codegen.columns.values())
+    if nrows:
+        colarrays = [df[name].data.mem for name in columns]
+        kernel.forall(nrows)(*(outputs + colarrays + codegen.literals))
+
+    out_mask = applyutils.make_aggregate_nullmask(df, columns=columns)
+    results = []
+    for out in outputs:
+        result = Series(out, index=df.index)
+        if out_mask is not None:
+            result = result.set_mask(out_mask.data)
+        results.append(result)
+    return results
+
+
+class LazyColumn(object):
+    """A deferred column of a ``LazyFrame``.
+
+    Supports the arithmetic, comparison, bitwise and unary operators,
+    which return new deferred columns.
+    """
+
+    __hash__ = None
+
+    def __init__(self, frame, expr, name=None):
+        self._frame = frame
+        self._expr = expr
+        self.name = name
+
+    def collect(self):
+        """Compute the column.
+        """
+        df = self._frame._df
+        if isinstance(self._expr, Col) and not self._frame._exprs:
+            return df[self._expr.name]
+        [result] = evaluate(df, [self._expr])
+        result.name = self.name
+        return result
+
+    def __repr__(self):
+        return "LazyColumn({!r})".format(self._expr)
+
+
+def _lazy_binop(name):
+    method = "__{}__".format(name)
+
+    def op(self, other):
+        if isinstance(other, LazyColumn):
+            other = other._expr
+        return LazyColumn(self._frame, getattr(self._expr, method)(other))
+
+    return op
+
+
+def _lazy_unaryop(name):
+    method = "__{}__".format(name)
+
+    def op(self):
+        return LazyColumn(self._frame, getattr(self._expr, method)())
+
+    return op
+
+
+for _name in _BINARY_OPS:
+    for _method in (_name, "r" + _name):
+        if hasattr(Expr, "__{}__".format(_method)):
+            setattr(LazyColumn, "__{}__".format(_method), _lazy_binop(_method))
+for _name in _UNARY_OPS:
+    setattr(LazyColumn, "__{}__".format(_name), _lazy_unaryop(_name))
+
+
+class LazyFrame(object):
+    """A DataFrame whose new columns are computed on ``collect()``.
+
+    Columns assigned to a ``LazyFrame`` are recorded as expressions of the
+    columns of the original DataFrame. ``collect()`` evaluates all of
+    them in a single fused CUDA kernel.
+
+    Examples
+    --------
+    >>> import cudf
+    >>> df = cudf.DataFrame({'a': [1, 2], 'b': [3, 4], 'c': [5, 6]})
+    >>> lf = df.lazy()
+    >>> lf['d'] = (lf['a'] * lf['b'] + lf['c']) / 2 > 4
+    >>> lf.collect()
+       a  b  c      d
+    0  1  3  5  False
+    1  2  4  6   True
+    """
+
+    def __init__(self, df):
+        self._df = df
+        self._exprs = OrderedDict()
+
+    @property
+    def columns(self):
+        names = list(self._df.columns)
+        names.extend(name for name in self._exprs if name not in names)
+        return names
+
+    def __getitem__(self, name):
+        if name in self._exprs:
+            return LazyColumn(self, self._exprs[name], name=name)
+        if name in self._df.columns:
+            return LazyColumn(self, Col(name), name=name)
+        raise KeyError(name)
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        if name in self.columns:
+            return self[name]
+        raise AttributeError(
+            "'LazyFrame' object has no attribute {!r}".format(name)
+        )
+
+    def __setitem__(self, name, value):
+        if isinstance(value, LazyColumn):
+            if value._frame is not self:
+                raise ValueError("column belongs to another LazyFrame")
+            value = value._expr
+        elif not np.isscalar(value):
+            raise TypeError(
+                "only lazy columns and scalars can be assigned, "
+                "got {}".format(type(value).__name__)
+            )
+        else:
+            value = Literal(value)
+        self._exprs[name] = value
+
+    def assign(self, **kwargs):
+        """Return a new LazyFrame with the deferred columns *kwargs*.
+        """
+        out = LazyFrame(self._df)
+        out._exprs.update(self._exprs)
+        for name, value in kwargs.items():
+            if isinstance(value, LazyColumn):
+                value = LazyColumn(out, value._expr)
+            out[name] = value
+        return out
+
+    def collect(self):
+        """Compute the deferred columns and return a DataFrame.
+        """
+        out = self._df.copy(deep=False)
+        computed = OrderedDict()
+        for name, expr in self._exprs.items():
+            if isinstance(expr, Col):
+                out[name] = self._df[expr.name]
+            elif isinstance(expr, Literal):
+                out[name] = expr.value
+            else:
+                computed[name] = expr
+        if computed:
+            results = evaluate(self._df, list(computed.values()))
+            for name, result in zip(computed, results):
+                out[name] = result
+        return out
+
+    def __repr__(self):
+        lines = ["LazyFrame with columns {}".format(list(self._df.columns))]
+        for name, expr in self._exprs.items():
+            lines.append("  {} = {!r}".format(name, expr))
+        return "\n".join(lines)
@@ -0,0 +1,221 @@
+# Copyright (c) 2019, NVIDIA CORPORATION.
+"""
+Accounting of device memory per named operation.
+
+Device allocations are recorded when they are wrapped in a ``Buffer``.
+Each allocation is counted once, however many buffers view it, and is
+released when its device memory is freed. Allocations are attributed to
+every scope opened with ``annotate`` on the current thread, e.g.
+``CUDF_QUERY`` or ``CUDF_JOIN``, which also mark the NVTX ranges seen by
+the NVIDIA profilers.
+
+Accounting only happens inside ``memory_profile``; temporary memory
+allocated and freed within libcudf is not seen.
+"""
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from contextlib import ContextDecorator, contextmanager
+
+from cudf.utils import profiling
+
+_lock = threading.Lock()
+_local = threading.local()
+_profiles = []
+_current = 0
+# Allocations already recorded
+_seen = weakref.WeakSet()
+
+
+class _Scope(object):
+    __slots__ = ("name", "start", "peak", "allocated", "freed", "t0")
+
+    def __init__(self, name, start):
+        self.name = name
+        self.t0 = time.perf_counter()
+        self.start = start
+        self.peak = start
+        self.allocated = 0
+        self.freed = 0
+
+
+def _scopes():
+    try:
+        return _local.scopes
+    except AttributeError:
+        _local.scopes = []
+        return _local.scopes
+
+
+class annotate(ContextDecorator):
+    """Context manager and decorator marking a named operation.
+
+    Opens an NVTX range and a memory accounting scope named *name*, and
+    records the time spent in active ``cudf.profile`` blocks.
+
+    Parameters
+    ----------
+    name : str
+        The name of the operation.
+    color : str
+        The color of the NVTX range.
+    """
+
+    def __init__(self, name, color="green"):
+        self.name = name
+        self.color = color
+
+    def __enter__(self):
+        # cudf._lib imports Buffer, which records allocations here
+        from cudf._lib.nvtx import nvtx_range_push
+
+        nvtx_range_push(self.name, self.color)
+        _scopes().append(_Scope(self.name, _current))
+        return self
+
+    def __exit__(self, *exc):
+        from cudf._lib.nvtx import nvtx_range_pop
+
+        scope = _scopes().pop()
+        nvtx_range_pop()
+        if profiling.is_profiling():
+            profiling.record(scope.name, scope.t0, time.perf_counter())
+        with _lock:
+            for profile in _profiles:
+                profile._record_scope(scope)
+        return False
+
+
+def record_allocation(mem):
+    """Record the device memory of the array *mem*, if not seen before.
+    """
+    global _current
+    if not _profiles:
+        return
+    gpu_data = getattr(mem, "gpu_data", None)
+    if gpu_data is None:
+        return
+    owner = gpu_data.owner
+    nbytes = int(owner.size)
+    if nbytes == 0:
+        return
+    with _lock:
+        if owner in _seen:
+            return
+        _seen.add(owner)
+        _current += nbytes
+        for profile in _profiles:
+            profile._record_allocation(nbytes)
+        profiles = list(_profiles)
+    scopes = list(_scopes())
+    for scope in scopes:
+        scope.allocated += nbytes
+        scope.peak = max(scope.peak, _current)
+    # Finalizers run on whichever thread collects the memory, inside
+    # unrelated scopes, so the free is credited to the profiles and scopes
+    # that saw the allocation
+    weakref.finalize(owner, _record_free, nbytes, profiles, scopes)
+
+
+def _record_free(nbytes, profiles, scopes):
+    global _current
+    with _lock:
+        _current -= nbytes
+        for profile in profiles:
+            if profile in _profiles:
+                profile.freed += nbytes
+    for scope in scopes:
+        scope.freed += nbytes
+
+
+class MemoryProfile(object):
+    """Device memory allocated during a ``memory_profile`` block.
+
+    Attributes
+    ----------
+    allocated : int
+        Number of bytes allocated.
+    freed : int
+        Number of bytes freed.
+    peak : int
+        Largest number of bytes held at once, relative to the start of
+        the block.
+    """
+
+    def __init__(self):
+        self.start = _current
+        self.allocated = 0
+        self.freed = 0
+        self.peak = 0
+        self._stats = OrderedDict()
+
+    def _record_allocation(self, nbytes):
+        self.allocated += nbytes
+        self.peak = max(self.peak, _current - self.start)
+
+    def _record_scope(self, scope):
+        stats = self._stats.setdefault(
+            scope.name, {"calls": 0, "allocated": 0, "freed": 0, "peak": 0}
+        )
+        stats["calls"] += 1
+        stats["allocated"] += scope.allocated
+        stats["freed"] += scope.freed
+        stats["peak"] = max(stats["peak"], scope.peak - scope.start)
+
+    def stats(self):
+        """Per-operation statistics.
+
+        Returns
+        -------
+        dict mapping operation names to dicts with the number of
+        ``calls``, the bytes ``allocated`` and ``freed``, and the
+        high-water mark ``peak`` of bytes held during a single call.
+        """
+        with _lock:
+            return OrderedDict(
+                (name, dict(stats)) for name, stats in self._stats.items()
+            )
+
+    def peaks(self):
+        """High-water mark of bytes held during each operation.
+        """
+        return OrderedDict(
+            (name, stats["peak"]) for name, stats in self.stats().items()
+        )
+
+    def __repr__(self):
+        lines = [
+            "MemoryProfile(allocated={}, freed={}, peak={})".format(
+                self.allocated, self.freed, self.peak
+            )
+        ]
+        for name, stats in self.stats().items():
+            lines.append(
+                "  {}: calls={calls}, allocated={allocated}, "
+                "freed={freed}, peak={peak}".format(name, **stats)
+            )
+        return "\n".join(lines)
+
+
+@contextmanager
+def memory_profile():
+    """Record the device memory allocated by cudf operations.
+
+    Examples
+    --------
+    >>> import cudf
+    >>> df = cudf.DataFrame({'a': [1, 2, 3], 'b': [3, 2, 1]})
+    >>> with cudf.memory_profile() as prof:
+    ...     out = df.merge(df, on='a')
+    >>> prof.peaks()  # doctest: +SKIP
+    OrderedDict([('CUDF_JOIN', 1024)])
+    """
+    profile = MemoryProfile()
+    with _lock:
+        _profiles.append(profile)
+    try:
+        yield profile
+    finally:
+        with _lock:
+            _profiles.remove(profile)
@@ -16,7 +16,7 @@ from cudf.core.column import Column, DatetimeColumn, column
 from cudf.core.index import Index, RangeIndex, as_index
 from cudf.core.indexing import _SeriesIlocIndexer, _SeriesLocIndexer
 from cudf.core.window import Rolling
-from cudf.utils import cudautils, ioutils, utils
+from cudf.utils import cudautils, ioutils, profiling, utils
 from cudf.utils.docutils import copy_docstring
 from cudf.utils.dtypes import (
     is_categorical_dtype,
@@ -138,6 +138,7 @@ class Series(object):
         return item in self._index
 
     @classmethod
+    @profiling.instrument()
     def from_pandas(cls, s, nan_as_null=True):
         return cls(s, nan_as_null=nan_as_null)
 
@@ -423,6 +424,7 @@ class Series(object):
 
         self._column[key] = value
 
+    @profiling.instrument()
     def take(self, indices, ignore_index=False):
         """Return Series by taking values from the corresponding *indices*.
         """
@@ -1106,6 +1108,7 @@ class Series(object):
         """A boolean indicating whether a null-mask is needed"""
         return self._column.has_null_mask
 
+    @profiling.instrument()
     def drop_duplicates(self, keep="first", inplace=False):
         """
         Return Series with duplicate values removed
@@ -1133,6 +1136,7 @@ class Series(object):
             out = Series(out_cols[0], index=new_index, name=self.name)
             return out
 
+    @profiling.instrument()
     def dropna(self):
         """
         Return a Series with null values removed.
@@ -1147,6 +1151,7 @@ class Series(object):
         else:
             return result[self.name]
 
+    @profiling.instrument()
     def fillna(self, value, method=None, axis=None, inplace=False, limit=None):
         """Fill null values with ``value``.
 
@@ -1337,6 +1342,7 @@ class Series(object):
         """
         return self._column.to_gpu_array(fillna=fillna)
 
+    @profiling.instrument()
     def to_pandas(self, index=True):
         if index is True:
             index = self.index.to_pandas()
@@ -1397,6 +1403,7 @@ class Series(object):
         """
         return cudautils.compact_mask_bytes(self.to_gpu_array())
 
+    @profiling.instrument()
     def astype(self, dtype, **kwargs):
         """
         Cast the Series to the given dtype
@@ -1429,12 +1436,14 @@ class Series(object):
         """
         return self._sort(ascending=ascending, na_position=na_position)[1]
 
+    @profiling.instrument()
     def sort_index(self, ascending=True):
         """Sort by the index.
         """
         inds = self.index.argsort(ascending=ascending)
         return self.take(inds.to_gpu_array())
 
+    @profiling.instrument()
     def sort_values(self, ascending=True, na_position="last"):
         """
         Sort by the values.
@@ -1898,6 +1907,7 @@ class Series(object):
         warnings.warn("Use .unique() instead", DeprecationWarning)
         return self.unique()
 
+    @profiling.instrument()
     def unique(self, method="sort", sort=True):
         """Returns unique values of this Series.
         default='sort' will be changed to 'hash' when implemented.
@@ -1926,6 +1936,7 @@ class Series(object):
         return self._column.unique_count(method=method, dropna=dropna)
         # return len(self._column.unique())
 
+    @profiling.instrument()
     def value_counts(self, sort=True):
         """Returns unique values of this Series.
         """
@@ -0,0 +1,235 @@
+# Copyright (c) 2019, NVIDIA CORPORATION.
+"""
+Spilling of idle device buffers to host memory and disk.
+
+When enabled with ``enable_spilling``, every ``Buffer`` allocated
+afterwards is tracked in least-recently-used order. Once the tracked
+device memory exceeds ``device_limit``, the least recently used buffers
+are copied to host memory and their device memory is released. Once the
+spilled host memory exceeds ``host_limit``, the least recently used host
+copies are written to files in ``spill_directory``. Accessing
+``Buffer.mem`` moves a spilled buffer back to the device.
+
+Only buffers that were never exposed are spilled. Accessing
+``Buffer.mem`` hands the device array, and so its pointer, to code that
+may keep it: numba kernels, libcudf bindings or slices of the buffer. The
+buffer is then marked as exposed and stays on the device for the rest of
+its life. Buffers created by an operation and not used since, e.g. the
+partitions a dask worker holds for later tasks, remain spillable. The
+character data of string columns is owned by nvstrings and is never
+spilled.
+"""
+import os
+import sys
+import tempfile
+import threading
+import uuid
+import weakref
+from collections import OrderedDict
+
+import numpy as np
+
+from librmm_cffi import librmm as rmm
+
+_manager = None
+
+
+class SpillManager(object):
+    """Track device buffers and spill the least recently used ones.
+
+    Parameters
+    ----------
+    device_limit : int
+        Number of bytes of tracked device memory above which buffers are
+        spilled to host memory.
+    host_limit : int, optional
+        Number of bytes of spilled host memory above which buffers are
+        spilled to disk. By default, spilled buffers stay in host memory.
+    spill_directory : str, optional
+        Directory in which a temporary directory for spilled buffers is
+        created. Defaults to the system temporary directory.
+    """
+
+    def __init__(self, device_limit, host_limit=None, spill_directory=None):
+        self.device_limit = device_limit
+        self.host_limit = host_limit
+        self.spill_directory = spill_directory
+        self.device_bytes = 0
+        self.host_bytes = 0
+        self.disk_bytes = 0
+        self.counts = {"to_host": 0, "to_disk": 0, "to_device": 0}
+        self._lock = threading.RLock()
+        self._refs = {}
+        self._nbytes = {}
+        # Keys in least-recently-used order
+        self._device = OrderedDict()
+        self._host = OrderedDict()
+        self._disk = {}
+        self._directory = None
+
+    def add(self, buf):
+        """Start tracking the device memory of *buf*.
+        """
+        key = id(buf)
+        nbytes = int(buf._mem.alloc_size)
+        with self._lock:
+            self._forget(key)
+            self._refs[key] = weakref.ref(buf, self._finalizer(key))
+            self._nbytes[key] = nbytes
+            self._device[key] = None
+            self.device_bytes += nbytes
+            self._maybe_spill(exclude=key)
+
+    def access(self, buf):
+        """Mark *buf* as used, moving it back to the device if spilled.
+        """
+        key = id(buf)
+        with self._lock:
+            if key in self._device:
+                self._device.move_to_end(key)
+                return
+            nbytes = self._nbytes.get(key)
+            if key in self._host:
+                del self._host[key]
+                self.host_bytes -= nbytes
+                host = buf._host
+            elif key in self._disk:
+                path = self._disk.pop(key)
+                self.disk_bytes -= nbytes
+                host = np.load(path)
+                os.remove(path)
+            else:
+                return
+            buf._host = None
+            self.counts["to_device"] += 1
+            # The setter records the allocation and tracks the buffer again
+            buf.mem = rmm.to_device(host)
+
+    def unspill_all(self):
+        """Move all spilled buffers back to the device.
+        """
+        with self._lock:
+            for key in list(self._host) + list(self._disk):
+                buf = self._refs[key]()
+                if buf is not None:
+                    self.access(buf)
+
+    def stats(self):
+        """Number of bytes in each location and number of moves.
+        """
+        with self._lock:
+            out = {
+                "device_bytes": self.device_bytes,
+                "host_bytes": self.host_bytes,
+                "disk_bytes": self.disk_bytes,
+            }
+            out.update(self.counts)
+            return out
+
+    def _finalizer(self, key):
+        # Avoid a reference cycle between the manager and the callback
+        selfref = weakref.ref(self)
+
+        def callback(_):
+            manager = selfref()
+            if manager is not None:
+                with manager._lock:
+                    manager._forget(key)
+
+        return callback
+
+    def _forget(self, key):
+        nbytes = self._nbytes.pop(key, None)
+        self._refs.pop(key, None)
+        if key in self._device:
+            del self._device[key]
+            self.device_bytes -= nbytes
+        elif key in self._host:
+            del self._host[key]
+            self.host_bytes -= nbytes
+        elif key in self._disk:
+            path = self._disk.pop(key)
+            self.disk_bytes -= nbytes
+            if os.path.exists(path):
+                os.remove(path)
+
+    def _spill_path(self):
+        if self._directory is None:
+            self._directory = tempfile.mkdtemp(
+                prefix="cudf-spill-", dir=self.spill_directory
+            )
+        return os.path.join(self._directory, uuid.uuid4().hex + ".npy")
+
+    def _maybe_spill(self, exclude=None):
+        for key in list(self._device):
+            if self.device_bytes <= self.device_limit:
+                break
+            buf = self._refs[key]()
+            # Exposed pointers may be in use anywhere. Otherwise the buffer
+            # itself and the getrefcount argument hold the only references
+            # to an array that can be released
+            if (
+                key == exclude
+                or buf is None
+                or buf._exposed
+                or sys.getrefcount(buf._mem) > 2
+            ):
+                continue
+            nbytes = self._nbytes[key]
+            buf._host = buf._mem.copy_to_host()
+            buf._mem = None
+            del self._device[key]
+            self._host[key] = None
+            self.device_bytes -= nbytes
+            self.host_bytes += nbytes
+            self.counts["to_host"] += 1
+
+        if self.host_limit is None:
+            return
+        for key in list(self._host):
+            if self.host_bytes <= self.host_limit:
+                break
+            buf = self._refs[key]()
+            if buf is None:
+                continue
+            nbytes = self._nbytes[key]
+            path = self._spill_path()
+            np.save(path, buf._host)
+            buf._host = None
+            del self._host[key]
+            self._disk[key] = path
+            self.host_bytes -= nbytes
+            self.disk_bytes += nbytes
+            self.counts["to_disk"] += 1
+
+
+def enable_spilling(device_limit, host_limit=None, spill_directory=None):
+    """Spill buffers allocated from now on when memory limits are reached.
+
+    See ``SpillManager`` for the parameters. Returns the manager.
+    """
+    global _manager
+    disable_spilling()
+    _manager = SpillManager(
+        device_limit, host_limit=host_limit, spill_directory=spill_directory
+    )
+    return _manager
+
+
+def disable_spilling():
+    """Move all spilled buffers back to the device and stop tracking.
+    """
+    global _manager
+    manager, _manager = _manager, None
+    if manager is not None:
+        manager.device_limit = float("inf")
+        manager.host_limit = None
+        manager.unspill_all()
+        if manager._directory is not None:
+            os.rmdir(manager._directory)
+
+
+def get_spill_manager():
+    """The active ``SpillManager``, or ``None`` if spilling is disabled.
+    """
+    return _manager
@@ -1,10 +1,11 @@
 # Copyright (c) 2019, NVIDIA CORPORATION.
 
 import cudf._lib as libcudf
-from cudf.utils import ioutils
+from cudf.utils import ioutils, profiling
 
 
 @ioutils.doc_read_avro()
+@profiling.instrument()
 def read_avro(
     filepath_or_buffer,
     engine="cudf",
@@ -3,10 +3,11 @@
 from io import BytesIO, IOBase, StringIO
 
 import cudf._lib as libcudf
-from cudf.utils import ioutils
+from cudf.utils import ioutils, profiling
 
 
 @ioutils.doc_read_csv()
+@profiling.instrument()
 def read_csv(
     filepath_or_buffer,
     lineterminator="\n",
@@ -84,6 +85,7 @@ def read_csv(
 
 
 @ioutils.doc_to_csv()
+@profiling.instrument()
 def to_csv(
     df,
     path=None,
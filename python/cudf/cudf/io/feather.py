@@ -5,10 +5,11 @@ import warnings
 from pyarrow import feather
 
 from cudf.core.dataframe import DataFrame
-from cudf.utils import ioutils
+from cudf.utils import ioutils, profiling
 
 
 @ioutils.doc_read_feather()
+@profiling.instrument()
 def read_feather(path, *args, **kwargs):
     """{docstring}"""
 
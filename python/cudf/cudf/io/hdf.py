@@ -5,10 +5,11 @@ import warnings
 import pandas as pd
 
 import cudf
-from cudf.utils import ioutils
+from cudf.utils import ioutils, profiling
 
 
 @ioutils.doc_read_hdf()
+@profiling.instrument()
 def read_hdf(path_or_buf, *args, **kwargs):
     """{docstring}"""
     warnings.warn(
@@ -7,10 +7,11 @@ import pandas as pd
 
 import cudf
 import cudf._lib as libcudf
-from cudf.utils import ioutils
+from cudf.utils import ioutils, profiling
 
 
 @ioutils.doc_read_json()
+@profiling.instrument()
 def read_json(
     path_or_buf,
     engine="auto",
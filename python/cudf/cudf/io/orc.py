@@ -6,7 +6,7 @@ import pyarrow.orc as orc
 
 import cudf
 import cudf._lib as libcudf
-from cudf.utils import ioutils
+from cudf.utils import ioutils, profiling
 
 
 @ioutils.doc_read_orc_metadata()
@@ -23,6 +23,7 @@ def read_orc_metadata(path):
 
 
 @ioutils.doc_read_orc()
+@profiling.instrument()
 def read_orc(
     filepath_or_buffer,
     engine="cudf",
@@ -6,7 +6,7 @@ import pyarrow.parquet as pq
 
 import cudf
 import cudf._lib as libcudf
-from cudf.utils import ioutils
+from cudf.utils import ioutils, profiling
 
 
 @ioutils.doc_read_parquet_metadata()
@@ -23,6 +23,7 @@ def read_parquet_metadata(path):
 
 
 @ioutils.doc_read_parquet()
+@profiling.instrument()
 def read_parquet(
     filepath_or_buffer,
     engine="cudf",
@@ -62,6 +63,7 @@ def read_parquet(
 
 
 @ioutils.doc_to_parquet()
+@profiling.instrument()
 def to_parquet(df, path, *args, **kwargs):
     """{docstring}"""
     warnings.warn(
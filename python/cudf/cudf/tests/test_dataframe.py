@@ -2774,6 +2774,16 @@ def test_dataframe_sizeof(indexed):
     assert gdf.__sizeof__() == (gdf._index.__sizeof__() + cols_sizeof)
 
 
+def test_dataframe_sizeof_strings():
+    rows = 1000
+    gdf = gd.DataFrame({"a": ["abcdefgh"] * rows, "b": ["x", None] * 500})
+
+    # Character data of the strings is counted, not just the handles
+    assert gdf["a"]._column.__sizeof__() >= 8 * rows
+    cat = gdf["a"].astype("category")
+    assert cat._column.__sizeof__() > cat._column.as_numerical.__sizeof__()
+
+
 @pytest.mark.parametrize("a", [[], ["123"]])
 @pytest.mark.parametrize("b", ["123", ["123"]])
 @pytest.mark.parametrize(
@@ -892,3 +892,280 @@ def test_groupby_dropna_getattr():
     )
 
     assert_eq(expect, got)
+
+
+def test_groupby_sorted_multiple_keys_and_aggs():
+    np.random.seed(0)
+    pdf = pd.DataFrame(
+        {
+            "k1": np.random.randint(0, 10, 100),
+            "k2": np.random.choice(["a", "b", "c"], 100),
+            "x": np.random.random(100),
+            "y": np.random.randint(0, 100, 100),
+        }
+    )
+    gdf = cudf.from_pandas(pdf)
+    aggs = {"x": ["sum", "min", "max"], "y": ["count", "mean"]}
+    expect = pdf.groupby(["k1", "k2"]).agg(aggs)
+    got = gdf.groupby(["k1", "k2"]).agg(aggs)
+    assert_eq(expect, got, check_dtype=False)
+
+
+def test_groupby_agg_plan_shares_primitives():
+    from cudf.core.groupby.groupby import _AggregationPlan
+
+    col = cudf.Series([1.0, 2.0, 3.0])._column
+    aggs = ["sum", "mean", "count", "min", "max"]
+    plan = _AggregationPlan([col] * len(aggs), aggs)
+    assert plan.aggs == ["sum", "count", "min", "max"]
+    assert all(c is col for c in plan.columns)
+
+
+@pytest.mark.parametrize("nulls", [True, False])
+def test_groupby_agg_mean_from_primitives(nulls):
+    pdf = pd.DataFrame(
+        {
+            "k": [1, 1, 2, 2, 3, 3, 4],
+            "x": [1.0, 2.0, 3.0, 5.0, 7.0, 11.0, 13.0],
+            "y": [1, 2, 3, 4, 5, 6, 7],
+        }
+    )
+    if nulls:
+        pdf.loc[[1, 4, 5], "x"] = np.nan
+    gdf = cudf.from_pandas(pdf)
+    aggs = {"x": ["sum", "mean", "count", "min", "max"], "y": "mean"}
+    assert_eq(
+        pdf.groupby("k").agg(aggs),
+        gdf.groupby("k").agg(aggs),
+        check_dtype=False,
+    )
+
+
+@pytest.mark.parametrize(
+    "agg", ["var", "std", "nunique", "first", "last", "median"]
+)
+@pytest.mark.parametrize("nulls", [True, False])
+def test_groupby_segmented_aggs(agg, nulls):
+    np.random.seed(0)
+    pdf = pd.DataFrame(
+        {
+            "k1": np.random.randint(0, 5, 50),
+            "k2": np.random.randint(0, 3, 50),
+            "x": np.random.random(50),
+            "y": np.random.randint(0, 4, 50).astype("float64"),
+        }
+    )
+    if nulls:
+        pdf.loc[::4, "x"] = np.nan
+        pdf.loc[pdf["k1"] == 0, "y"] = np.nan
+    gdf = cudf.from_pandas(pdf)
+    assert_eq(
+        getattr(pdf.groupby(["k1", "k2"]), agg)(),
+        getattr(gdf.groupby(["k1", "k2"]), agg)(),
+        check_dtype=False,
+    )
+    assert_eq(
+        getattr(pdf.groupby("k1").x, agg)(),
+        getattr(gdf.groupby("k1").x, agg)(),
+        check_dtype=False,
+    )
+
+
+def test_groupby_segmented_aggs_mixed():
+    np.random.seed(1)
+    pdf = pd.DataFrame(
+        {
+            "k": np.random.randint(0, 10, 100),
+            "x": np.random.random(100),
+            "s": np.random.choice(["a", "b", "c"], 100),
+        }
+    )
+    pdf.loc[::7, "x"] = np.nan
+    gdf = cudf.from_pandas(pdf)
+    aggs = {
+        "x": ["sum", "mean", "var", "std", "count", "median"],
+        "s": ["nunique", "first", "last", "count"],
+    }
+    assert_eq(
+        pdf.groupby("k").agg(aggs),
+        gdf.groupby("k").agg(aggs),
+        check_dtype=False,
+    )
+
+
+def test_groupby_segmented_aggs_dropna():
+    pdf = pd.DataFrame({"k": [1, None, 1, 2, None], "x": [1, 2, 3, 4, 5]})
+    gdf = cudf.from_pandas(pdf)
+    assert_eq(
+        pdf.groupby("k").x.std(), gdf.groupby("k").x.std(), check_dtype=False
+    )
+
+
+@pytest.mark.parametrize("q", [0.25, 0.5, 0.9])
+def test_series_groupby_quantile(q):
+    pdf = pd.DataFrame({"k": [1, 1, 2, 2, 2, 3], "x": [1, 5, 2, 3, 9, 4]})
+    gdf = cudf.from_pandas(pdf)
+    assert_eq(
+        pdf.groupby("k").x.quantile(q),
+        gdf.groupby("k").x.quantile(q),
+        check_dtype=False,
+    )
+
+
+@pytest.mark.parametrize("func", ["sum", "mean", "count", "max", "std"])
+def test_groupby_transform(func):
+    np.random.seed(0)
+    pdf = pd.DataFrame(
+        {
+            "k": np.random.randint(0, 5, 30),
+            "x": np.random.random(30),
+            "y": np.random.randint(0, 10, 30),
+        }
+    )
+    pdf.loc[::5, "x"] = np.nan
+    gdf = cudf.from_pandas(pdf)
+    assert_eq(
+        pdf.groupby("k").transform(func),
+        gdf.groupby("k").transform(func),
+        check_dtype=False,
+    )
+    assert_eq(
+        pdf.groupby("k").x.transform(func),
+        gdf.groupby("k").x.transform(func),
+        check_dtype=False,
+    )
+
+
+def test_groupby_cumsum_cumcount():
+    pdf = pd.DataFrame(
+        {
+            "k": [1, 2, 1, 2, 1, 3],
+            "x": [1.0, 2.0, np.nan, 4.0, 5.0, 6.0],
+            "y": [1, 2, 3, 4, 5, 6],
+        }
+    )
+    gdf = cudf.from_pandas(pdf)
+    assert_eq(
+        pdf.groupby("k").cumsum(), gdf.groupby("k").cumsum(), check_dtype=False
+    )
+    assert_eq(
+        pdf.groupby("k").cumcount(),
+        gdf.groupby("k").cumcount(),
+        check_dtype=False,
+    )
+
+
+@pytest.mark.parametrize("method", ["average", "min", "max", "first", "dense"])
+@pytest.mark.parametrize("ascending", [True, False])
+def test_groupby_rank(method, ascending):
+    pdf = pd.DataFrame(
+        {
+            "k": [1, 1, 1, 1, 2, 2, 2, 1],
+            "x": [3.0, 1.0, 3.0, np.nan, 2.0, 2.0, 1.0, 0.5],
+        }
+    )
+    gdf = cudf.from_pandas(pdf)
+    assert_eq(
+        pdf.groupby("k").x.rank(method=method, ascending=ascending),
+        gdf.groupby("k").x.rank(method=method, ascending=ascending),
+        check_dtype=False,
+    )
+
+
+@pytest.mark.parametrize("periods", [1, 2, -1])
+@pytest.mark.parametrize("fill_value", [None, 0])
+def test_groupby_shift(periods, fill_value):
+    pdf = pd.DataFrame(
+        {"k": [1, 2, 1, 2, 1, 1, 3], "x": [1, 2, 3, 4, 5, 6, 7]}
+    )
+    gdf = cudf.from_pandas(pdf)
+    assert_eq(
+        pdf.groupby("k").x.shift(periods, fill_value=fill_value),
+        gdf.groupby("k").x.shift(periods, fill_value=fill_value),
+        check_dtype=False,
+    )
+
+
+@pytest.mark.parametrize("periods", [1, -1])
+@pytest.mark.parametrize("fill_value", [None, 0.0])
+def test_groupby_shift_nan(periods, fill_value):
+    # Nulls shifted within a group stay null, only the rows shifted in
+    # from outside the group are filled
+    pdf = pd.DataFrame(
+        {
+            "k": [1, 2, 1, 2, 1, 1, 3],
+            "x": [1.0, np.nan, np.nan, 4.0, 5.0, np.nan, 7.0],
+        }
+    )
+    gdf = cudf.from_pandas(pdf)
+    assert_eq(
+        pdf.groupby("k").x.shift(periods, fill_value=fill_value),
+        gdf.groupby("k").x.shift(periods, fill_value=fill_value),
+    )
+
+
+def test_groupby_reuses_grouping():
+    pdf = pd.DataFrame(
+        {
+            "k": [2, 1, 2, 3, 1, 2],
+            "x": [1.0, 2.0, 3.0, 4.0, 5.0, 6.0],
+            "y": [6, 5, 4, 3, 2, 1],
+        }
+    )
+    gdf = cudf.from_pandas(pdf)
+    pgb = pdf.groupby("k")
+    ggb = gdf.groupby("k")
+    for agg in ["sum", "max", "mean", "count"]:
+        assert_eq(getattr(pgb, agg)(), getattr(ggb, agg)(), check_dtype=False)
+    assert_eq(pgb.x.min(), ggb.x.min())
+    assert_eq(pgb.size(), ggb.size(), check_dtype=False)
+
+    groups = ggb._groupby.grouping()
+    assert ggb._groupby.grouping() is groups
+    assert ggb.y._groupby.grouping() is groups
+
+
+def test_groupby_get_group():
+    pdf = pd.DataFrame(
+        {"a": [1, 2, 1, 3, 2], "b": [0, 0, 1, 0, 0], "c": range(5)}
+    )
+    gdf = cudf.from_pandas(pdf)
+    for name in [1, 2, 3]:
+        assert_eq(
+            pdf.groupby("a").get_group(name), gdf.groupby("a").get_group(name)
+        )
+    assert_eq(
+        pdf.groupby(["a", "b"]).get_group((1, 1)),
+        gdf.groupby(["a", "b"]).get_group((1, 1)),
+    )
+    with pytest.raises(KeyError):
+        gdf.groupby("a").get_group(4)
+
+    pgroups = list(pdf.groupby("a"))
+    ggroups = list(gdf.groupby("a"))
+    assert [name for name, _ in pgroups] == [name for name, _ in ggroups]
+    for (_, pgroup), (_, ggroup) in zip(pgroups, ggroups):
+        assert_eq(pgroup, ggroup)
+
+
+def test_groupby_legacy_get_group():
+    pdf = pd.DataFrame(
+        {
+            "k1": [2, 1, 2, 3, 1, 2],
+            "k2": [0, 1, 0, 1, 1, 1],
+            "v": [1.0, 2.0, 3.0, 4.0, 5.0, 6.0],
+        }
+    )
+    gdf = cudf.from_pandas(pdf)
+    pgb = pdf.groupby(["k1", "k2"])
+    ggb = gdf.groupby(["k1", "k2"], method="cudf")
+    for key in [(1, 1), (2, 0), (2, 1), (3, 1)]:
+        assert_eq(pgb.get_group(key), ggb.get_group(key))
+    with pytest.raises(KeyError):
+        ggb.get_group((3, 0))
+
+    pgroups = [group for _, group in pgb]
+    ggroups = list(ggb)
+    assert len(pgroups) == len(ggroups)
+    for pgroup, ggroup in zip(pgroups, ggroups):
+        assert_eq(pgroup, ggroup)
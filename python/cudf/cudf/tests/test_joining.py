@@ -703,3 +703,137 @@ def test_join_datetimes_index(dtype):
     assert gdf["d"].dtype == np.dtype(dtype)
 
     assert_eq(pdf, gdf)
+
+
+@pytest.mark.parametrize("how", ["inner", "left"])
+def test_join_index_probe(how):
+    right = pd.DataFrame(
+        {
+            "k1": [1, 2, 2, 3, 5, None],
+            "k2": ["a", "b", "b", "c", "e", "f"],
+            "y": [10, 20, 21, 30, 50, 60],
+        }
+    )
+    gright = cudf.from_pandas(right)
+    index = cudf.JoinIndex(gright, on=["k1", "k2"])
+    for left in [
+        pd.DataFrame(
+            {"k1": [2, 3, 4, 1], "k2": ["b", "x", "d", "a"], "x": range(4)}
+        ),
+        pd.DataFrame({"k1": [5.0, 2.0], "k2": ["e", "b"], "x": [0, 1]}),
+    ]:
+        expect = left.merge(right, on=["k1", "k2"], how=how)
+        got = index.probe(cudf.from_pandas(left), how=how)
+        assert_eq(
+            expect.reset_index(drop=True),
+            got.to_pandas().reset_index(drop=True),
+            check_dtype=False,
+        )
+
+
+def test_join_index_suffixes():
+    right = cudf.DataFrame({"key": [1, 2, 3], "val": [0.5, 1.5, 2.5]})
+    left = cudf.DataFrame({"key": [3, 3, 1], "val": [1, 2, 3]})
+    got = cudf.JoinIndex(right, on="key").probe(left)
+    expect = left.to_pandas().merge(right.to_pandas(), on="key")
+    assert_eq(expect, got, check_dtype=False)
+
+
+def test_join_index_common_dtype():
+    # Float keys are not truncated to the integer keys of the index
+    right = pd.DataFrame({"key": [1, 2, 3], "y": [10, 20, 30]})
+    left = pd.DataFrame({"key": [2.5, 2.0, 3.0, 1.5], "x": range(4)})
+    index = cudf.JoinIndex(cudf.from_pandas(right), on="key")
+    for how in ["inner", "left"]:
+        expect = left.merge(right, on="key", how=how)
+        got = index.probe(cudf.from_pandas(left), how=how)
+        assert_eq(
+            expect.reset_index(drop=True),
+            got.to_pandas().reset_index(drop=True),
+            check_dtype=False,
+        )
+
+
+@pytest.mark.parametrize("how", ["leftsemi", "leftanti"])
+def test_merge_leftsemi_leftanti(how):
+    left = pd.DataFrame(
+        {"k": [1, 2, 3, 2, 5, 4], "s": list("abcdef"), "v": range(6)}
+    )
+    right = pd.DataFrame({"k": [2, 4, 4, 6], "s": list("bdfh"), "w": range(4)})
+    gleft = cudf.from_pandas(left)
+    gright = cudf.from_pandas(right)
+
+    for on in ["k", ["k", "s"]]:
+        keys = left.set_index(on).index.isin(right.set_index(on).index)
+        expect = left[~keys if how == "leftanti" else keys]
+        got = gleft.merge(gright, on=on, how=how)
+        assert list(got.columns) == list(left.columns)
+        assert_eq(expect.reset_index(drop=True), got)
+
+
+def test_merge_right():
+    left = pd.DataFrame({"k": [1, 2, 3], "a": [10, 20, 30]})
+    right = pd.DataFrame({"k": [3, 4, 1, 1], "b": [0.5, 1.5, 2.5, 3.5]})
+    expect = left.merge(right, on="k", how="right")
+    got = cudf.from_pandas(left).merge(
+        cudf.from_pandas(right), on="k", how="right"
+    )
+    assert list(got.columns) == list(expect.columns)
+    assert_eq(
+        expect.sort_values("b").reset_index(drop=True),
+        got.sort_values("b").reset_index(drop=True),
+        check_dtype=False,
+    )
+
+
+@pytest.mark.parametrize("sort", [False, True])
+def test_merge_many_columns(sort):
+    np.random.seed(0)
+    ncols = 50
+    left = pd.DataFrame(
+        {"c{}".format(i): np.random.randint(0, 5, 10) for i in range(ncols)}
+    )
+    right = pd.DataFrame(
+        {"c{}".format(i): np.random.randint(0, 5, 8) for i in range(0, 80, 2)}
+    )
+    left["key"] = np.arange(10)
+    right["key"] = np.arange(8)[::-1]
+    expect = left.merge(right, on="key", sort=sort)
+    got = cudf.from_pandas(left).merge(
+        cudf.from_pandas(right), on="key", sort=sort
+    )
+    assert list(got.columns) == list(expect.columns)
+    assert_eq(
+        expect.sort_values("key").reset_index(drop=True),
+        got.sort_values("key").reset_index(drop=True),
+    )
+
+
+@pytest.mark.parametrize("how", ["inner", "left", "right"])
+@pytest.mark.parametrize("presorted", [True, False])
+def test_merge_method_sort(how, presorted):
+    np.random.seed(0)
+    left = pd.DataFrame(
+        {"k": np.random.randint(0, 20, 30), "a": np.arange(30.0)}
+    )
+    right = pd.DataFrame(
+        {
+            "k": np.random.randint(5, 25, 15).astype(np.int32),
+            "b": np.arange(15),
+        }
+    )
+    if presorted:
+        left = left.sort_values("k").reset_index(drop=True)
+        right = right.sort_values("k").reset_index(drop=True)
+
+    expect = left.merge(right, on="k", how=how)
+    got = cudf.from_pandas(left).merge(
+        cudf.from_pandas(right), on="k", how=how, method="sort"
+    )
+    assert list(got.columns) == list(expect.columns)
+    assert got["k"].is_monotonic_increasing
+    assert_eq(
+        expect.sort_values(["k", "a", "b"]).reset_index(drop=True),
+        got.to_pandas().sort_values(["k", "a", "b"]).reset_index(drop=True),
+        check_dtype=False,
+    )
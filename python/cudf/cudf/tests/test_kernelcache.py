@@ -0,0 +1,103 @@
+# Copyright (c) 2019, NVIDIA CORPORATION.
+
+import os
+import threading
+
+import numpy as np
+import pytest
+
+import cudf
+from cudf.utils import kernelcache, queryutils
+
+
+@pytest.fixture
+def cache_dir(tmpdir):
+    old = kernelcache.get_cache_directory()
+    kernelcache.set_cache_directory(str(tmpdir))
+    yield str(tmpdir)
+    kernelcache.set_cache_directory(old)
+
+
+def test_query_kernel_disk_cache(cache_dir):
+    queryutils._cache.clear()
+    df = cudf.DataFrame({"a": np.arange(10), "b": np.arange(10.0)})
+    expect = df.query("a > b - 1 and a < 5").to_pandas()
+    assert len(os.listdir(cache_dir)) == 1
+
+    # A new process only has the on-disk cache
+    queryutils._cache.clear()
+    before = kernelcache.cache_info()
+    got = df.query("a > b - 1 and a < 5").to_pandas()
+    after = kernelcache.cache_info()
+    assert after["disk_hits"] == before["disk_hits"] + 1
+    assert after["misses"] == before["misses"]
+    assert got.equals(expect)
+
+
+def test_kernel_disk_cache_untrusted_entry(cache_dir):
+    queryutils._cache.clear()
+    df = cudf.DataFrame({"a": np.arange(10)})
+    df.query("a > 3")
+    (name,) = os.listdir(cache_dir)
+    # An entry writable by others is not loaded
+    os.chmod(os.path.join(cache_dir, name), 0o666)
+
+    queryutils._cache.clear()
+    before = kernelcache.cache_info()
+    df.query("a > 3")
+    after = kernelcache.cache_info()
+    assert after["disk_hits"] == before["disk_hits"]
+    assert after["misses"] == before["misses"] + 1
+    assert after["errors"] == before["errors"] + 1
+
+
+def test_apply_rows_kernel_disk_cache(cache_dir):
+    def kernel(a, out):
+        for i, x in enumerate(a):
+            out[i] = x * 2
+
+    df = cudf.DataFrame({"a": np.arange(10)})
+    out = df.apply_rows(kernel, ["a"], {"out": np.float64}, {})
+    np.testing.assert_array_equal(out["out"].to_array(), np.arange(10) * 2)
+    # Different argument types are compiled and cached separately
+    df = cudf.DataFrame({"a": np.arange(10, dtype=np.float32)})
+    df.apply_rows(kernel, ["a"], {"out": np.float64}, {})
+    assert len(os.listdir(cache_dir)) == 2
+
+
+def test_func_key():
+    def make(k):
+        def f(x):
+            return x + k
+
+        return f
+
+    assert kernelcache.func_key(make(1)) == kernelcache.func_key(make(1))
+    assert kernelcache.func_key(make(1)) != kernelcache.func_key(make(2))
+
+
+_offsets = np.arange(3)
+
+
+def _add_offset(x):
+    return x + _offsets[0]
+
+
+def test_func_key_globals():
+    before = kernelcache.func_key(_add_offset)
+    _offsets[0] = 10
+    try:
+        assert kernelcache.func_key(_add_offset) != before
+    finally:
+        _offsets[0] = 0
+    assert kernelcache.func_key(_add_offset) == before
+
+
+def test_func_key_unkeyable():
+    lock = threading.Lock()
+
+    def f(x):
+        with lock:
+            return x
+
+    assert kernelcache.func_key(f) is None
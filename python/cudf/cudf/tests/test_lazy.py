@@ -0,0 +1,110 @@
+# Copyright (c) 2019, NVIDIA CORPORATION.
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import cudf
+from cudf.core import lazy
+from cudf.tests.utils import assert_eq
+
+
+@pytest.fixture
+def pdf():
+    np.random.seed(0)
+    nelem = 100
+    return pd.DataFrame(
+        {
+            "a": np.random.randint(-10, 10, nelem),
+            "b": np.random.random(nelem),
+            "c": np.arange(nelem, dtype=np.int32),
+            "d": np.random.random(nelem) + 1,
+        }
+    )
+
+
+def test_lazy_fused_expression(pdf):
+    gdf = cudf.from_pandas(pdf)
+    lf = gdf.lazy()
+    lf["e"] = (lf["a"] * lf["b"] + lf["c"]) / lf["d"] > 0
+    lf["f"] = -lf.a + 2 * lf.c
+    lf["g"] = lf["f"] % 3
+    lf["h"] = 1.5
+
+    expect = pdf.copy()
+    expect["e"] = (pdf.a * pdf.b + pdf.c) / pdf.d > 0
+    expect["f"] = -pdf.a + 2 * pdf.c
+    expect["g"] = expect.f % 3
+    expect["h"] = 1.5
+    assert_eq(lf.collect(), expect)
+
+    # Nothing was added to the original frame
+    assert list(gdf.columns) == list(pdf.columns)
+
+
+def test_lazy_single_kernel(pdf):
+    gdf = cudf.from_pandas(pdf)
+    lazy.clear_lazy_cache()
+    lf = gdf.lazy()
+    lf["x"] = lf.a + lf.b
+    lf["y"] = lf.c * lf.d - 1
+    lf.collect()
+    assert len(lazy._cache) == 1
+
+    # The same expressions with other literals reuse the kernel
+    lf = gdf.lazy()
+    lf["x"] = lf.a + lf.b
+    lf["y"] = lf.c * lf.d - 5
+    lf.collect()
+    assert len(lazy._cache) == 1
+
+
+def test_lazy_cache_bounded(pdf):
+    gdf = cudf.from_pandas(pdf)
+    lazy.clear_lazy_cache()
+    old = lazy.lazy_cache_info()["maxsize"]
+    lazy.set_lazy_cache_size(2)
+    try:
+        for i in range(4):
+            lf = gdf.lazy()
+            lf["x"] = lf.a + lf.b
+            for _ in range(i):
+                lf["x"] = lf.x * lf.c
+            lf.collect()
+        info = lazy.lazy_cache_info()
+        assert info["size"] == 2
+        assert info["evictions"] >= 2
+        assert info["misses"] >= 4
+    finally:
+        lazy.set_lazy_cache_size(old)
+    lazy.clear_lazy_cache()
+    assert lazy.lazy_cache_info()["size"] == 0
+
+
+def test_lazy_column_collect(pdf):
+    gdf = cudf.from_pandas(pdf)
+    lf = gdf.lazy()
+    result = ((lf.a & 3) == (lf.c ^ 1)).collect()
+    assert_eq(result, (pdf.a & 3) == (pdf.c ^ 1), check_names=False)
+
+
+def test_lazy_nulls():
+    gdf = cudf.DataFrame({"a": [1, None, 3], "b": [1.0, 2.0, None]})
+    lf = gdf.lazy()
+    lf["c"] = lf.a + lf.b
+    result = lf.collect()
+    assert result["c"].null_count == 2
+    assert result["c"][0] == 2.0
+
+
+def test_lazy_errors(pdf):
+    gdf = cudf.from_pandas(pdf)
+    gdf["s"] = ["x"] * len(gdf)
+    lf = gdf.lazy()
+    with pytest.raises(KeyError):
+        lf["missing"]
+    with pytest.raises(TypeError):
+        lf["t"] = [1, 2, 3]
+    lf["t"] = lf.s + 1
+    with pytest.raises(TypeError):
+        lf.collect()
@@ -0,0 +1,59 @@
+# Copyright (c) 2019, NVIDIA CORPORATION.
+
+import numpy as np
+
+import cudf
+from cudf.core.memory import annotate
+
+
+def test_memory_profile_scopes():
+    nelem = 1000
+    df = cudf.DataFrame(
+        {"a": np.arange(nelem), "b": np.arange(nelem, dtype=np.float64)}
+    )
+    with cudf.memory_profile() as prof:
+        df.query("a > 10")
+        cudf.concat([df, df])
+        df.merge(df, on="a")
+
+    stats = prof.stats()
+    for name in ("CUDF_QUERY", "CUDF_CONCAT", "CUDF_JOIN"):
+        assert stats[name]["calls"] >= 1
+        assert stats[name]["allocated"] > 0
+        assert stats[name]["peak"] > 0
+    # The concatenated frame holds two copies of each column
+    assert stats["CUDF_CONCAT"]["peak"] >= 2 * nelem * 16
+    assert prof.peak >= max(prof.peaks().values())
+    assert prof.allocated >= prof.freed
+
+
+def test_memory_profile_nested_annotate():
+    with cudf.memory_profile() as prof:
+        with annotate("outer"):
+            with annotate("inner"):
+                sr = cudf.Series(np.arange(100, dtype=np.int64))
+            sr2 = sr + 1
+    assert prof.peaks()["inner"] >= 800
+    assert prof.peaks()["outer"] >= 1600
+    assert prof.stats()["outer"]["calls"] == 1
+    del sr2
+
+
+def test_memory_profile_counts_views_once():
+    sr = cudf.Series(np.arange(100, dtype=np.int64))
+    with cudf.memory_profile() as prof:
+        with annotate("slice"):
+            sr[10:20]
+    assert prof.stats()["slice"]["allocated"] < 800
+
+
+def test_memory_profile_credits_frees_to_allocating_scope():
+    with cudf.memory_profile() as prof:
+        with annotate("alloc"):
+            sr = cudf.Series(np.arange(100, dtype=np.int64))
+        with annotate("free"):
+            del sr
+    # The free happens after the allocating scope exited, the scope open
+    # at the time did not allocate the memory
+    assert prof.stats()["free"]["freed"] == 0
+    assert prof.freed >= 800
@@ -0,0 +1,71 @@
+# Copyright (c) 2019, NVIDIA CORPORATION.
+
+import json
+
+import numpy as np
+import pandas as pd
+
+import cudf
+from cudf.utils import profiling
+
+
+def test_profile_records_operations():
+    nelem = 100
+    df = cudf.DataFrame(
+        {"a": np.arange(nelem)[::-1], "b": np.arange(nelem) % 5}
+    )
+    with cudf.profile() as prof:
+        df.sort_values("a")
+        df.sort_values("b")
+        df["a"].astype("float64")
+        df.groupby("b").sum()
+        df.query("a > 50")
+
+    stats = prof.stats()
+    assert stats["DataFrame.sort_values"]["calls"] == 2
+    assert stats["DataFrame.sort_values"]["rows_in"] == 2 * nelem
+    assert stats["DataFrame.sort_values"]["rows_out"] == 2 * nelem
+    assert stats["DataFrame.sort_values"]["bytes"] > 0
+    assert stats["Series.astype"]["calls"] == 1
+    assert stats["GroupBy.agg"]["rows_out"] == 5
+    assert stats["CUDF_QUERY"]["calls"] == 1
+    assert all(s["time"] >= 0 for s in stats.values())
+
+
+def test_profile_classmethod_rows_in():
+    pdf = pd.DataFrame({"a": np.arange(10)})
+    with cudf.profile() as prof:
+        gdf = cudf.DataFrame.from_pandas(pdf)
+        cudf.Series.from_pandas(pdf["a"])
+        gdf.join(gdf, lsuffix="l", rsuffix="r")
+
+    stats = prof.stats()
+    assert stats["DataFrame.from_pandas"]["rows_in"] == 10
+    assert stats["DataFrame.from_pandas"]["rows_out"] == 10
+    assert stats["Series.from_pandas"]["rows_in"] == 10
+    assert stats["CUDF_JOIN"]["calls"] == 1
+
+
+def test_profile_outside_block():
+    df = cudf.DataFrame({"a": [3, 1, 2]})
+    with cudf.profile() as prof:
+        pass
+    df.sort_values("a")
+    assert not profiling.is_profiling()
+    assert len(prof.events) == 0
+
+
+def test_profile_chrome_trace(tmpdir):
+    df = cudf.DataFrame({"a": [3, 1, 2]})
+    with cudf.profile() as prof:
+        df.sort_values("a").fillna(0)
+    path = str(tmpdir.join("trace.json"))
+    trace = prof.to_chrome_trace(path)
+    with open(path) as f:
+        assert json.load(f) == json.loads(json.dumps(trace))
+    names = [event["name"] for event in trace["traceEvents"]]
+    assert "DataFrame.sort_values" in names
+    assert "DataFrame.fillna" in names
+    for event in trace["traceEvents"]:
+        assert event["ph"] == "X"
+        assert event["dur"] >= 0
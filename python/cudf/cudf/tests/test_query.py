@@ -155,3 +155,151 @@ def test_query_empty_frames():
 
     # assert euqal results
     assert_frame_equal(got, expect)
+
+
+def test_query_normalize():
+    source, literals = queryutils.normalize_query("a >  5 and b<@c*2.5")
+    prefix = queryutils.LITERAL_PREFIX
+    assert source == "a > {0}0 and b < {1}c * {0}1".format(
+        prefix, queryutils.ENVREF_PREFIX
+    )
+    assert literals == [5, 2.5]
+
+
+def test_query_cache_literals_share_kernel():
+    df = DataFrame({"a": np.arange(10), "b": np.arange(10.0)})
+    queryutils._cache.clear()
+    before = queryutils.query_cache_info()
+    for i in range(5):
+        got = df.query("a > {} and b < 8".format(i)).to_pandas()
+        expect = df.to_pandas().query("a > {} and b < 8".format(i))
+        assert_frame_equal(got, expect)
+    after = queryutils.query_cache_info()
+    assert after["size"] == 1
+    assert after["misses"] - before["misses"] == 1
+    assert after["hits"] - before["hits"] == 4
+    assert after["compile_time"] >= before["compile_time"]
+
+    # Other column dtypes are compiled separately
+    df["a"] = df["a"].astype(np.float32)
+    df.query("a > 1 and b < 8")
+    assert queryutils.query_cache_info()["size"] == 2
+
+
+def test_query_cache_lru_eviction():
+    df = DataFrame({"a": np.arange(10), "b": np.arange(10)})
+    old = queryutils.query_cache_info()["maxsize"]
+    try:
+        queryutils.set_query_cache_size(2)
+        queryutils._cache.clear()
+        evictions = queryutils.query_cache_info()["evictions"]
+        for expr in ["a > 1", "b > 1", "a > b", "a > 1"]:
+            df.query(expr)
+        info = queryutils.query_cache_info()
+        assert info["size"] == 2
+        assert info["evictions"] - evictions == 2
+    finally:
+        queryutils.set_query_cache_size(old)
+
+
+@pytest.mark.parametrize(
+    "query_expr",
+    [
+        "a < b",
+        "a * 2 >= b",
+        "1 < a <= 5",
+        "(a > 2 and b < 6) or not (a == 3)",
+        "(a > 2) & (b < @c)",
+        "-a > -4",
+    ],
+)
+@pytest.mark.parametrize("nulls", [True, False])
+def test_query_interpreter(query_expr, nulls):
+    c = 6  # noqa: F841
+    np.random.seed(0)
+    pdf = pd.DataFrame()
+    pdf["a"] = np.arange(10)
+    pdf["b"] = np.random.random(10) * 10
+    if nulls:
+        pdf["a"][::3] = None
+    gdf = cudf.from_pandas(pdf)
+    misses = queryutils.query_cache_info()["misses"]
+    got = gdf.query(query_expr, engine="interpreter")
+    assert queryutils.query_cache_info()["misses"] == misses
+    assert_eq(gdf.query(query_expr), got)
+    if not nulls:
+        assert_eq(pdf.query(query_expr), got)
+
+
+def test_query_apply_boolean_mask():
+    gdf = DataFrame(
+        {"a": [1, 2, 3, 4], "b": ["w", "x", None, "z"], "c": [0.5, 1, 2, 3]}
+    )
+    gdf["d"] = gdf["a"].astype("category")
+    gdf = gdf.set_index(cudf.Series([10, 20, 30, 40], name="idx"))
+    got = gdf.query("a != 2")
+    expect = gdf.to_pandas()
+    expect = expect[expect["a"] != 2]
+    assert_eq(expect, got)
+    assert got.index.name == "idx"
+    assert len(gdf.query("a > 10")) == 0
+
+
+@pytest.mark.parametrize("engine", ["jit", "interpreter"])
+@pytest.mark.parametrize(
+    "query_expr",
+    [
+        "s == 'b'",
+        "s != 'b' and a > 1",
+        "'b' <= s",
+        "s in ['a', 'c', 'x']",
+        "s not in ('a',)",
+        "s == t",
+        "s != t",
+        "c == 'y'",
+        "c != 'y' or a == 0",
+        "c in ['x', 'z', 'missing']",
+        "c not in ['y']",
+        "c == 'missing'",
+        "s == @value",
+    ],
+)
+def test_query_strings_categorical(query_expr, engine):
+    value = "c"  # noqa: F841
+    pdf = pd.DataFrame(
+        {
+            "a": [0, 1, 2, 3, 4, 5],
+            "s": ["a", "b", "c", "b", "d", "a"],
+            "t": ["a", "x", "c", "y", "d", "z"],
+            "c": pd.Categorical(["x", "y", "z", "y", "x", "z"]),
+        }
+    )
+    gdf = cudf.from_pandas(pdf)
+    got = gdf.query(query_expr, engine=engine)
+    assert_eq(pdf.query(query_expr), got)
+
+
+def test_query_strings_with_nulls():
+    gdf = DataFrame({"a": [0, 1, 2, 3], "s": ["a", None, "b", "a"]})
+    got = gdf.query("s == 'a'")
+    assert got["a"].to_array().tolist() == [0, 3]
+    got = gdf.query("s != 'a'")
+    assert got["a"].to_array().tolist() == [2]
+
+
+def test_query_categorical_literal_kernel_reuse():
+    queryutils._cache.clear()
+    gdf = DataFrame({"a": [1, 2, 3]})
+    gdf["c"] = cudf.Series(["x", "y", "z"]).astype("category")
+    misses = queryutils.query_cache_info()["misses"]
+    assert len(gdf.query("c == 'x'")) == 1
+    assert len(gdf.query("c == 'z'")) == 1
+    assert queryutils.query_cache_info()["misses"] == misses + 1
+
+
+@pytest.mark.parametrize("query_expr", ["s + 'a' == 'ba'", "c > 'x'"])
+def test_query_strings_categorical_unsupported(query_expr):
+    gdf = DataFrame({"s": ["a", "b"]})
+    gdf["c"] = cudf.Series(["x", "y"]).astype("category")
+    with pytest.raises(TypeError):
+        gdf.query(query_expr)
@@ -0,0 +1,102 @@
+# Copyright (c) 2019, NVIDIA CORPORATION.
+
+import numpy as np
+import pytest
+
+from librmm_cffi import librmm as rmm
+
+from cudf.core import spill
+from cudf.core.buffer import Buffer
+
+
+@pytest.fixture
+def manager(tmpdir):
+    manager = spill.enable_spilling(
+        device_limit=2000, host_limit=2000, spill_directory=str(tmpdir)
+    )
+    yield manager
+    spill.disable_spilling()
+
+
+def make_buffers(n, nelem=100):
+    return [
+        Buffer(rmm.to_device(np.arange(nelem, dtype=np.float64) + i))
+        for i in range(n)
+    ]
+
+
+def test_spill_to_host_and_disk(manager):
+    buffers = make_buffers(8)
+    assert manager.device_bytes <= manager.device_limit
+    assert manager.host_bytes <= manager.host_limit
+    stats = manager.stats()
+    assert stats["to_host"] > 0
+    assert stats["to_disk"] > 0
+    # The least recently used buffer was spilled first
+    assert buffers[0]._mem is None
+    assert buffers[-1]._mem is not None
+
+    for i, buf in enumerate(buffers):
+        np.testing.assert_array_equal(
+            buf.to_array(), np.arange(100, dtype=np.float64) + i
+        )
+    assert manager.stats()["to_device"] > 0
+    assert manager.device_bytes <= manager.device_limit
+    # Reading the data does not expose the buffers
+    assert not any(buf._exposed for buf in buffers)
+
+
+def test_spill_skips_referenced_buffers(manager):
+    buffers = make_buffers(2)
+    held = buffers[0].mem
+    buffers[0].mem  # most recently used is now the first buffer
+    buffers += make_buffers(4)
+    assert buffers[0]._mem is held
+    del held
+
+
+def test_spill_forget_collected_buffers(manager):
+    buffers = make_buffers(8)
+    del buffers
+    assert manager.stats()["device_bytes"] == 0
+    assert manager.stats()["host_bytes"] == 0
+    assert manager.stats()["disk_bytes"] == 0
+
+
+def test_disable_spilling_restores_buffers(manager):
+    buffers = make_buffers(8)
+    spill.disable_spilling()
+    assert spill.get_spill_manager() is None
+    for i, buf in enumerate(buffers):
+        assert buf._mem is not None
+        np.testing.assert_array_equal(
+            buf.to_array(), np.arange(100, dtype=np.float64) + i
+        )
+
+
+def test_spill_skips_exposed_buffers(manager):
+    buffers = make_buffers(2)
+    # The returned array is not kept, but its pointer could be
+    buffers[0].mem
+    buffers += make_buffers(4)
+    assert buffers[0]._exposed
+    assert buffers[0]._mem is not None
+
+
+def test_spill_skips_sliced_buffers(manager):
+    buffers = make_buffers(2)
+    view = buffers[0][10:20]
+    buffers += make_buffers(4)
+    assert buffers[0]._mem is not None
+    assert view._mem is not None
+    np.testing.assert_array_equal(
+        view.to_array(), np.arange(10, 20, dtype=np.float64)
+    )
+
+
+def test_spill_restore_records_allocation(manager):
+    buffers = make_buffers(8)
+    assert buffers[0]._mem is None
+    buffers[0].to_array()
+    assert buffers[0]._alloc_size == int(buffers[0]._mem.alloc_size)
+    assert manager.device_bytes <= manager.device_limit
@@ -10,7 +10,7 @@ from librmm_cffi import librmm as rmm
 import cudf._lib as libcudf
 from cudf.core.column import column
 from cudf.core.series import Series
-from cudf.utils import cudautils, utils
+from cudf.utils import cudautils, kernelcache, utils
 from cudf.utils.docutils import docfmt_partial
 
 _doc_applyparams = """
@@ -230,7 +230,10 @@ def row_wise_kernel({args}):
     exec_(concrete, glbs)
     # Compile as CUDA kernel
     kernel = cuda.jit(glbs["row_wise_kernel"])
-    return kernel
+    key = kernelcache.func_key(func)
+    if key is not None:
+        key = ("row_wise", key, argnames, extras)
+    return kernelcache.CachedKernel(kernel, key=key)
 
 
 def _make_chunk_wise_kernel(func, argnames, extras):
@@ -293,7 +296,10 @@ def chunk_wise_kernel(nrows, chunks, {args}):
     exec_(concrete, glbs)
     # Compile as CUDA kernel
     kernel = cuda.jit(glbs["chunk_wise_kernel"])
-    return kernel
+    key = kernelcache.func_key(func)
+    if key is not None:
+        key = ("chunk_wise", key, argnames, extras)
+    return kernelcache.CachedKernel(kernel, key=key)
 
 
 _cache = dict()  # WeakKeyDictionary()
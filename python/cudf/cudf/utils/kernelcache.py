@@ -0,0 +1,289 @@
+# Copyright (c) 2019, NVIDIA CORPORATION.
+"""
+Persistent cache of compiled CUDA kernels.
+
+Kernels generated for queries, ``apply_rows``/``apply_chunks`` and lazy
+expressions are wrapped in ``CachedKernel``. When a kernel is launched
+with argument types it was not compiled for, the compiled kernel is
+looked up in the cache directory before compiling it with numba. The
+files are keyed by the kernel source or the bytecode of the user
+function and the values it refers to, the argument types, and the numba
+version, NVVM version and compute capability, so that processes on the
+same machine share them.
+
+The cache directory is read from the ``CUDF_KERNEL_CACHE_DIR``
+environment variable, or set with ``set_cache_directory``. Without one,
+kernels are only cached in memory.
+
+Entries are pickles, and loading a pickle can run arbitrary code, so
+anyone who can write to the cache directory can run code in the
+processes using it. The directory is created readable by its owner
+only, and entries are only loaded if both the directory and the file
+are owned by the current user and not writable by anyone else. Do not
+point the cache at a shared directory.
+"""
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+import types
+
+import numba
+import numpy as np
+from numba import cuda
+
+_lock = threading.Lock()
+_directory = os.environ.get("CUDF_KERNEL_CACHE_DIR") or None
+_stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "errors": 0}
+
+
+def set_cache_directory(path):
+    """Set the directory of the on-disk kernel cache.
+
+    Parameters
+    ----------
+    path : str or None
+        The directory, created if needed with permissions for its owner
+        only. ``None`` disables the on-disk cache.
+    """
+    global _directory
+    if path is not None:
+        os.makedirs(path, mode=0o700, exist_ok=True)
+    _directory = path
+
+
+def get_cache_directory():
+    return _directory
+
+
+def cache_info():
+    """Number of kernels found in memory, found on disk and compiled.
+    """
+    with _lock:
+        return dict(_stats)
+
+
+def _code_token(code):
+    parts = [code.co_code, repr(code.co_names), repr(code.co_varnames)]
+    for const in code.co_consts:
+        # Nested functions are hashed by their own bytecode, since their
+        # repr contains an address
+        if isinstance(const, types.CodeType):
+            parts.append(_code_token(const))
+        else:
+            parts.append(repr(const))
+    return hashlib.sha256(
+        b"".join(p if isinstance(p, bytes) else p.encode() for p in parts)
+    ).hexdigest()
+
+
+class _Unkeyable(Exception):
+    pass
+
+
+_SCALAR_TYPES = (type(None), bool, int, float, complex, str, bytes)
+
+
+def _value_token(value, seen):
+    if isinstance(value, _SCALAR_TYPES + (np.generic, np.dtype)):
+        return repr(value)
+    if isinstance(value, type) and issubclass(value, np.generic):
+        return repr(value)
+    if isinstance(value, np.ndarray):
+        # Hash the contents, numba compiles global arrays as constants
+        data = np.ascontiguousarray(value).tobytes()
+        return "ndarray({}, {}, {})".format(
+            value.dtype.str, value.shape, hashlib.sha256(data).hexdigest()
+        )
+    if isinstance(value, (tuple, list)):
+        return "{}({})".format(
+            type(value).__name__,
+            ", ".join(_value_token(v, seen) for v in value),
+        )
+    if isinstance(value, types.ModuleType):
+        return "module({})".format(value.__name__)
+    if isinstance(value, types.FunctionType):
+        return _func_token(value, seen)
+    # numba dispatchers and device functions
+    py_func = getattr(value, "py_func", None)
+    if isinstance(py_func, types.FunctionType):
+        return "jit({})".format(_func_token(py_func, seen))
+    raise _Unkeyable(value)
+
+
+def _global_names(code):
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            names |= _global_names(const)
+    return names
+
+
+def _func_token(func, seen):
+    if func in seen:
+        # A recursive reference
+        return func.__qualname__
+    seen = seen | {func}
+    parts = [
+        str(func.__module__),
+        func.__qualname__,
+        _code_token(func.__code__),
+    ]
+    for cell in func.__closure__ or ():
+        try:
+            contents = cell.cell_contents
+        except ValueError:
+            raise _Unkeyable(func)
+        parts.append(_value_token(contents, seen))
+    parts.append(_value_token(func.__defaults__ or (), seen))
+    # Attribute names are in co_names too, only names bound in the
+    # globals of func are resolved
+    for name in sorted(_global_names(func.__code__)):
+        if name in func.__globals__:
+            value = _value_token(func.__globals__[name], seen)
+            parts.append("{}={}".format(name, value))
+    return hashlib.sha256("\n".join(parts).encode()).hexdigest()
+
+
+def func_key(func):
+    """A key of the Python function *func* that is stable across
+    processes, derived from its bytecode and the values of the constants,
+    closure variables, defaults and globals it refers to.
+
+    Returns None if *func* refers to a value other than a scalar, a
+    numpy array, a module, a function or a tuple or list of those, whose
+    contents cannot be hashed. Such functions are not cached on disk.
+    """
+    try:
+        token = _func_token(func, frozenset())
+    except _Unkeyable:
+        return None
+    return (func.__module__, func.__qualname__, token)
+
+
+def _environment():
+    try:
+        nvvm = cuda.cudadrv.nvvm.NVVM().get_version()
+    except Exception:
+        nvvm = None
+    try:
+        cc = cuda.get_current_device().compute_capability
+    except Exception:
+        cc = None
+    return (numba.__version__, nvvm, cc)
+
+
+def _path(key, argtypes):
+    token = repr((key, [str(t) for t in argtypes], _environment()))
+    digest = hashlib.sha256(token.encode()).hexdigest()
+    return os.path.join(_directory, digest + ".kernel")
+
+
+def _is_trusted(st):
+    # Owned by us and not writable by the group or others
+    return st.st_uid == os.getuid() and not st.st_mode & 0o022
+
+
+def _load(key, argtypes):
+    if _directory is None or key is None:
+        return None
+    path = _path(key, argtypes)
+    try:
+        with open(path, "rb") as f:
+            if not (
+                _is_trusted(os.stat(_directory))
+                and _is_trusted(os.fstat(f.fileno()))
+            ):
+                raise PermissionError(
+                    "untrusted kernel cache entry {!r}".format(path)
+                )
+            return pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception:
+        # A corrupt, incompatible or untrusted entry is recompiled and
+        # overwritten
+        with _lock:
+            _stats["errors"] += 1
+        return None
+
+
+def _save(key, argtypes, kernel):
+    if _directory is None or key is None:
+        return
+    path = _path(key, argtypes)
+    try:
+        os.makedirs(_directory, mode=0o700, exist_ok=True)
+        data = pickle.dumps(kernel)
+        # Write to a temporary file first, so that concurrent readers
+        # never see a partial entry
+        fd, tmp = tempfile.mkstemp(dir=_directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except Exception:
+        with _lock:
+            _stats["errors"] += 1
+
+
+class CachedKernel(object):
+    """A numba CUDA kernel whose compiled specializations are cached on
+    disk.
+
+    Supports the launch syntaxes of the wrapped kernel,
+    ``kernel[griddim, blockdim](*args)`` and
+    ``kernel.forall(ntasks)(*args)``.
+
+    Parameters
+    ----------
+    kernel : numba.cuda.compiler.AutoJitCUDAKernel
+        The kernel, as returned by ``cuda.jit``.
+    key : hashable or None
+        Identifies the source of the kernel. It must be stable across
+        processes, e.g. the generated source code or ``func_key`` of the
+        user function. If None, the kernel is only cached in memory.
+    """
+
+    def __init__(self, kernel, key):
+        self.kernel = kernel
+        self.key = key
+        self._specializations = {}
+
+    def specialize(self, *args):
+        """The kernel compiled for the types of *args*.
+        """
+        argtypes = tuple(
+            self.kernel.typingctx.resolve_argument_type(a) for a in args
+        )
+        kernel = self._specializations.get(argtypes)
+        if kernel is not None:
+            with _lock:
+                _stats["memory_hits"] += 1
+            return kernel
+        kernel = _load(self.key, argtypes)
+        if kernel is not None:
+            with _lock:
+                _stats["disk_hits"] += 1
+        else:
+            with _lock:
+                _stats["misses"] += 1
+            kernel = self.kernel.specialize(*args)
+            _save(self.key, argtypes, kernel)
+        self._specializations[argtypes] = kernel
+        return kernel
+
+    def __getitem__(self, config):
+        def launch(*args):
+            return self.specialize(*args)[config](*args)
+
+        return launch
+
+    def forall(self, ntasks, tpb=0, stream=0, sharedmem=0):
+        def launch(*args):
+            kernel = self.specialize(*args)
+            return kernel.forall(
+                ntasks, tpb=tpb, stream=stream, sharedmem=sharedmem
+            )(*args)
+
+        return launch
@@ -0,0 +1,249 @@
+# Copyright (c) 2019, NVIDIA CORPORATION.
+"""
+In-process profiling of cudf operations.
+
+Functions decorated with ``instrument`` and the NVTX ranges opened with
+``cudf.core.memory.annotate`` record an event for each call while a
+``profile`` block is active. An event holds the wall time of the call,
+the number of rows of its input and output, and the device memory held
+by its output. Outside of ``profile`` blocks the decorator only costs a
+check of an empty list.
+"""
+import functools
+import json
+import os
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from contextlib import contextmanager
+
+_lock = threading.Lock()
+_profiles = []
+
+Event = namedtuple(
+    "Event",
+    ["name", "start", "duration", "thread", "rows_in", "rows_out", "nbytes"],
+)
+
+
+def _is_cudf_object(obj):
+    return type(obj).__module__.startswith("cudf.") and hasattr(obj, "__len__")
+
+
+def _is_pandas_object(obj):
+    return type(obj).__module__.startswith("pandas.") and hasattr(
+        obj, "__len__"
+    )
+
+
+def _nrows(obj):
+    if isinstance(obj, (list, tuple)):
+        counts = [_nrows(o) for o in obj]
+        if not counts or None in counts:
+            return None
+        return sum(counts)
+    # pandas inputs of from_pandas are sized too
+    if not (_is_cudf_object(obj) or _is_pandas_object(obj)):
+        return None
+    try:
+        return len(obj)
+    except TypeError:
+        return None
+
+
+def _nbytes(obj):
+    if not _is_cudf_object(obj):
+        return None
+    return obj.__sizeof__()
+
+
+def record(name, start, stop, rows_in=None, rows_out=None, nbytes=None):
+    """Record an event in all active profiles.
+
+    *start* and *stop* are ``time.perf_counter`` values.
+    """
+    event = Event(
+        name,
+        start,
+        stop - start,
+        threading.get_ident(),
+        rows_in,
+        rows_out,
+        nbytes,
+    )
+    with _lock:
+        for profile in _profiles:
+            profile.events.append(event)
+
+
+def is_profiling():
+    """Whether a ``profile`` block is active.
+    """
+    return bool(_profiles)
+
+
+def instrument(name=None):
+    """Decorator recording calls of the function in active profiles.
+
+    The input rows are counted on the first argument, which is ``self``
+    for methods and the argument after the class for classmethods, so
+    ``classmethod`` must be stacked above ``instrument``.
+
+    Parameters
+    ----------
+    name : str, optional
+        The name of the events. Defaults to the qualified name of the
+        function, e.g. ``"DataFrame.sort_values"``.
+    """
+
+    def decorator(func):
+        label = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _profiles:
+                return func(*args, **kwargs)
+            # Size the first argument after the class of a classmethod
+            first = 1 if args and isinstance(args[0], type) else 0
+            rows_in = _nrows(args[first]) if len(args) > first else None
+            start = time.perf_counter()
+            result = func(*args, **kwargs)
+            stop = time.perf_counter()
+            record(
+                label,
+                start,
+                stop,
+                rows_in=rows_in,
+                rows_out=_nrows(result),
+                nbytes=_nbytes(result),
+            )
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+class Profile(object):
+    """Events recorded during a ``profile`` block.
+    """
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.events = []
+
+    def stats(self):
+        """Aggregate the events of each operation.
+
+        Returns
+        -------
+        dict mapping operation names to dicts with the number of
+        ``calls``, the total wall ``time`` in seconds, the total
+        ``rows_in`` and ``rows_out``, and the total ``bytes`` of the
+        outputs, sorted by decreasing time.
+        """
+        with _lock:
+            events = list(self.events)
+        out = {}
+        for event in events:
+            stats = out.setdefault(
+                event.name,
+                {
+                    "calls": 0,
+                    "time": 0.0,
+                    "rows_in": 0,
+                    "rows_out": 0,
+                    "bytes": 0,
+                },
+            )
+            stats["calls"] += 1
+            stats["time"] += event.duration
+            stats["rows_in"] += event.rows_in or 0
+            stats["rows_out"] += event.rows_out or 0
+            stats["bytes"] += event.nbytes or 0
+        return OrderedDict(
+            sorted(out.items(), key=lambda item: -item[1]["time"])
+        )
+
+    def to_chrome_trace(self, path=None):
+        """Export the events in the Chrome trace event format.
+
+        The trace can be opened with ``chrome://tracing`` or Perfetto.
+
+        Parameters
+        ----------
+        path : str, optional
+            If given, the trace is written to this file as JSON.
+
+        Returns
+        -------
+        dict with the ``traceEvents`` list.
+        """
+        pid = os.getpid()
+        with _lock:
+            events = list(self.events)
+        trace = []
+        for event in events:
+            args = {
+                key: value
+                for key, value in (
+                    ("rows_in", event.rows_in),
+                    ("rows_out", event.rows_out),
+                    ("bytes", event.nbytes),
+                )
+                if value is not None
+            }
+            trace.append(
+                {
+                    "name": event.name,
+                    "cat": "cudf",
+                    "ph": "X",
+                    "ts": (event.start - self.start) * 1e6,
+                    "dur": event.duration * 1e6,
+                    "pid": pid,
+                    "tid": event.thread,
+                    "args": args,
+                }
+            )
+        result = {"traceEvents": trace, "displayTimeUnit": "ms"}
+        if path is not None:
+            with open(path, "w") as f:
+                json.dump(result, f)
+        return result
+
+    def __repr__(self):
+        lines = [
+            "{:<40}{:>8}{:>12}{:>14}{:>14}".format(
+                "operation", "calls", "time (s)", "rows in", "rows out"
+            )
+        ]
+        for name, stats in self.stats().items():
+            lines.append(
+                "{:<40}{calls:>8}{time:>12.6f}{rows_in:>14}"
+                "{rows_out:>14}".format(name, **stats)
+            )
+        return "\n".join(lines)
+
+
+@contextmanager
+def profile():
+    """Record the time spent in cudf operations.
+
+    Examples
+    --------
+    >>> import cudf
+    >>> df = cudf.DataFrame({'a': [3, 1, 2]})
+    >>> with cudf.profile() as prof:
+    ...     out = df.sort_values('a')
+    >>> prof.stats()['DataFrame.sort_values']['calls']
+    1
+    >>> trace = prof.to_chrome_trace('trace.json')  # doctest: +SKIP
+    """
+    prof = Profile()
+    with _lock:
+        _profiles.append(prof)
+    try:
+        yield prof
+    finally:
+        with _lock:
+            _profiles.remove(prof)
@@ -2,16 +2,29 @@
 
 import ast
 import datetime as dt
-
+import io
+import operator
+import threading
+import time
+import tokenize
+from collections import OrderedDict
+
+import numba
 import numpy as np
 import six
 from numba import cuda
 
 from librmm_cffi import librmm as rmm
 
-from cudf.utils import applyutils, cudautils
+import cudf._lib as libcudf
+from cudf.core.column import CategoricalColumn, StringColumn
+from cudf.core.series import Series
+from cudf.utils import applyutils, cudautils, kernelcache
+from cudf.utils.dtypes import is_categorical_dtype
 
 ENVREF_PREFIX = "__CUDF_ENVREF__"
+LITERAL_PREFIX = "__CUDF_LITERAL__"
+DERIVED_PREFIX = "__CUDF_DERIVED__"
 
 
 class QuerySyntaxError(ValueError):
@@ -22,15 +35,19 @@ class _NameExtractor(ast.NodeVisitor):
     def __init__(self):
         self.colnames = set()
         self.refnames = set()
+        self.litnames = set()
 
     def visit_Name(self, node):
         if not isinstance(node.ctx, ast.Load):
             raise QuerySyntaxError("assignment is not allowed")
 
         name = node.id
-        chosen = (
-            self.refnames if name.startswith(ENVREF_PREFIX) else self.colnames
-        )
+        if name.startswith(ENVREF_PREFIX):
+            chosen = self.refnames
+        elif name.startswith(LITERAL_PREFIX):
+            chosen = self.litnames
+        else:
+            chosen = self.colnames
         chosen.add(name)
 
 
@@ -60,15 +77,56 @@ def query_parser(text):
     extractor.visit(expr)
     colnames = sorted(extractor.colnames)
     refnames = sorted(extractor.refnames)
+    litnames = sorted(
+        extractor.litnames, key=lambda name: int(name[len(LITERAL_PREFIX) :])
+    )
     info = {
         "source": text,
-        "args": colnames + refnames,
+        "args": colnames + refnames + litnames,
         "colnames": colnames,
         "refnames": refnames,
+        "litnames": litnames,
     }
     return info
 
 
+def normalize_query(text):
+    """Normalize the query expression *text*.
+
+    Numeric literals are replaced by the names of kernel arguments and
+    the tokens are separated by single spaces, so that queries differing
+    only in literal values or whitespace share one kernel.
+
+    Returns
+    -------
+    (source, literals) : the normalized expression and the values of the
+    literals, in the order of their argument names.
+    """
+    text = text.replace("@", ENVREF_PREFIX)
+    tokens = []
+    literals = []
+    skipped = (
+        tokenize.NEWLINE,
+        tokenize.NL,
+        tokenize.ENDMARKER,
+        tokenize.INDENT,
+        tokenize.DEDENT,
+        tokenize.COMMENT,
+    )
+    try:
+        for tok in tokenize.generate_tokens(io.StringIO(text).readline):
+            if tok.type in skipped:
+                continue
+            if tok.type == tokenize.NUMBER:
+                tokens.append("{}{}".format(LITERAL_PREFIX, len(literals)))
+                literals.append(ast.literal_eval(tok.string))
+            else:
+                tokens.append(tok.string)
+    except tokenize.TokenError as e:
+        raise QuerySyntaxError(str(e))
+    return " ".join(tokens), literals
+
+
 def query_builder(info, funcid):
     """Function builder for the query expression
 
@@ -101,17 +159,98 @@ def _check_error(tree):
         raise QuerySyntaxError("too many expressions")
 
 
-_cache = {}
+class _LRUCache(object):
+    """A bounded mapping evicting the least recently used entries.
+    """
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.compile_time = 0.0
+
+    def get(self, key):
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            self._evict()
+
+    def resize(self, maxsize):
+        with self._lock:
+            self.maxsize = maxsize
+            self._evict()
+
+    def _evict(self):
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+    def info(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "compile_time": self.compile_time,
+            }
+
+
+# Compiled kernels keyed by (normalized expression, column dtypes,
+# argument types)
+_cache = _LRUCache(maxsize=256)
+
+
+def query_cache_info():
+    """Statistics of the query kernel cache.
+
+    Returns
+    -------
+    dict with the number of cache ``hits``, ``misses`` and
+    ``evictions``, the current ``size`` and ``maxsize``, and the total
+    ``compile_time`` in seconds spent on misses.
+    """
+    return _cache.info()
+
+
+def set_query_cache_size(maxsize):
+    """Set the maximum number of compiled query kernels kept in memory.
+    """
+    if maxsize < 1:
+        raise ValueError("maxsize must be positive")
+    _cache.resize(maxsize)
 
 
 def query_compile(expr):
     """Compile the query expression.
 
-    This generates a CUDA Kernel for the query expression.  The kernel is
-    cached for reuse.  All variable names, including both references to
-    columns and references to variables in the calling environment, in the
-    expression are passed as argument to the kernel. Thus, the kernel is
-    reusable on any dataframe and in any environment.
+    This generates a CUDA Kernel for the query expression.  All variable
+    names, including both references to columns and references to
+    variables in the calling environment, in the expression are passed as
+    argument to the kernel. Thus, the kernel is reusable on any dataframe
+    and in any environment.
 
     Parameters
     ----------
@@ -126,26 +265,29 @@ def query_compile(expr):
     """
 
     funcid = "queryexpr_{:x}".format(np.uintp(hash(expr)))
-    # Load cache
-    compiled = _cache.get(funcid)
-    # Cache not found
-    if compiled is None:
-        info = query_parser(expr)
-        fn = query_builder(info, funcid)
-        args = info["args"]
-        # compile
-        devicefn = cuda.jit(device=True)(fn)
-
-        kernelid = "kernel_{}".format(funcid)
-        kernel = _wrap_query_expr(kernelid, devicefn, args)
-
-        compiled = info.copy()
-        compiled["kernel"] = kernel
-        # Store cache
-        _cache[funcid] = compiled
+    info = query_parser(expr)
+    fn = query_builder(info, funcid)
+    args = info["args"]
+    # compile
+    devicefn = cuda.jit(device=True)(fn)
+
+    kernelid = "kernel_{}".format(funcid)
+    kernel = kernelcache.CachedKernel(
+        _wrap_query_expr(kernelid, devicefn, args),
+        key=("query", info["source"]),
+    )
+
+    compiled = info.copy()
+    compiled["kernel"] = kernel
     return compiled
 
 
+def _arg_type(value):
+    if isinstance(value, np.ndarray) or cuda.is_cuda_array(value):
+        return str(value.dtype)
+    return str(numba.typeof(value))
+
+
 _kernel_source = """
 @cuda.jit
 def {kernelname}(out, {args}):
@@ -160,7 +302,7 @@ def _wrap_query_expr(name, fn, args):
     """
 
     def _add_idx(arg):
-        if arg.startswith(ENVREF_PREFIX):
+        if arg.startswith((ENVREF_PREFIX, LITERAL_PREFIX)):
             return arg
         else:
             return "{}[idx]".format(arg)
@@ -181,29 +323,379 @@ def _wrap_query_expr(name, fn, args):
     return kernel
 
 
-def query_execute(df, expr, callenv):
-    """Compile & execute the query expression
+_CMP_SYMBOLS = {
+    ast.Eq: "==",
+    ast.NotEq: "!=",
+    ast.Lt: "<",
+    ast.LtE: "<=",
+    ast.Gt: ">",
+    ast.GtE: ">=",
+    ast.In: "in",
+    ast.NotIn: "not in",
+    ast.Is: "is",
+    ast.IsNot: "is not",
+}
+
+_BINOP_SYMBOLS = {
+    ast.Add: "+",
+    ast.Sub: "-",
+    ast.Mult: "*",
+    ast.Div: "/",
+    ast.FloorDiv: "//",
+    ast.Mod: "%",
+    ast.Pow: "**",
+    ast.BitAnd: "&",
+    ast.BitOr: "|",
+    ast.BitXor: "^",
+    ast.LShift: "<<",
+    ast.RShift: ">>",
+}
+
+_UNARYOP_SYMBOLS = {
+    ast.Not: "not ",
+    ast.USub: "-",
+    ast.UAdd: "+",
+    ast.Invert: "~",
+}
+
+# The comparison with swapped operands
+_SWAPPED_CMPOPS = {
+    ast.Eq: ast.Eq,
+    ast.NotEq: ast.NotEq,
+    ast.Lt: ast.Gt,
+    ast.LtE: ast.GtE,
+    ast.Gt: ast.Lt,
+    ast.GtE: ast.LtE,
+}
+
+
+def _unparse(node):
+    """Fully parenthesized source of the query expression *node*.
+    """
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, (ast.Num, ast.Str, ast.NameConstant)):
+        return repr(_constant_value(node))
+    if isinstance(node, ast.BoolOp):
+        op = " and " if isinstance(node.op, ast.And) else " or "
+        return "({})".format(op.join(_unparse(v) for v in node.values))
+    if isinstance(node, ast.BinOp):
+        return "({} {} {})".format(
+            _unparse(node.left),
+            _BINOP_SYMBOLS[type(node.op)],
+            _unparse(node.right),
+        )
+    if isinstance(node, ast.UnaryOp):
+        return "({}{})".format(
+            _UNARYOP_SYMBOLS[type(node.op)], _unparse(node.operand)
+        )
+    if isinstance(node, ast.Compare):
+        parts = [_unparse(node.left)]
+        for op, comparator in zip(node.ops, node.comparators):
+            parts.extend([_CMP_SYMBOLS[type(op)], _unparse(comparator)])
+        return "({})".format(" ".join(parts))
+    if isinstance(node, ast.IfExp):
+        return "({} if {} else {})".format(
+            _unparse(node.body), _unparse(node.test), _unparse(node.orelse)
+        )
+    if isinstance(node, (ast.Tuple, ast.List)):
+        return "({},)".format(", ".join(_unparse(e) for e in node.elts))
+    if isinstance(node, ast.Call) and not node.keywords:
+        return "{}({})".format(
+            _unparse(node.func), ", ".join(_unparse(a) for a in node.args)
+        )
+    if isinstance(node, ast.Attribute):
+        return "{}.{}".format(_unparse(node.value), node.attr)
+    raise QuerySyntaxError(
+        "{} is not supported in queries".format(type(node).__name__)
+    )
 
-    Note: the expression is compiled and cached for future reuse.
 
-    Parameters
-    ----------
-    df : DataFrame
-    expr : str
-        boolean expression
-    callenv : dict
-        Contains keys 'local_dict', 'locals' and 'globals' which are all dict.
-        They represent the arg, local and global dictionaries of the caller.
+def _constant_value(node):
+    if isinstance(node, ast.Num):
+        return node.n
+    if isinstance(node, ast.Str):
+        return node.s
+    return node.value
+
+
+def _encode_category(col, value):
+    """The code of *value* in the categorical column *col*, or None if it
+    is not a category.
     """
-    # compile
-    compiled = query_compile(expr)
-    kernel = compiled["kernel"]
-    # process env args
+    try:
+        code = col._encode(value)
+    except ValueError:
+        return None
+    if not 0 <= code < len(col.categories):
+        return None
+    # The code of the next larger category is returned for values missing
+    # from monotonic categories
+    if col._decode(code) != value:
+        return None
+    return code
+
+
+class _PredicateRewriter(ast.NodeTransformer):
+    """Rewrite comparisons of string and categorical columns into
+    comparisons of numeric kernel arguments.
+
+    Categorical columns are passed to the kernel as their codes, and the
+    values they are compared to are encoded once. String comparisons are
+    evaluated with nvstrings into derived columns: ``compare`` results
+    for comparisons with strings and ``match_strings`` results for
+    equality of two string columns.
+    """
+
+    def __init__(self, df, values, nliterals):
+        self.df = df
+        self.values = values
+        self.nliterals = nliterals
+        self.literals = []
+        # derived name -> (device array, source column names)
+        self.derived = OrderedDict()
+        self._derived_keys = {}
+        self.changed = False
+
+    def _kind(self, node):
+        if not isinstance(node, ast.Name) or node.id not in self.df.columns:
+            return None
+        col = self.df[node.id]._column
+        if isinstance(col, StringColumn):
+            return "string"
+        if isinstance(col, CategoricalColumn):
+            return "categorical"
+        return None
+
+    def _value(self, node):
+        if isinstance(node, (ast.Num, ast.Str, ast.NameConstant)):
+            return _constant_value(node)
+        if isinstance(node, ast.Name) and node.id in self.values:
+            return self.values[node.id]
+        raise TypeError(
+            "string and categorical columns can only be compared with "
+            "constants or variables"
+        )
+
+    def _values(self, op, node):
+        if isinstance(op, (ast.In, ast.NotIn)):
+            if isinstance(node, (ast.Tuple, ast.List, ast.Set)):
+                return [self._value(e) for e in node.elts]
+            value = self._value(node)
+            if isinstance(value, str) or np.isscalar(value):
+                raise TypeError("'in' requires a list of values")
+            return list(value)
+        return [self._value(node)]
+
+    def _new_literal(self, value):
+        name = "{}{}".format(
+            LITERAL_PREFIX, self.nliterals + len(self.literals)
+        )
+        self.literals.append(value)
+        return ast.Name(id=name, ctx=ast.Load())
+
+    def _new_derived(self, key, make, sources):
+        name = self._derived_keys.get(key)
+        if name is None:
+            name = "{}{}".format(DERIVED_PREFIX, len(self.derived))
+            self._derived_keys[key] = name
+            self.derived[name] = (make(), sources)
+        return ast.Name(id=name, ctx=ast.Load())
+
+    def visit_Name(self, node):
+        kind = self._kind(node)
+        if kind is not None:
+            raise TypeError(
+                "{} column {!r} can only be used in comparisons".format(
+                    kind, node.id
+                )
+            )
+        return node
+
+    def visit_Compare(self, node):
+        if len(node.ops) > 1:
+            # Chained comparisons are the conjunction of their links
+            operands = [node.left] + node.comparators
+            links = [
+                ast.Compare(left=lhs, ops=[op], comparators=[rhs])
+                for lhs, op, rhs in zip(operands, node.ops, operands[1:])
+            ]
+            if any(self._kind(o) for o in operands):
+                return self.visit(ast.BoolOp(op=ast.And(), values=links))
+            return self.generic_visit(node)
+        left, [op], [right] = node.left, node.ops, node.comparators
+        lkind, rkind = self._kind(left), self._kind(right)
+        if lkind is None and rkind is None:
+            return self.generic_visit(node)
+        self.changed = True
+        if lkind == rkind == "string":
+            return self._string_match(left.id, op, right.id)
+        if lkind is None or (rkind is not None and lkind != "string"):
+            if lkind is not None or type(op) not in _SWAPPED_CMPOPS:
+                raise TypeError(
+                    "unsupported comparison of {} and {} columns".format(
+                        lkind or "numeric", rkind
+                    )
+                )
+            left, right = right, left
+            lkind, op = rkind, _SWAPPED_CMPOPS[type(op)]()
+        values = self._values(op, right)
+        if lkind == "categorical":
+            return self._categorical_compare(left.id, op, values)
+        return self._string_compare(left.id, op, values)
+
+    def _any(self, tests, negate):
+        if not tests:
+            result = ast.NameConstant(value=False)
+        elif len(tests) == 1:
+            result = tests[0]
+        else:
+            result = ast.BoolOp(op=ast.Or(), values=tests)
+        if negate:
+            result = ast.UnaryOp(op=ast.Not(), operand=result)
+        return result
+
+    def _categorical_compare(self, name, op, values):
+        if not isinstance(op, (ast.Eq, ast.NotEq, ast.In, ast.NotIn)):
+            raise TypeError(
+                "categorical column {!r} only supports equality and "
+                "membership tests".format(name)
+            )
+        col = self.df[name]._column
+        tests = []
+        for value in values:
+            code = _encode_category(col, value)
+            if code is not None:
+                tests.append(
+                    ast.Compare(
+                        left=ast.Name(id=name, ctx=ast.Load()),
+                        ops=[ast.Eq()],
+                        comparators=[self._new_literal(code)],
+                    )
+                )
+        return self._any(tests, isinstance(op, (ast.NotEq, ast.NotIn)))
+
+    def _string_compare(self, name, op, values):
+        col = self.df[name]._column
+        if isinstance(op, (ast.In, ast.NotIn)):
+            cmpop, negate = ast.Eq(), isinstance(op, ast.NotIn)
+        else:
+            cmpop, negate = op, False
+        tests = []
+        for value in values:
+            if not isinstance(value, str):
+                raise TypeError(
+                    "string column {!r} can only be compared with "
+                    "strings, got {!r}".format(name, value)
+                )
+            tests.append(
+                ast.Compare(
+                    left=self._new_derived(
+                        ("compare", name, value),
+                        lambda: _nvstrings_compare(col, value),
+                        [name],
+                    ),
+                    ops=[cmpop],
+                    comparators=[ast.Num(n=0)],
+                )
+            )
+        return self._any(tests, negate)
+
+    def _string_match(self, lhs, op, rhs):
+        if not isinstance(op, (ast.Eq, ast.NotEq)):
+            raise TypeError(
+                "string columns can only be compared with each other "
+                "for equality"
+            )
+        lcol, rcol = self.df[lhs]._column, self.df[rhs]._column
+        result = self._new_derived(
+            ("match", lhs, rhs),
+            lambda: _nvstrings_match(lcol, rcol),
+            [lhs, rhs],
+        )
+        return self._any([result], isinstance(op, ast.NotEq))
+
+
+def _nvstrings_compare(col, value):
+    out = rmm.device_array(len(col), dtype=np.int32)
+    if len(col):
+        col.data.compare(value, devptr=libcudf.cudf.get_ctype_ptr(out))
+    return out
+
+
+def _nvstrings_match(lhs, rhs):
+    out = rmm.device_array(len(lhs), dtype=np.bool_)
+    if len(lhs):
+        lhs.data.match_strings(
+            rhs.data, devptr=libcudf.cudf.get_ctype_ptr(out)
+        )
+    return out
+
+
+def _rewrite_predicates(df, source, literals, callenv):
+    """Rewrite the comparisons of string and categorical columns in the
+    normalized query *source*.
+
+    Returns
+    -------
+    (source, literals, derived) : the rewritten expression, its literal
+    values, and a dict mapping the names of derived columns to their
+    device arrays and source column names.
+    """
+    [node] = ast.parse(source).body
+    extractor = _NameExtractor()
+    extractor.visit(node)
+    if not any(
+        name in df.columns
+        and isinstance(df[name]._column, (StringColumn, CategoricalColumn))
+        for name in extractor.colnames
+    ):
+        return source, literals, {}
+    refnames = sorted(extractor.refnames)
+    values = dict(zip(refnames, _lookup_envrefs(refnames, callenv)))
+    values.update(
+        ("{}{}".format(LITERAL_PREFIX, i), value)
+        for i, value in enumerate(literals)
+    )
+    rewriter = _PredicateRewriter(df, values, len(literals))
+    node = rewriter.visit(node)
+    if not rewriter.changed:
+        return source, literals, {}
+    return _unparse(node.value), literals + rewriter.literals, rewriter.derived
+
+
+def _column_args(df, columns, derived):
+    """Device arrays of the query *columns*, and the names of the columns
+    of *df* whose nulls are nulls of the result.
+    """
+    arrays = []
+    sources = []
+    for name in columns:
+        if name in derived:
+            array, names = derived[name]
+            arrays.append(array)
+            sources.extend(n for n in names if n not in sources)
+        else:
+            arrays.append(df[name].data.mem)
+            if name not in sources:
+                sources.append(name)
+    return arrays, sources
+
+
+def _literal_args(compiled, literals):
+    # Literals consumed by rewritten predicates are not arguments
+    return [
+        literals[int(name[len(LITERAL_PREFIX) :])]
+        for name in compiled["litnames"]
+    ]
+
+
+def _lookup_envrefs(refnames, callenv):
     envargs = []
     envdict = callenv["globals"].copy()
     envdict.update(callenv["locals"])
     envdict.update(callenv["local_dict"])
-    for name in compiled["refnames"]:
+    for name in refnames:
         name = name[len(ENVREF_PREFIX) :]
         try:
             val = envdict[name]
@@ -214,16 +706,217 @@ def query_execute(df, expr, callenv):
             raise NameError(msg.format(name))
         else:
             envargs.append(val)
-    columns = compiled["colnames"]
+    return envargs
+
+
+def query_execute(df, expr, callenv):
+    """Compile & execute the query expression
+
+    Note: the expression is compiled and cached for future reuse.
+
+    Parameters
+    ----------
+    df : DataFrame
+    expr : str
+        boolean expression
+    callenv : dict
+        Contains keys 'local_dict', 'locals' and 'globals' which are all dict.
+        They represent the arg, local and global dictionaries of the caller.
+    """
+    source, literals = normalize_query(expr)
+    source, literals, derived = _rewrite_predicates(
+        df, source, literals, callenv
+    )
+    compiled = query_parser(source)
+    # process env args
+    envargs = _lookup_envrefs(compiled["refnames"], callenv)
     # prepare col args
-    colarrays = [df[col].data.mem for col in columns]
+    colarrays, columns = _column_args(df, compiled["colnames"], derived)
     # allocate output buffer
     nrows = len(df)
     out = rmm.device_array(nrows, dtype=np.bool_)
+    args = [out] + colarrays + envargs + _literal_args(compiled, literals)
+    # Load the kernel specialized for the argument types, or compile it
+    key = (source,) + tuple(_arg_type(arg) for arg in args[1:])
+    kernel = _cache.get(key)
+    if kernel is None:
+        start = time.perf_counter()
+        kernel = query_compile(source)["kernel"].specialize(*args)
+        _cache.compile_time += time.perf_counter() - start
+        _cache.put(key, kernel)
     # run kernel
-    args = [out] + colarrays + envargs
     kernel.forall(nrows)(*args)
     out_mask = applyutils.make_aggregate_nullmask(df, columns=columns)
     if out_mask is not None:
         out = cudautils.fill_mask(out, out_mask.data.mem, False)
     return out
+
+
+_INTERP_BINOPS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+    ast.Pow: operator.pow,
+    ast.BitAnd: operator.and_,
+    ast.BitOr: operator.or_,
+    ast.BitXor: operator.xor,
+}
+
+_INTERP_CMPOPS = {
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+}
+
+
+def _logical_and(lhs, rhs):
+    if isinstance(lhs, Series):
+        return lhs.logical_and(rhs)
+    if isinstance(rhs, Series):
+        return rhs.logical_and(lhs)
+    return bool(lhs and rhs)
+
+
+def _logical_or(lhs, rhs):
+    if isinstance(lhs, Series):
+        return lhs.logical_or(rhs)
+    if isinstance(rhs, Series):
+        return rhs.logical_or(lhs)
+    return bool(lhs or rhs)
+
+
+def _logical_not(operand):
+    if isinstance(operand, Series):
+        return ~operand.astype(np.bool_)
+    return not operand
+
+
+class _Interpreter(ast.NodeVisitor):
+    """Evaluate a parsed query expression with vectorized Series
+    operations.
+
+    Nodes the interpreter does not support raise ``NotImplementedError``.
+    """
+
+    def __init__(self, names):
+        self.names = names
+
+    def generic_visit(self, node):
+        raise NotImplementedError(
+            "{} is not supported by the query interpreter".format(
+                type(node).__name__
+            )
+        )
+
+    def visit_Expr(self, node):
+        return self.visit(node.value)
+
+    def visit_Name(self, node):
+        return self.names[node.id]
+
+    def visit_Num(self, node):
+        return node.n
+
+    def visit_NameConstant(self, node):
+        return node.value
+
+    def visit_Constant(self, node):
+        return node.value
+
+    def visit_BoolOp(self, node):
+        func = _logical_and if isinstance(node.op, ast.And) else _logical_or
+        values = [self.visit(value) for value in node.values]
+        result = values[0]
+        for value in values[1:]:
+            result = func(result, value)
+        return result
+
+    def visit_BinOp(self, node):
+        try:
+            func = _INTERP_BINOPS[type(node.op)]
+        except KeyError:
+            return self.generic_visit(node.op)
+        return func(self.visit(node.left), self.visit(node.right))
+
+    def visit_UnaryOp(self, node):
+        operand = self.visit(node.operand)
+        if isinstance(node.op, ast.Not):
+            return _logical_not(operand)
+        if isinstance(node.op, ast.USub):
+            return -operand
+        if isinstance(node.op, ast.UAdd):
+            return operand
+        return ~operand
+
+    def visit_Compare(self, node):
+        # Chained comparisons are the conjunction of their links
+        result = None
+        lhs = self.visit(node.left)
+        for op, comparator in zip(node.ops, node.comparators):
+            try:
+                func = _INTERP_CMPOPS[type(op)]
+            except KeyError:
+                return self.generic_visit(op)
+            rhs = self.visit(comparator)
+            value = func(lhs, rhs)
+            result = value if result is None else _logical_and(result, value)
+            lhs = rhs
+        return result
+
+
+def query_evaluate(df, expr, callenv):
+    """Evaluate the query expression with existing Series operations
+
+    Unlike ``query_execute``, no kernel is compiled, which is faster for
+    queries run only a few times. Each operation of the expression
+    materializes an intermediate column.
+
+    Parameters
+    ----------
+    df : DataFrame
+    expr : str
+        boolean expression
+    callenv : dict
+        Contains keys 'local_dict', 'locals' and 'globals' which are all dict.
+        They represent the arg, local and global dictionaries of the caller.
+
+    Returns
+    -------
+    A boolean device array, False where any referenced column is null.
+    """
+    source, literals = normalize_query(expr)
+    source, literals, derived = _rewrite_predicates(
+        df, source, literals, callenv
+    )
+    compiled = query_parser(source)
+    envargs = _lookup_envrefs(compiled["refnames"], callenv)
+    colarrays, columns = _column_args(df, compiled["colnames"], derived)
+    names = {}
+    for name, array in zip(compiled["colnames"], colarrays):
+        if name in derived or is_categorical_dtype(df[name].dtype):
+            names[name] = Series(array)
+        else:
+            names[name] = df[name]
+    names.update(zip(compiled["refnames"], envargs))
+    names.update(zip(compiled["litnames"], _literal_args(compiled, literals)))
+    [node] = ast.parse(compiled["source"]).body
+    result = _Interpreter(names).visit(node)
+
+    nrows = len(df)
+    if isinstance(result, Series):
+        result = result.astype(np.bool_).fillna(False)
+        out = result.to_gpu_array()
+    else:
+        out = rmm.device_array(nrows, dtype=np.bool_)
+        if nrows:
+            cudautils.fill_value(out, bool(result))
+    out_mask = applyutils.make_aggregate_nullmask(df, columns=columns)
+    if out_mask is not None:
+        out = cudautils.fill_mask(out, out_mask.data.mem, False)
+    return out
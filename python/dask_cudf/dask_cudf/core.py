@@ -1,6 +1,8 @@
 # Copyright (c) 2018, NVIDIA CORPORATION.
 import warnings
 from collections import OrderedDict
+from collections.abc import Mapping
+from operator import getitem
 
 import numpy as np
 import pandas as pd
@@ -11,37 +13,34 @@ import dask.dataframe as dd
 from dask import compute
 from dask.base import normalize_token, tokenize
 from dask.compatibility import apply
-from dask.context import _globals
-from dask.core import flatten
-from dask.dataframe import from_delayed
+from dask.dataframe import from_delayed, methods
 from dask.dataframe.core import Scalar, handle_out, map_partitions
 from dask.dataframe.utils import raise_on_meta_error
 from dask.delayed import delayed
-from dask.optimization import cull, fuse
-from dask.utils import M, OperatorMethodMixin, derived_from, funcname
+from dask.utils import (
+    M,
+    OperatorMethodMixin,
+    derived_from,
+    funcname,
+    parse_bytes,
+)
 
 import cudf
 import cudf._lib as libcudf
 
-from dask_cudf import batcher_sortnet, join_impl
+from dask_cudf import (
+    batcher_sortnet,
+    hyperloglog,
+    join_impl,
+    quantiles,
+    sorting,
+)
 from dask_cudf.accessor import (
     CachedAccessor,
     CategoricalAccessor,
     DatetimeAccessor,
 )
-
-
-def optimize(dsk, keys, **kwargs):
-    flatkeys = list(flatten(keys)) if isinstance(keys, list) else [keys]
-    dsk, dependencies = cull(dsk, flatkeys)
-    dsk, dependencies = fuse(
-        dsk,
-        keys,
-        dependencies=dependencies,
-        ave_width=_globals.get("fuse_ave_width", 1),
-    )
-    dsk, _ = cull(dsk, keys)
-    return dsk
+from dask_cudf.optimization import optimize
 
 
 def finalize(results):
@@ -102,6 +101,129 @@ class _Frame(dd.core._Frame, OperatorMethodMixin):
         """Create a dask.dataframe object from a dask_cudf object"""
         return self.map_partitions(M.to_pandas)
 
+    def drop_duplicates(
+        self, subset=None, split_every=None, split_out=1, keep="first"
+    ):
+        """Remove duplicate rows across all partitions.
+
+        Each partition is deduplicated with cudf, then the partial results
+        are hash-partitioned into *split_out* groups and deduplicated again
+        in a tree reduction of width *split_every*.
+
+        With ``keep=False`` a row must be compared with every copy of it,
+        so the partitions are only hash-partitioned and concatenated, and
+        each output group is deduplicated once.
+        """
+        kwargs = {"keep": keep}
+        if isinstance(self, DataFrame):
+            if subset is not None and not isinstance(subset, list):
+                subset = [subset]
+            kwargs["subset"] = subset
+        if keep is False:
+            chunk, combine = _identity, _concat
+            chunk_kwargs = combine_kwargs = None
+        else:
+            chunk, combine = M.drop_duplicates, _drop_duplicates_combine
+            chunk_kwargs = combine_kwargs = kwargs
+        return split_out_reduction(
+            self,
+            chunk=chunk,
+            combine=combine,
+            aggregate=_drop_duplicates_combine,
+            meta=self._meta,
+            token="drop-duplicates",
+            split_every=split_every,
+            split_out=split_out,
+            split_out_on=subset,
+            chunk_kwargs=chunk_kwargs,
+            combine_kwargs=combine_kwargs,
+            aggregate_kwargs=kwargs,
+        )
+
+    def rolling(
+        self, window, min_periods=None, center=False, win_type=None, axis=0
+    ):
+        """Provides rolling window calculations across partitions.
+
+        See ``dask_cudf.rolling.Rolling``.
+        """
+        from dask_cudf.rolling import Rolling
+
+        if axis not in (0, "index"):
+            raise NotImplementedError("axis != 0 is not supported yet.")
+        return Rolling(
+            self,
+            window,
+            min_periods=min_periods,
+            center=center,
+            win_type=win_type,
+        )
+
+    def repartition(
+        self,
+        divisions=None,
+        npartitions=None,
+        partition_size=None,
+        freq=None,
+        force=False,
+    ):
+        """Repartition the collection.
+
+        With *partition_size*, e.g. ``"512MiB"``, the device memory of every
+        partition is measured with ``__sizeof__``; partitions larger than
+        *partition_size* are split into row slices and small neighbouring
+        partitions are concatenated, so each output partition holds about
+        *partition_size* bytes. The other arguments behave as in
+        ``dask.dataframe.DataFrame.repartition``.
+        """
+        if partition_size is not None:
+            if any(x is not None for x in (divisions, npartitions, freq)):
+                raise ValueError(
+                    "Please provide exactly one of ``npartitions=``, "
+                    "``freq=``, ``divisions=``, ``partition_size=`` "
+                    "keyword arguments"
+                )
+            return repartition_size(self, partition_size)
+        return super().repartition(
+            divisions=divisions,
+            npartitions=npartitions,
+            freq=freq,
+            force=force,
+        )
+
+    def nunique_approx(self, split_every=None, b=16):
+        """Approximate number of unique rows.
+
+        Uses a HyperLogLog sketch built from the device hashes of each
+        partition. The relative error is about ``1.04 / sqrt(2 ** b)``.
+
+        Parameters
+        ----------
+        split_every : int, optional
+            Group partitions into groups of this size while performing a
+            tree-reduction. Default is 8.
+        b : int
+            Number of hash bits used to select a register, between 8
+            and 16.
+        """
+        return reduction(
+            self,
+            chunk=hyperloglog.compute_hll_array,
+            combine=hyperloglog.reduce_state,
+            aggregate=hyperloglog.estimate_count,
+            meta=float,
+            token="nunique-approx",
+            split_every=split_every,
+            chunk_kwargs={"b": b},
+            aggregate_kwargs={"b": b},
+        )
+
+
+def _names(cols):
+    if isinstance(cols, Mapping):
+        return tuple(cols.items())
+    return tuple(cols)
+
 
 concat = dd.concat
 
@@ -121,11 +243,38 @@ class DataFrame(_Frame, dd.core.DataFrame):
         meta = assigner(self._meta, k, dd.core.make_meta(v))
         return self.map_partitions(assigner, k, v, meta=meta)
 
+    def groupby(self, by=None, **kwargs):
+        """Group by column label(s) with a cudf tree-reduction, falling
+        back to dask.dataframe for other kinds of keys.
+
+        The returned object is a ``dask.dataframe`` groupby; only the
+        aggregations supported by the tree reduction are overridden.
+        """
+        from dask_cudf.groupby import CudfDataFrameGroupBy, is_column_labels
+
+        if (
+            by is not None
+            and kwargs.get("level") is None
+            and is_column_labels(self, by)
+        ):
+            kwargs.pop("level", None)
+            return CudfDataFrameGroupBy(self, by=by, **kwargs)
+        return super().groupby(by=by, **kwargs)
+
     def apply_rows(self, func, incols, outcols, kwargs={}, cache_key=None):
-        import uuid
+        from cudf.utils.kernelcache import func_key
 
         if cache_key is None:
-            cache_key = uuid.uuid4()
+            # Stable across tasks and processes, so that the kernel is
+            # compiled once per worker or found in the on-disk cache
+            key = func_key(func)
+            if key is not None:
+                cache_key = (
+                    "apply_rows",
+                    _names(incols),
+                    _names(outcols),
+                    tuple(sorted(kwargs)),
+                ) + key
 
         def do_apply_rows(df, func, incols, outcols, kwargs):
             return df.apply_rows(
@@ -148,6 +297,26 @@ class DataFrame(_Frame, dd.core.DataFrame):
     ):
         """Merging two dataframes on the column(s) indicated in *on*.
         """
+        if how in ("leftsemi", "leftanti"):
+            if left_index or right_index:
+                raise NotImplementedError(
+                    "{!r} merge on the index is not supported".format(how)
+                )
+            if not on:
+                on = [c for c in self.columns if c in other.columns]
+            if not dask.is_dask_collection(other):
+                return self.map_partitions(
+                    M.merge, other, on=on, how=how, meta=self._meta
+                )
+            return join_impl.join_frames(
+                left=self,
+                right=other,
+                on=on,
+                how=how,
+                lsuffix=suffixes[0],
+                rsuffix=suffixes[1],
+            )
+
         if (
             left_index
             or right_index
@@ -358,29 +527,96 @@ class DataFrame(_Frame, dd.core.DataFrame):
         return newdd, uniques
 
     def _compute_divisions(self):
+        """Compute the divisions of a frame whose partitions are ordered
+        by index, but not necessarily sorted within each partition.
+        """
         if self.known_divisions:
             return self
 
         @delayed
-        def first_index(df):
-            return df.index[0]
-
-        @delayed
-        def last_index(df):
-            return df.index[-1]
+        def index_bounds(df):
+            if len(df) == 0:
+                return None
+            return df.index.min(), df.index.max()
 
         parts = self.to_delayed()
-        divs = [first_index(p) for p in parts] + [last_index(parts[-1])]
-        divisions = compute(*divs)
+        bounds = compute(*map(index_bounds, parts))
+        parts = [p for p, b in zip(parts, bounds) if b is not None]
+        bounds = [b for b in bounds if b is not None]
+        if not bounds:
+            return self
+        for (_, hi), (lo, _) in zip(bounds[:-1], bounds[1:]):
+            if hi > lo:
+                raise ValueError(
+                    "Partitions are not sorted by index, use "
+                    "set_index(..., sorted=False) instead"
+                )
+        divisions = [lo for lo, _ in bounds] + [bounds[-1][1]]
+        if len(parts) != self.npartitions:
+            # Empty partitions carry no division information
+            return from_delayed(parts, meta=self._meta, divisions=divisions)
         return type(self)(self.dask, self._name, self._meta, divisions)
 
-    def set_index(self, other, **kwargs):
+    def set_index(
+        self,
+        other,
+        sorted=False,
+        divisions=None,
+        npartitions=None,
+        drop=True,
+        upsample=1.0,
+        **kwargs,
+    ):
+        """Set the index to the column *other*.
+
+        Parameters
+        ----------
+        other : str
+            Name of the column to use as the new index.
+        sorted : bool
+            If ``True``, the column is already sorted across partitions and
+            only the divisions are computed. Otherwise, approximate quantiles
+            of the column are used to choose balanced divisions, rows are
+            shuffled into range partitions and each partition is sorted.
+        divisions : list, optional
+            Known division values to partition on, skipping the sampling.
+        npartitions : int, optional
+            Number of output partitions. Defaults to the current number.
+        drop : bool
+            Whether to drop the column used as the new index.
+        upsample : float
+            Oversampling factor for the quantiles sampled from each
+            partition when choosing divisions.
+        """
         if kwargs.pop("shuffle", "tasks") != "tasks":
             raise ValueError(
                 "Dask-cudf only supports task based shuffling, got %s"
                 % kwargs["shuffle"]
             )
-        return super().set_index(other, shuffle="tasks", **kwargs)
+        if not isinstance(other, str) or kwargs:
+            return super().set_index(
+                other,
+                sorted=sorted,
+                divisions=divisions,
+                npartitions=npartitions,
+                drop=drop,
+                shuffle="tasks",
+                **kwargs,
+            )
+        if sorted:
+            out = self.map_partitions(M.set_index, other, drop=drop)
+            if divisions is not None:
+                out.divisions = tuple(divisions)
+                return out
+            return out._compute_divisions()
+        return sorting.set_index_sorted(
+            self,
+            other,
+            npartitions=npartitions,
+            divisions=divisions,
+            drop=drop,
+            upsample=upsample,
+        )
 
     def reset_index(self, force=False, drop=False):
         """Reset index to range based
@@ -529,6 +765,18 @@ def var_aggregate(x2, x, n, ddof):
         return np.float64(np.nan)
 
 
+def _identity(x):
+    return x
+
+
+def _concat(x):
+    return cudf.concat(x)
+
+
+def _drop_duplicates_combine(x, **kwargs):
+    return cudf.concat(x).drop_duplicates(**kwargs)
+
+
 def nlargest_agg(x, **kwargs):
     return cudf.concat(x).nlargest(**kwargs)
 
@@ -558,6 +806,97 @@ class Series(_Frame, dd.core.Series):
         n = self.count(split_every=split_every)
         return sum / n
 
+    def nunique(self, split_every=None, split_out=1):
+        """Number of unique non-null values, computed with a distributed
+        ``drop_duplicates``.
+        """
+        uniques = self.drop_duplicates(
+            split_every=split_every, split_out=split_out
+        )
+        return uniques.count(split_every=split_every)
+
+    def quantile(
+        self,
+        q=0.5,
+        split_every=None,
+        sketch_size=quantiles.DEFAULT_SKETCH_SIZE,
+    ):
+        """Approximate quantiles of the values.
+
+        Each partition is summarized by a sketch of at most *sketch_size*
+        sorted samples, and the sketches are merged in a tree reduction.
+        The rank error of the result is roughly ``1 / sketch_size``.
+
+        Parameters
+        ----------
+        q : float or list of floats
+            Quantiles to compute, each in ``[0, 1]``.
+        split_every : int, optional
+            Group partitions into groups of this size while performing a
+            tree-reduction. Default is 8.
+        sketch_size : int
+            Number of sample points kept per sketch.
+        """
+        qs = np.atleast_1d(q)
+        if ((qs < 0) | (qs > 1)).any():
+            raise ValueError(
+                "percentiles should all be in the interval [0, 1]"
+            )
+        if np.isscalar(q):
+            meta = self._meta.dtype
+        else:
+            q = list(map(float, q))
+            meta = cudf.Series(
+                np.array([], dtype=self._meta.dtype), name=self.name
+            )
+        return reduction(
+            self,
+            chunk=quantiles.sketch_chunk,
+            combine=quantiles.sketch_merge,
+            aggregate=quantiles.quantile_aggregate,
+            meta=meta,
+            token="quantile",
+            split_every=split_every,
+            aggregate_kwargs={"q": q, "name": self.name},
+            sketch_size=sketch_size,
+        )
+
+    def describe(
+        self,
+        percentiles=None,
+        split_every=None,
+        sketch_size=quantiles.DEFAULT_SKETCH_SIZE,
+    ):
+        """Summary statistics of the values, with approximate percentiles.
+
+        The count, mean, standard deviation and percentiles are computed in
+        a single tree reduction; see ``quantile`` for *sketch_size*.
+        """
+        if percentiles is None:
+            percentiles = [0.25, 0.5, 0.75]
+        else:
+            percentiles = list(percentiles)
+            if not all(0 <= x <= 1 for x in percentiles):
+                raise ValueError(
+                    "All percentiles must be between 0 and 1, inclusive."
+                )
+            # describe always includes 50th percentile
+            if 0.5 not in percentiles:
+                percentiles.append(0.5)
+            percentiles = sorted(percentiles)
+        meta = cudf.Series(np.array([], dtype="f8"), name=self.name)
+        return reduction(
+            self,
+            chunk=quantiles.describe_chunk,
+            combine=quantiles.describe_combine,
+            aggregate=quantiles.describe_aggregate,
+            meta=meta,
+            token="describe",
+            split_every=split_every,
+            aggregate_kwargs={"percentiles": percentiles, "name": self.name},
+            sketch_size=sketch_size,
+        )
+
     def unique_k(self, k, split_every=None):
         return reduction(
             self,
@@ -821,6 +1160,210 @@ def reduction(
     return dd.core.new_dd_object(dsk, b, meta, (None, None))
 
 
+def hash_split(x, on, nparts):
+    """Split a cudf DataFrame or Series into *nparts* frames by the hash
+    of the values in columns *on*.
+    """
+    if isinstance(x, cudf.Series):
+        name = x.name
+        parts = x.to_frame("__hash_split").partition_by_hash(
+            ["__hash_split"], nparts
+        )
+        return [p["__hash_split"].rename(name) for p in parts]
+    return x.partition_by_hash(on or list(x.columns), nparts)
+
+
+def split_out_reduction(
+    arg,
+    chunk,
+    combine,
+    aggregate,
+    meta,
+    token=None,
+    split_every=None,
+    split_out=1,
+    split_out_on=None,
+    chunk_kwargs=None,
+    combine_kwargs=None,
+    aggregate_kwargs=None,
+):
+    """Tree reduction of one frame into *split_out* output partitions.
+
+    Unlike ``reduction``, the chunk results are hash-partitioned on the
+    columns *split_out_on* and each of the *split_out* groups of chunks
+    is combined and aggregated separately, so no single task needs to
+    hold every distinct key.
+
+    Parameters
+    ----------
+    arg : dask_cudf.DataFrame or dask_cudf.Series
+    chunk : function block -> block
+        Function to operate on each block of data
+    combine : function list-of-blocks -> block
+        Function to operate on intermediate lists of results
+    aggregate : function list-of-blocks -> block
+        Function to operate on the final list of results of each group
+    meta :
+        An empty cudf object matching the output of ``aggregate``.
+    token : str, optional
+        The name to use for the output keys.
+    split_every : int or False, optional
+        Group partitions into groups of this size while performing a
+        tree-reduction. If set to False, no tree-reduction will be used.
+        Default is 8.
+    split_out : int
+        Number of output partitions.
+    split_out_on : list of str, optional
+        Columns hashed to assign rows to output partitions. Defaults to
+        all columns.
+    chunk_kwargs, combine_kwargs, aggregate_kwargs : dict, optional
+        Keywords for the chunk, combine and aggregate functions.
+    """
+    chunk_kwargs = chunk_kwargs or {}
+    combine_kwargs = combine_kwargs or {}
+    aggregate_kwargs = aggregate_kwargs or {}
+
+    npartitions = arg.npartitions
+    if split_every is None:
+        split_every = 8
+    elif split_every is False:
+        split_every = npartitions
+    elif split_every < 2 or not isinstance(split_every, int):
+        raise ValueError("split_every must be an integer >= 2")
+    if not isinstance(split_out, int) or split_out < 1:
+        raise ValueError("split_out must be an integer >= 1")
+
+    token_key = tokenize(
+        token or (chunk, combine, aggregate),
+        arg,
+        split_every,
+        split_out,
+        split_out_on,
+        chunk_kwargs,
+        combine_kwargs,
+        aggregate_kwargs,
+    )
+    prefix = token or funcname(chunk)
+
+    a = "{0}-chunk-{1}".format(prefix, token_key)
+    dsk = {
+        (a, i): (apply, chunk, [key], chunk_kwargs)
+        for i, key in enumerate(arg.__dask_keys__())
+    }
+    if split_out > 1:
+        s = "{0}-split-{1}".format(prefix, token_key)
+        for i in range(npartitions):
+            dsk[(s, i)] = (hash_split, (a, i), split_out_on, split_out)
+
+    b = "{0}-combine-{1}".format(prefix, token_key)
+    c = "{0}-agg-{1}".format(prefix, token_key)
+    for j in range(split_out):
+        if split_out == 1:
+            level = [(a, i) for i in range(npartitions)]
+        else:
+            level = [(getitem, (s, i), j) for i in range(npartitions)]
+
+        depth = 0
+        while len(level) > split_every:
+            next_level = []
+            for i, inds in enumerate(partition_all(split_every, level)):
+                dsk[(b, j, depth, i)] = (
+                    apply,
+                    combine,
+                    [list(inds)],
+                    combine_kwargs,
+                )
+                next_level.append((b, j, depth, i))
+            level = next_level
+            depth += 1
+
+        dsk[(c, j)] = (apply, aggregate, [level], aggregate_kwargs)
+
+    dsk.update(arg.dask)
+    meta = dd.core.make_meta(meta)
+    return dd.core.new_dd_object(dsk, c, meta, (None,) * (split_out + 1))
+
+
+def _partition_stats(df):
+    return df.__sizeof__(), len(df)
+
+
+def _slice_rows(df, start, stop):
+    return df.iloc[start:stop]
+
+
+def repartition_size(df, partition_size):
+    """Repartition *df* so that partitions hold about *partition_size*
+    bytes of device memory.
+
+    Parameters
+    ----------
+    df : dask_cudf.DataFrame or dask_cudf.Series
+    partition_size : int or str
+        Target size in bytes, or a string such as ``"512MiB"``.
+    """
+    if isinstance(partition_size, str):
+        partition_size = parse_bytes(partition_size)
+    partition_size = int(partition_size)
+    if partition_size < 1:
+        raise ValueError("partition_size must be positive")
+
+    stats = compute(*[delayed(_partition_stats)(p) for p in df.to_delayed()])
+
+    token = tokenize(df, partition_size)
+    split_name = "repartition-split-" + token
+    name = "repartition-size-" + token
+    dsk = {}
+
+    # Split partitions larger than partition_size into row slices of
+    # about equal size. Each piece is (key, nbytes, partition, first).
+    pieces = []
+    for i, (nbytes, nrows) in enumerate(stats):
+        nsplits = min(max(-(-nbytes // partition_size), 1), max(nrows, 1))
+        if nsplits == 1:
+            pieces.append(((df._name, i), nbytes, i, True))
+            continue
+        bounds = np.linspace(0, nrows, nsplits + 1).astype("int64")
+        for j in range(nsplits):
+            start, stop = int(bounds[j]), int(bounds[j + 1])
+            dsk[(split_name, i, j)] = (_slice_rows, (df._name, i), start, stop)
+            pieces.append(
+                (
+                    (split_name, i, j),
+                    nbytes * (stop - start) // nrows,
+                    i,
+                    j == 0,
+                )
+            )
+
+    # Concatenate runs of neighbouring pieces up to partition_size
+    groups = []
+    current, current_size = [], 0
+    for piece in pieces:
+        if current and current_size + piece[1] > partition_size:
+            groups.append(current)
+            current, current_size = [], 0
+        current.append(piece)
+        current_size += piece[1]
+    groups.append(current)
+
+    for k, group in enumerate(groups):
+        if len(group) == 1:
+            dsk[(name, k)] = group[0][0]
+        else:
+            dsk[(name, k)] = (methods.concat, [piece[0] for piece in group])
+
+    # Divisions are kept when no group starts in the middle of a partition
+    if df.known_divisions and all(group[0][3] for group in groups):
+        divisions = [df.divisions[group[0][2]] for group in groups]
+        divisions.append(df.divisions[-1])
+    else:
+        divisions = [None] * (len(groups) + 1)
+
+    dsk.update(df.dask)
+    return dd.core.new_dd_object(dsk, name, df._meta, divisions)
+
+
 from_cudf = dd.from_pandas
 
 
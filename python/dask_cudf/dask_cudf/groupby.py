@@ -0,0 +1,435 @@
+"""
+Tree-reduction groupby aggregations for dask_cudf.
+
+Each partition is aggregated with ``cudf.DataFrame.groupby(...).agg`` into
+a small frame of partial results. Partials are combined ``split_every`` at
+a time until one frame per output partition remains. With ``split_out``
+larger than one, partials are hash-partitioned on the keys so that no
+single task has to hold every distinct key.
+"""
+import collections
+
+import pandas as pd
+
+import dask.dataframe as dd
+
+import cudf
+
+from dask_cudf.core import split_out_reduction
+
+SUPPORTED_AGGS = ("count", "max", "mean", "min", "std", "sum", "var")
+
+# Partial aggregations computed per partition for each requested
+# aggregation. "m2" is the sum of the squared deviations from the mean of
+# the group within the partial.
+_CHUNK_AGGS = {
+    "count": ("count",),
+    "sum": ("sum",),
+    "min": ("min",),
+    "max": ("max",),
+    "mean": ("sum", "count"),
+    "var": ("sum", "count", "m2"),
+    "std": ("sum", "count", "m2"),
+}
+
+# How partials of each kind are combined with each other. "m2" partials
+# are first turned into the terms of Chan's formula by ``_m2_terms``.
+_COMBINE_AGGS = {
+    "count": "sum",
+    "sum": "sum",
+    "m2": "sum",
+    "min": "min",
+    "max": "max",
+}
+
+
+def _partial_name(col, agg):
+    return "{}__{}".format(col, agg)
+
+
+def _partials(aggs):
+    """Map partial column names to the ``(column, agg)`` they hold.
+    """
+    out = collections.OrderedDict()
+    for col, agg_list in aggs.items():
+        for agg in agg_list:
+            for part in _CHUNK_AGGS[agg]:
+                out[_partial_name(col, part)] = (col, part)
+    return out
+
+
+def _groupby_chunk(df, gb_cols, partials, dropna):
+    """Aggregate a partition into a flat frame of keys and partials.
+    """
+    tmp = cudf.DataFrame()
+    for col in gb_cols:
+        tmp[col] = df[col]
+    for name, (col, agg) in partials.items():
+        if agg == "m2":
+            tmp[name] = df[col].astype("float64")
+        else:
+            tmp[name] = df[col]
+    out = tmp.groupby(gb_cols, as_index=False, sort=False, dropna=dropna).agg(
+        {
+            name: "var" if agg == "m2" else agg
+            for name, (_, agg) in partials.items()
+        }
+    )
+    for name, (col, agg) in partials.items():
+        if agg == "m2":
+            count = out[_partial_name(col, "count")]
+            # Groups with less than two values have no variance
+            out[name] = (out[name] * (count - 1)).nans_to_nulls().fillna(0)
+    return out
+
+
+def _m2_terms(df, gb_cols, partials, dropna):
+    """Replace the "m2" partials of *df* by the terms of Chan's parallel
+    formula, whose sum over a group is the "m2" of the whole group.
+
+    Partial ``i`` of a group holding ``n`` values of mean ``mean``
+    contributes ``m2_i + n_i * (mean_i - mean) ** 2``.
+    """
+    m2_cols = [col for col, agg in partials.values() if agg == "m2"]
+    if not m2_cols:
+        return df
+    df = df.reset_index(drop=True)
+    parts = [
+        _partial_name(col, agg) for col in m2_cols for agg in ("sum", "count")
+    ]
+    totals = (
+        df[gb_cols + parts]
+        .groupby(gb_cols, sort=False, dropna=dropna)
+        .transform("sum")
+    )
+    for col in m2_cols:
+        total = _partial_name(col, "sum")
+        count = _partial_name(col, "count")
+        mean = df[total].astype("float64") / df[count]
+        delta = mean - totals[total].astype("float64") / totals[count]
+        term = (df[count] * delta * delta).nans_to_nulls().fillna(0)
+        name = _partial_name(col, "m2")
+        df[name] = df[name] + term
+    return df
+
+
+def _groupby_combine(
+    dfs, gb_cols, partials, dropna, as_index=False, sort=False
+):
+    """Combine a list of partial frames into one.
+    """
+    return (
+        _m2_terms(cudf.concat(dfs), gb_cols, partials, dropna)
+        .groupby(gb_cols, as_index=as_index, sort=sort, dropna=dropna)
+        .agg({name: _COMBINE_AGGS[agg] for name, (_, agg) in partials.items()})
+    )
+
+
+def _finalize(combined, col, agg, ddof=1):
+    """Compute aggregation *agg* of *col* from combined partials.
+    """
+    if agg in ("mean", "var", "std"):
+        count = combined[_partial_name(col, "count")]
+        if agg == "mean":
+            total = combined[_partial_name(col, "sum")].astype("float64")
+            return total / count
+        m2 = combined[_partial_name(col, "m2")]
+        result = (m2 / (count - ddof)).where(count > ddof)
+        if agg == "std":
+            result = result.sqrt()
+        return result
+    return combined[_partial_name(col, agg)]
+
+
+def _groupby_aggregate(
+    dfs,
+    gb_cols,
+    aggs,
+    partials,
+    dropna,
+    sort,
+    as_index,
+    series_name,
+    flat,
+    ddof=1,
+):
+    """Combine the last partials and compute the requested aggregations.
+    """
+    combined = _groupby_combine(
+        dfs, gb_cols, partials, dropna, as_index=True, sort=sort
+    )
+
+    names = [(col, agg) for col, agg_list in aggs.items() for agg in agg_list]
+    columns = [
+        _finalize(combined, col, agg, ddof=ddof)._column for col, agg in names
+    ]
+    if series_name is not None and flat:
+        result = cudf.Series(columns[0], index=combined.index)
+        result.name = series_name
+    else:
+        if series_name is not None:
+            labels = [agg for _, agg in names]
+        elif flat:
+            labels = [col for col, _ in names]
+        else:
+            labels = cudf.MultiIndex.from_tuples(names)
+        result = cudf.DataFrame._from_columns(
+            columns, index=combined.index, columns=labels
+        )
+    if not as_index:
+        result = result.reset_index()
+    return result
+
+
+def groupby_agg(
+    ddf,
+    gb_cols,
+    aggs,
+    split_every=None,
+    split_out=1,
+    dropna=True,
+    sort=True,
+    as_index=True,
+    series_name=None,
+    flat=True,
+    ddof=1,
+):
+    """Build the tree-reduction graph of a groupby aggregation.
+
+    Parameters
+    ----------
+    ddf : dask_cudf.DataFrame
+    gb_cols : list of str
+        Names of the key columns.
+    aggs : dict
+        Maps value column names to lists of aggregation names.
+    split_every : int or False, optional
+        Number of partial frames combined per task. If set to False, all
+        partials are combined in a single task. Default is 8.
+    split_out : int
+        Number of output partitions. Partials are hash-partitioned on the
+        keys, so each output partition holds a disjoint set of keys.
+    dropna : bool
+        Whether to drop null keys.
+    sort : bool
+        Whether to sort the keys within each output partition.
+    as_index : bool
+        Whether the keys become the index of the result.
+    series_name : optional
+        Name of the value column when aggregating a single column.
+    flat : bool
+        Whether each column has a single aggregation, in which case the
+        result is not indexed by ``(column, aggregation)`` pairs.
+    ddof : int
+        Delta degrees of freedom of ``var`` and ``std``.
+    """
+    partials = _partials(aggs)
+    chunk_kwargs = dict(gb_cols=gb_cols, partials=partials, dropna=dropna)
+    aggregate_kwargs = dict(
+        gb_cols=gb_cols,
+        aggs=aggs,
+        partials=partials,
+        dropna=dropna,
+        sort=sort,
+        as_index=as_index,
+        series_name=series_name,
+        flat=flat,
+        ddof=ddof,
+    )
+    meta = _groupby_aggregate(
+        [_groupby_chunk(ddf._meta_nonempty, **chunk_kwargs)],
+        **aggregate_kwargs,
+    )
+    return split_out_reduction(
+        ddf,
+        chunk=_groupby_chunk,
+        combine=_groupby_combine,
+        aggregate=_groupby_aggregate,
+        meta=meta,
+        token="groupby",
+        split_every=split_every,
+        split_out=split_out,
+        split_out_on=gb_cols,
+        chunk_kwargs=chunk_kwargs,
+        combine_kwargs=chunk_kwargs,
+        aggregate_kwargs=aggregate_kwargs,
+    )
+
+
+def is_column_labels(df, by):
+    """Whether *by* only refers to columns of *df*.
+    """
+    if not isinstance(by, list):
+        by = [by]
+    return all(
+        not isinstance(k, (dd.core._Frame, cudf.Series)) and k in df.columns
+        for k in by
+    )
+
+
+class _GroupBy(object):
+    """Mixin routing supported aggregations of dask's groupby objects to
+    the tree reduction of :func:`groupby_agg`.
+
+    Anything else (``size``, ``apply``, ``get_group``, other aggregations,
+    keyword arguments unknown to :func:`groupby_agg`...) is left to
+    ``dask.dataframe``.
+    """
+
+    def __init__(
+        self, df, by=None, sort=True, as_index=True, dropna=True, **kwargs
+    ):
+        super().__init__(df, by=by, **kwargs)
+        self._by = list(by) if isinstance(by, (list, tuple)) else [by]
+        self._sort = sort
+        self._as_index = as_index
+        self._dropna = dropna
+
+    def _groupby_kwargs(self):
+        return dict(
+            sort=self._sort,
+            as_index=self._as_index,
+            dropna=self._dropna,
+            group_keys=self.group_keys,
+        )
+
+    def count(self, split_every=None, split_out=1):
+        return self.agg("count", split_every=split_every, split_out=split_out)
+
+    def sum(self, split_every=None, split_out=1, **kwargs):
+        if kwargs:
+            return super().sum(
+                split_every=split_every, split_out=split_out, **kwargs
+            )
+        return self.agg("sum", split_every=split_every, split_out=split_out)
+
+    def min(self, split_every=None, split_out=1):
+        return self.agg("min", split_every=split_every, split_out=split_out)
+
+    def max(self, split_every=None, split_out=1):
+        return self.agg("max", split_every=split_every, split_out=split_out)
+
+    def mean(self, split_every=None, split_out=1):
+        return self.agg("mean", split_every=split_every, split_out=split_out)
+
+    def var(self, ddof=1, split_every=None, split_out=1):
+        return self._agg(
+            "var", split_every=split_every, split_out=split_out, ddof=ddof
+        )
+
+    def std(self, ddof=1, split_every=None, split_out=1):
+        return self._agg(
+            "std", split_every=split_every, split_out=split_out, ddof=ddof
+        )
+
+    def agg(self, arg, split_every=None, split_out=1):
+        return self._agg(arg, split_every=split_every, split_out=split_out)
+
+    def aggregate(self, arg, split_every=None, split_out=1):
+        return self._agg(arg, split_every=split_every, split_out=split_out)
+
+    def _agg(self, arg, split_every=None, split_out=1, ddof=1):
+        aggs = self._normalize_aggs(arg)
+        if aggs is None:
+            return super().agg(
+                arg, split_every=split_every, split_out=split_out
+            )
+        return groupby_agg(
+            self.obj,
+            self._by,
+            aggs,
+            split_every=split_every,
+            split_out=split_out,
+            dropna=self._dropna,
+            sort=self._sort,
+            as_index=self._as_index,
+            ddof=ddof,
+            **self._agg_kwargs(arg, aggs),
+        )
+
+    @staticmethod
+    def _is_supported(aggs):
+        return all(
+            isinstance(agg, str) and agg in SUPPORTED_AGGS
+            for agg_list in aggs.values()
+            for agg in agg_list
+        )
+
+
+class CudfDataFrameGroupBy(_GroupBy, dd.groupby.DataFrameGroupBy):
+    """Groupby on the columns of a dask_cudf DataFrame
+    """
+
+    def __getitem__(self, key):
+        if isinstance(key, list):
+            g = CudfDataFrameGroupBy(
+                self.obj, by=self._by, slice=key, **self._groupby_kwargs()
+            )
+        else:
+            g = CudfSeriesGroupBy(
+                self.obj, by=self._by, slice=key, **self._groupby_kwargs()
+            )
+        g._meta = g._meta[key]
+        return g
+
+    def __getattr__(self, key):
+        if key.startswith("_") or key == "obj":
+            # this guards against RecursionError during pickling/copying
+            raise AttributeError(key)
+        if key in self.obj.columns:
+            return self[key]
+        raise AttributeError(
+            "'CudfDataFrameGroupBy' object has no attribute "
+            "'{}'".format(key)
+        )
+
+    def _normalize_aggs(self, arg):
+        """Map value columns to lists of aggregations, or return None if
+        *arg* is not supported by :func:`groupby_agg`.
+        """
+        meta = self.obj._meta
+        if isinstance(arg, collections.abc.Mapping):
+            aggs = collections.OrderedDict(
+                (col, [agg] if isinstance(agg, str) else list(agg))
+                for col, agg in arg.items()
+            )
+        else:
+            agg_list = [arg] if isinstance(arg, str) else list(arg)
+            numeric_only = any(
+                agg in ("mean", "sum", "var", "std") for agg in agg_list
+            )
+            if self._slice is not None:
+                columns = self._slice
+            else:
+                columns = [c for c in meta.columns if c not in self._by]
+            aggs = collections.OrderedDict()
+            for col in columns:
+                # Drop "nuisance columns" like cudf's groupby does
+                if numeric_only and not pd.api.types.is_numeric_dtype(
+                    meta[col].dtype
+                ):
+                    continue
+                aggs[col] = agg_list
+        if not self._is_supported(aggs):
+            return None
+        return aggs
+
+    def _agg_kwargs(self, arg, aggs):
+        return dict(flat=sum(map(len, aggs.values())) == len(aggs))
+
+
+class CudfSeriesGroupBy(_GroupBy, dd.groupby.SeriesGroupBy):
+    """Groupby on a single value column of a dask_cudf DataFrame
+    """
+
+    def _normalize_aggs(self, arg):
+        if isinstance(arg, collections.abc.Mapping):
+            return None
+        agg_list = [arg] if isinstance(arg, str) else list(arg)
+        aggs = collections.OrderedDict([(self._slice, agg_list)])
+        if not self._is_supported(aggs):
+            return None
+        return aggs
+
+    def _agg_kwargs(self, arg, aggs):
+        return dict(series_name=self._slice, flat=isinstance(arg, str))
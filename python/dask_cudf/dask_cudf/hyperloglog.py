@@ -0,0 +1,92 @@
+"""
+HyperLogLog sketches for approximate distinct counts of cudf objects.
+
+Values are hashed on the device with ``Series.hash_values`` (or
+``DataFrame.hash_columns``). The low ``b`` bits of each 32-bit hash pick
+one of ``m = 2 ** b`` registers, and each register keeps the largest
+position of the first set bit among the remaining bits. Registers from
+different partitions are merged with an elementwise maximum.
+
+Adapted from ``dask.dataframe.hyperloglog``.
+"""
+import numpy as np
+
+import cudf
+
+
+def _hashes(obj):
+    if isinstance(obj, cudf.Series):
+        obj = obj.dropna()
+        hashes = obj.hash_values()
+    else:
+        hashes = obj.hash_columns()
+    # Shift the signed 32-bit hashes into [0, 2 ** 32)
+    return hashes.astype("int64") + 2 ** 31
+
+
+def compute_hll_array(obj, b):
+    """Compute the HyperLogLog registers of a cudf DataFrame or Series.
+
+    Parameters
+    ----------
+    obj : cudf.DataFrame or cudf.Series
+    b : int
+        Number of hash bits used to select a register.
+
+    Returns
+    -------
+    np.ndarray of ``2 ** b`` uint8 registers.
+    """
+    if not 8 <= b <= 16:
+        raise ValueError("b should be between 8 and 16")
+    m = 1 << b
+    registers = np.zeros(m, dtype=np.uint8)
+    if len(obj) == 0:
+        return registers
+
+    hashes = _hashes(obj)
+    nbits = 32 - b
+    # digitize against powers of two gives the bit length of each word
+    bit_length = (hashes // m).digitize(
+        np.left_shift(1, np.arange(nbits, dtype="int64"))
+    )
+    sketch = cudf.DataFrame()
+    sketch["register"] = hashes % m
+    sketch["rank"] = (nbits + 1) - bit_length.astype("int64")
+    sketch = sketch.groupby("register", as_index=False, sort=False).max()
+    registers[sketch["register"].to_array()] = sketch["rank"].to_array()
+    return registers
+
+
+def reduce_state(registers):
+    """Merge the registers of several sketches.
+    """
+    return np.maximum.reduce(registers)
+
+
+def estimate_count(registers, b):
+    """Estimate the number of distinct values from merged registers.
+    """
+    registers = reduce_state(registers)
+    m = 1 << b
+
+    # Estimate the cardinality
+    if m == 16:
+        alpha = 0.673
+    elif m == 32:
+        alpha = 0.697
+    elif m == 64:
+        alpha = 0.709
+    else:
+        alpha = 0.7213 / (1.0 + 1.079 / m)
+    e = alpha * m ** 2 / (2.0 ** -registers.astype("f8")).sum()
+
+    # Small range correction
+    if e <= 2.5 * m:
+        zeros = (registers == 0).sum()
+        if zeros:
+            return m * np.log(m / zeros)
+    # Large range correction
+    elif e > 2 ** 32 / 30:
+        return -(2 ** 32) * np.log1p(-e / 2 ** 32)
+    return e
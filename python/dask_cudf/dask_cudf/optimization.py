@@ -0,0 +1,101 @@
+"""
+Graph optimization for dask_cudf collections.
+
+Chains of partition-wise operations (``map_partitions``, ``assign``,
+``astype``, arithmetic, ...) are first merged at the high-level-graph
+level, where each ``Blockwise`` layer knows that output block ``i`` only
+depends on input blocks ``i``. The merged graph is then culled and the
+remaining linear chains of tasks are fused, so that a pipeline of many
+elementwise steps runs as a single task per partition.
+
+Keys that already hold data, e.g. the partitions of a persisted
+collection, are plain values in the graph. They are never fused into
+tasks, so persisted results are reused instead of being recomputed.
+"""
+import logging
+
+import dask
+from dask.context import _globals
+from dask.core import flatten
+from dask.optimization import cull, fuse
+from dask.utils import ensure_dict
+
+try:
+    from dask.highlevelgraph import HighLevelGraph
+    from dask.blockwise import optimize_blockwise
+except ImportError:
+    HighLevelGraph = optimize_blockwise = None
+
+try:
+    from dask.blockwise import fuse_roots
+except ImportError:
+    fuse_roots = None
+
+logger = logging.getLogger(__name__)
+
+
+def _fuse_ave_width():
+    # Prefer the configuration namespace, but keep honouring the legacy
+    # ``fuse_ave_width`` global for backwards compatibility
+    default = _globals.get("fuse_ave_width", 1)
+    return dask.config.get("optimization.fuse.ave-width", default)
+
+
+def optimize(dsk, keys, return_stats=False, **kwargs):
+    """Optimize the graph *dsk* for computing *keys*.
+
+    Merges ``Blockwise`` layers of high-level graphs, culls tasks not
+    needed for *keys* and fuses linear chains of tasks.
+
+    Parameters
+    ----------
+    dsk : Mapping
+        The graph.
+    keys : list or key
+        The keys to compute.
+    return_stats : bool, default False
+        Also return the sizes of the graph, as a dict with the number of
+        ``layers`` and ``tasks`` in the graph before optimization, the
+        number of ``fused_tasks`` after it, and the number of
+        ``blockwise_layers`` left after merging ``Blockwise`` layers
+        (``None`` for graphs without layers).
+
+    Returns
+    -------
+    The optimized graph, or a tuple of the graph and its sizes if
+    *return_stats* is True.
+    """
+    flatkeys = list(flatten(keys)) if isinstance(keys, list) else [keys]
+
+    ntasks = len(dsk)
+    nlayers = nblockwise = None
+    if HighLevelGraph is not None and isinstance(dsk, HighLevelGraph):
+        nlayers = len(dsk.layers)
+        dsk = optimize_blockwise(dsk, keys=flatkeys)
+        if fuse_roots is not None:
+            dsk = fuse_roots(dsk, keys=flatkeys)
+        nblockwise = len(dsk.layers)
+
+    dsk = ensure_dict(dsk)
+    dsk, dependencies = cull(dsk, flatkeys)
+    dsk, dependencies = fuse(
+        dsk, flatkeys, dependencies=dependencies, ave_width=_fuse_ave_width()
+    )
+    dsk, _ = cull(dsk, flatkeys)
+
+    logger.debug(
+        "Optimized graph from %d to %d tasks (%s to %s layers)",
+        ntasks,
+        len(dsk),
+        nlayers,
+        nblockwise,
+    )
+    if return_stats:
+        stats = {
+            "layers": nlayers,
+            "blockwise_layers": nblockwise,
+            "tasks": ntasks,
+            "fused_tasks": len(dsk),
+        }
+        return dsk, stats
+    return dsk
@@ -0,0 +1,166 @@
+"""
+Mergeable quantile sketches for dask_cudf Series.
+
+A sketch summarizes a column with at most ``sketch_size`` sorted sample
+values, each standing for a weight (number of rows), plus the exact
+minimum and maximum. Sketches are built per partition from a cudf sort
+and merged in a tree reduction, recompressing to ``sketch_size`` points
+at every step so memory stays bounded. The rank error of a quantile is
+roughly ``1 / sketch_size``.
+"""
+import numpy as np
+
+import cudf
+
+DEFAULT_SKETCH_SIZE = 1000
+
+
+def _empty_sketch(dtype):
+    values = np.array([], dtype=dtype)
+    return values, np.array([], dtype="f8"), None, None
+
+
+def _compress(values, weights, sketch_size):
+    """Reduce sorted weighted *values* to at most *sketch_size* points.
+    """
+    if len(values) <= sketch_size:
+        return values, weights
+    cumweights = np.cumsum(weights)
+    total = cumweights[-1]
+    centers = (np.arange(sketch_size) + 0.5) * (total / sketch_size)
+    positions = np.searchsorted(cumweights, centers, side="left")
+    positions = np.clip(positions, 0, len(values) - 1)
+    return values[positions], np.full(sketch_size, total / sketch_size)
+
+
+def sketch_chunk(sr, sketch_size=DEFAULT_SKETCH_SIZE):
+    """Build the sketch of one cudf Series partition.
+    """
+    sr = sr.dropna()
+    n = len(sr)
+    if n == 0:
+        return _empty_sketch(sr.dtype)
+    sr = sr.sort_values()
+    if n <= sketch_size:
+        values = sr.to_array()
+        weights = np.ones(n, dtype="f8")
+    else:
+        bounds = np.linspace(0, n, sketch_size + 1).astype("int64")
+        positions = (bounds[:-1] + bounds[1:]) // 2
+        values = sr.take(positions).to_array()
+        weights = np.diff(bounds).astype("f8")
+    return values, weights, sr.iloc[0], sr.iloc[n - 1]
+
+
+def sketch_merge(sketches, sketch_size=DEFAULT_SKETCH_SIZE):
+    """Merge a list of sketches into one.
+    """
+    sketches = [s for s in sketches if len(s[0])]
+    if not sketches:
+        return _empty_sketch("f8")
+    values = np.concatenate([s[0] for s in sketches])
+    weights = np.concatenate([s[1] for s in sketches])
+    order = np.argsort(values, kind="mergesort")
+    values, weights = _compress(values[order], weights[order], sketch_size)
+    lo = min(s[2] for s in sketches)
+    hi = max(s[3] for s in sketches)
+    return values, weights, lo, hi
+
+
+def sketch_quantiles(sketch, q):
+    """Approximate quantiles *q* from a sketch.
+
+    Returns an array of the same length as *q*, or ``None`` if the sketch
+    summarizes no rows.
+    """
+    values, weights, lo, hi = sketch
+    if not len(values):
+        return None
+    q = np.atleast_1d(np.asarray(q, dtype="f8"))
+    cumweights = np.cumsum(weights)
+    # Quantile q falls on the point whose weight interval covers q * total
+    positions = np.searchsorted(cumweights, q * cumweights[-1], side="left")
+    out = values[np.clip(positions, 0, len(values) - 1)]
+    out[q <= 0] = lo
+    out[q >= 1] = hi
+    return out
+
+
+def quantile_aggregate(
+    sketches, q, sketch_size=DEFAULT_SKETCH_SIZE, name=None
+):
+    """Merge the final sketches and evaluate the quantiles *q*.
+    """
+    sketch = sketch_merge(sketches, sketch_size=sketch_size)
+    out = sketch_quantiles(sketch, q)
+    if np.isscalar(q):
+        return np.nan if out is None else out[0]
+    if out is None:
+        out = np.full(len(q), np.nan)
+    return cudf.Series(out, index=list(q), name=name)
+
+
+def describe_chunk(sr, sketch_size=DEFAULT_SKETCH_SIZE):
+    """Sketch and moments (count, mean, sum of squared deviations from the
+    mean) of one partition.
+    """
+    values = sr.dropna().astype("float64")
+    count = values.count()
+    if count == 0:
+        return sketch_chunk(sr, sketch_size=sketch_size), 0, 0.0, 0.0
+    mean = values.mean()
+    deviations = values - mean
+    return (
+        sketch_chunk(sr, sketch_size=sketch_size),
+        count,
+        mean,
+        (deviations * deviations).sum(),
+    )
+
+
+def _merge_moments(a, b):
+    """Merge two (count, mean, m2) triples with Chan's parallel formula.
+    """
+    count_a, mean_a, m2_a = a
+    count_b, mean_b, m2_b = b
+    count = count_a + count_b
+    if count == 0:
+        return 0, 0.0, 0.0
+    delta = mean_b - mean_a
+    mean = mean_a + delta * count_b / count
+    m2 = m2_a + m2_b + delta * delta * count_a * count_b / count
+    return count, mean, m2
+
+
+def describe_combine(parts, sketch_size=DEFAULT_SKETCH_SIZE):
+    sketch = sketch_merge([p[0] for p in parts], sketch_size=sketch_size)
+    moments = (0, 0.0, 0.0)
+    for part in parts:
+        moments = _merge_moments(moments, part[1:])
+    return (sketch,) + moments
+
+
+def describe_aggregate(
+    parts, percentiles, sketch_size=DEFAULT_SKETCH_SIZE, name=None
+):
+    """Summary statistics laid out like ``cudf.Series.describe``.
+    """
+    sketch, count, mean, m2 = describe_combine(parts, sketch_size=sketch_size)
+    quantiles = sketch_quantiles(sketch, [0] + list(percentiles) + [1])
+    if quantiles is None:
+        quantiles = np.full(len(percentiles) + 2, np.nan)
+    quantiles = quantiles.astype("f8")
+    if count == 0:
+        mean = np.nan
+    if count > 1:
+        std = np.sqrt(m2 / (count - 1))
+    else:
+        std = np.nan
+    names = (
+        ["count", "mean", "std", "min"]
+        + ["{0}%".format(int(x * 100)) for x in percentiles]
+        + ["max"]
+    )
+    data = [count, mean, std] + quantiles.tolist()
+    data = list(map(lambda x: round(x, 6), data))
+    return cudf.Series(data=data, index=names, nan_as_null=False, name=name)
@@ -0,0 +1,199 @@
+"""
+Rolling window calculations across partition boundaries.
+
+Each partition is extended with the rows of its neighbours that fall
+inside the window, the cudf rolling aggregation (``libcudf.rolling``) is
+applied to the extended frame, and the result is trimmed back to the rows
+of the partition. The rows to borrow are passed along a chain of small
+tasks, so windows may span several short partitions.
+"""
+import pandas as pd
+from toolz import partial
+
+from dask import delayed
+from dask.dataframe import from_delayed
+
+import cudf
+
+
+def _head(df, n):
+    return df.head(n)
+
+
+def _tail(df, n):
+    return df.tail(n)
+
+
+def _time_tail(df, window):
+    """Rows of *df* within *window* of its last index value."""
+    if len(df) == 0:
+        return df
+    index = cudf.Series(df.index)
+    # The index is sorted, so this counts the rows that are too old
+    start = int((index <= index.max() - window.to_timedelta64()).sum())
+    return df[start:]
+
+
+def _carry(prev_carry, prev_part, take):
+    """Rows to borrow from everything before the next partition."""
+    if prev_carry is None:
+        return take(prev_part)
+    return take(cudf.concat([prev_carry, prev_part]))
+
+
+def _rolling_partition(before, df, after, agg, window, rolling_kwargs):
+    frames = [f for f in (before, df, after) if f is not None and len(f)]
+    combined = cudf.concat(frames) if frames else df
+    out = combined.rolling(window, **rolling_kwargs)
+    if callable(agg):
+        out = out.apply(agg)
+    else:
+        out = getattr(out, agg)()
+    start = len(before) if before is not None else 0
+    return out[start : start + len(df)]
+
+
+class Rolling(object):
+    """Rolling window calculations on a dask_cudf DataFrame or Series.
+
+    Parameters
+    ----------
+    obj : dask_cudf.DataFrame or dask_cudf.Series
+    window : int or offset
+        Size of the window. For a ``DatetimeIndex``, an offset convertible
+        to a timedelta can be given instead.
+    min_periods : int, optional
+        The minimum number of non-null observations in the window required
+        for a non-null result.
+    center : bool, optional
+        If ``True``, the result is set at the center of the window.
+    """
+
+    def __init__(
+        self, obj, window, min_periods=None, center=False, win_type=None
+    ):
+        self.obj = obj
+        self.window = window
+        self.min_periods = min_periods
+        self.center = center
+        self.win_type = win_type
+        if not pd.api.types.is_integer(window):
+            if center:
+                raise NotImplementedError(
+                    "center is not implemented for offset-based windows"
+                )
+            self.window = pd.to_timedelta(window)
+        elif window <= 0:
+            raise ValueError("window cannot be zero or negative")
+
+    def __getitem__(self, arg):
+        if isinstance(arg, tuple):
+            arg = list(arg)
+        return Rolling(
+            self.obj[arg],
+            self.window,
+            min_periods=self.min_periods,
+            center=self.center,
+            win_type=self.win_type,
+        )
+
+    def __getattr__(self, key):
+        if key == "obj":
+            raise AttributeError()
+        if key in self.obj.columns:
+            return self[key]
+        raise AttributeError(
+            "'Rolling' object has no attribute '{}'".format(key)
+        )
+
+    @property
+    def _rolling_kwargs(self):
+        return {
+            "min_periods": self.min_periods,
+            "center": self.center,
+            "win_type": self.win_type,
+        }
+
+    def _borrow(self):
+        """Return functions selecting the rows borrowed from the previous
+        and the next partitions, or ``None`` where nothing is needed.
+        """
+        if isinstance(self.window, pd.Timedelta):
+            return partial(_time_tail, window=self.window), None
+        if self.center:
+            nbefore = self.window // 2
+            nafter = self.window - nbefore - 1
+        else:
+            nbefore = self.window - 1
+            nafter = 0
+        take_before = partial(_tail, n=nbefore) if nbefore else None
+        take_after = partial(_head, n=nafter) if nafter else None
+        return take_before, take_after
+
+    def _apply(self, agg):
+        parts = self.obj.to_delayed()
+        nparts = len(parts)
+        take_before, take_after = self._borrow()
+
+        before = [None] * nparts
+        if take_before is not None:
+            carry = None
+            for i in range(1, nparts):
+                carry = delayed(_carry)(carry, parts[i - 1], take_before)
+                before[i] = carry
+
+        after = [None] * nparts
+        if take_after is not None:
+            carry = None
+            for i in range(nparts - 2, -1, -1):
+                carry = delayed(_carry)(carry, parts[i + 1], take_after)
+                after[i] = carry
+
+        rolling_kwargs = self._rolling_kwargs
+        outparts = [
+            delayed(_rolling_partition)(
+                before[i], parts[i], after[i], agg, self.window, rolling_kwargs
+            )
+            for i in range(nparts)
+        ]
+        meta = _rolling_partition(
+            None,
+            self.obj._meta_nonempty,
+            None,
+            agg,
+            self.window,
+            rolling_kwargs,
+        )
+        return from_delayed(
+            outparts,
+            meta=meta.head(0),
+            divisions=self.obj.divisions,
+            prefix="rolling",
+        )
+
+    def sum(self):
+        return self._apply("sum")
+
+    def min(self):
+        return self._apply("min")
+
+    def max(self):
+        return self._apply("max")
+
+    def mean(self):
+        return self._apply("mean")
+
+    def count(self):
+        return self._apply("count")
+
+    def apply(self, func):
+        """Apply the user defined function *func* on each window.
+
+        See ``cudf.core.window.Rolling.apply``.
+        """
+        return self._apply(func)
+
+    def __repr__(self):
+        return "{} [window={},min_periods={},center={}]".format(
+            self.__class__.__name__, self.window, self.min_periods, self.center
+        )
@@ -0,0 +1,132 @@
+"""
+Range-partitioned sorting of dask_cudf frames.
+
+Balanced divisions are chosen from an approximate quantile sketch of the
+key column. Each input partition is then sorted locally and sliced at the
+division boundaries, and the slices belonging to the same output range
+are concatenated and sorted again.
+"""
+import numpy as np
+
+from dask import delayed
+from dask.dataframe import from_delayed
+
+import cudf
+
+from dask_cudf import quantiles
+
+
+def quantile_divisions(frame, by, npartitions, upsample=1.0):
+    """Compute divisions of *frame* on column *by*.
+
+    Parameters
+    ----------
+    frame : dask_cudf.DataFrame
+    by : str
+        Name of the key column.
+    npartitions : int
+        Desired number of output partitions.
+    upsample : float
+        Scales the size of the quantile sketch used to pick divisions.
+
+    Returns
+    -------
+    list of unique, sorted division values (may be shorter than
+    ``npartitions + 1`` when the key has few distinct values).
+    """
+    sketch_size = max(
+        int(upsample * quantiles.DEFAULT_SKETCH_SIZE), 2 * npartitions
+    )
+    qs = np.linspace(0, 1, npartitions + 1).tolist()
+    divisions = frame[by].quantile(qs, sketch_size=sketch_size).compute()
+    divisions = divisions.dropna()
+    if len(divisions) == 0:
+        return []
+    divisions = np.unique(divisions.to_array())
+    if len(divisions) == 1:
+        divisions = np.repeat(divisions, 2)
+    return list(divisions)
+
+
+def _split_by_divisions(df, by, divisions):
+    """Sort *df* on *by* and slice it at the inner *divisions*.
+
+    Rows equal to ``divisions[i]`` go to output ``i``; the last output
+    range is closed so it also holds ``divisions[-1]``. Rows with a null
+    key sort last and go to the last output.
+    """
+    df = df.sort_values(by, na_position="last")
+    nparts = len(divisions) - 1
+    if len(df) == 0:
+        return [df] * nparts
+    key = df[by]
+    # Only search the valid keys, the nulls follow them
+    key = key[: len(key) - key.null_count]
+    inner = np.asarray(divisions[1:-1], dtype=key.dtype)
+    splits = [0]
+    if len(inner):
+        splits += list(key.searchsorted(inner, side="left").to_array())
+    splits.append(len(df))
+    return [df[s:e] for s, e in zip(splits[:-1], splits[1:])]
+
+
+def _collect_range(pieces, by, drop):
+    """Concatenate the slices of one output range and index them by *by*.
+    """
+    out = cudf.concat(list(pieces)).sort_values(by, na_position="last")
+    return out.set_index(by, drop=drop)
+
+
+def sort_by_divisions(frame, by, divisions, drop=True):
+    """Range-partition *frame* on *by* into ``len(divisions) - 1`` sorted
+    partitions indexed by *by*. Rows with a null key are placed at the end
+    of the last partition, like ``na_position="last"``.
+    """
+    nparts = len(divisions) - 1
+    split = [
+        delayed(_split_by_divisions, nout=nparts)(p, by, divisions)
+        for p in frame.to_delayed()
+    ]
+    outparts = [
+        delayed(_collect_range)([s[i] for s in split], by, drop)
+        for i in range(nparts)
+    ]
+    meta = frame._meta.set_index(by, drop=drop)
+    return from_delayed(
+        outparts, meta=meta, divisions=divisions, prefix="set-index-sorted"
+    )
+
+
+def set_index_sorted(
+    frame, by, npartitions=None, divisions=None, drop=True, upsample=1.0
+):
+    """Set the index of *frame* to column *by*, sorting across partitions.
+
+    Rows with a null key are placed at the end of the last partition.
+
+    Parameters
+    ----------
+    frame : dask_cudf.DataFrame
+    by : str
+        Name of the column to use as the new index.
+    npartitions : int, optional
+        Number of output partitions. Defaults to ``frame.npartitions``.
+    divisions : list, optional
+        Known divisions to use instead of sampling the key.
+    drop : bool
+        Whether to drop the key column from the output.
+    upsample : float
+        Oversampling factor used when sampling quantiles of the key.
+    """
+    if divisions is None:
+        npartitions = npartitions or frame.npartitions
+        divisions = quantile_divisions(
+            frame, by, npartitions, upsample=upsample
+        )
+    if not divisions:
+        # Nothing but nulls or no rows at all
+        return frame.map_partitions(
+            lambda df: df.set_index(by, drop=drop),
+            meta=frame._meta.set_index(by, drop=drop),
+        )
+    return sort_by_divisions(frame, by, divisions, drop=drop)
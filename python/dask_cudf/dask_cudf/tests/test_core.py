@@ -175,6 +175,72 @@ def test_set_index_2(nelem):
         assert_frame_equal_by_index_group(expect, got)
 
 
+@pytest.mark.parametrize("nelem", [10, 200, 1333])
+@pytest.mark.parametrize("npartitions", [1, 3, 7])
+def test_set_index_divisions(nelem, npartitions):
+    with dask.config.set(scheduler="single-threaded"):
+        np.random.seed(0)
+        df = pd.DataFrame(
+            {
+                "x": np.random.randint(0, nelem // 2 + 1, size=nelem),
+                "y": np.random.normal(size=nelem),
+            }
+        )
+        dgf = dgd.from_cudf(cudf.DataFrame.from_pandas(df), npartitions=4)
+        res = dgf.set_index("x", npartitions=npartitions)
+
+        assert res.known_divisions
+        assert res.npartitions <= npartitions
+        parts = [p.to_pandas() for p in dask.compute(*res.to_delayed())]
+        for part, lo, hi in zip(parts, res.divisions, res.divisions[1:]):
+            assert part.index.is_monotonic_increasing
+            if len(part):
+                assert part.index.min() >= lo
+                assert part.index.max() <= hi
+
+        got = res.compute().to_pandas()
+        assert_frame_equal_by_index_group(df.set_index("x"), got)
+
+
+def test_set_index_null_keys():
+    with dask.config.set(scheduler="single-threaded"):
+        np.random.seed(0)
+        x = np.random.randint(0, 50, size=200).astype(np.float64)
+        x[::7] = np.nan
+        df = pd.DataFrame({"x": x, "y": np.arange(200)})
+        dgf = dgd.from_cudf(cudf.DataFrame.from_pandas(df), npartitions=4)
+        res = dgf.set_index("x", npartitions=3)
+
+        parts = [p.to_pandas() for p in dask.compute(*res.to_delayed())]
+        assert sum(map(len, parts)) == len(df)
+        for i, (part, lo, hi) in enumerate(
+            zip(parts, res.divisions, res.divisions[1:])
+        ):
+            valid = part.index[part.index.notnull()]
+            assert valid.is_monotonic_increasing
+            if len(valid):
+                assert valid.min() >= lo
+                assert valid.max() <= hi
+            if i < len(parts) - 1:
+                assert len(valid) == len(part)
+        # The nulls are at the end of the last partition
+        last = parts[-1].index
+        nnull = int(np.isnan(x).sum())
+        assert last[len(last) - nnull :].isnull().all()
+
+
+def test_set_index_sorted():
+    with dask.config.set(scheduler="single-threaded"):
+        df = pd.DataFrame({"x": np.arange(20), "y": np.arange(20) * 2})
+        dgf = dgd.from_cudf(cudf.DataFrame.from_pandas(df), npartitions=4)
+        dgf = dgf.clear_divisions()
+
+        res = dgf.set_index("x", sorted=True)
+        assert res.divisions == (0, 5, 10, 15, 19)
+        dd.assert_eq(res, df.set_index("x"))
+        dd.assert_eq(res.loc[6:12], df.set_index("x").loc[6:12])
+
+
 @pytest.mark.xfail(reason="dask's index name '__dask_cudf.index' is correct")
 def test_set_index_w_series():
     with dask.config.set(scheduler="single-threaded"):
@@ -319,6 +385,31 @@ def test_repartition_simple_divisions(start, stop):
     dd.utils.assert_eq(a, b)
 
 
+@pytest.mark.parametrize("npartitions", [1, 4, 20])
+@pytest.mark.parametrize("partition_size", [1000, "4kB", 10 ** 6])
+def test_repartition_partition_size(npartitions, partition_size):
+    pdf = pd.DataFrame(
+        {"x": np.arange(1000), "y": np.arange(1000, dtype="float64")}
+    )
+    pdf["s"] = ["abcdef"[: i % 6] for i in range(1000)]
+    gdf = cudf.from_pandas(pdf)
+    gddf = dgd.from_cudf(gdf, npartitions=npartitions)
+
+    result = gddf.repartition(partition_size=partition_size)
+    limit = partition_size
+    if isinstance(limit, str):
+        limit = dask.utils.parse_bytes(limit)
+    parts = dask.compute(*result.to_delayed())
+    if len(parts) > 1:
+        # Row slices are only approximately equal in size
+        assert max(part.__sizeof__() for part in parts) <= 2 * limit
+
+    dd.utils.assert_eq(result, pdf, check_index=False)
+    dd.utils.assert_eq(
+        gddf.x.repartition(partition_size=partition_size), pdf.x
+    )
+
+
 @pytest.fixture
 def pdf():
     return pd.DataFrame(
@@ -393,3 +484,29 @@ def test_boolean_index(gdf, gddf):
     gddf2 = gddf[gddf.x > 2]
 
     dd.assert_eq(gdf2, gddf2)
+
+
+def test_optimize_fuses_elementwise_chain():
+    from dask_cudf.optimization import optimize
+
+    pdf = pd.DataFrame({"x": np.arange(100), "y": np.arange(100) * 1.0})
+    gddf = dgd.from_cudf(cudf.DataFrame.from_pandas(pdf), npartitions=4)
+
+    out = gddf
+    for i in range(20):
+        out = out.assign(z=out.x + i)
+        out = out[out.y >= 0]
+    dsk, stats = optimize(
+        out.__dask_graph__(), out.__dask_keys__(), return_stats=True
+    )
+
+    # One task per partition on top of the partitions' data
+    assert len(dsk) == 2 * gddf.npartitions
+    assert stats["fused_tasks"] == len(dsk)
+    assert stats["tasks"] > stats["fused_tasks"]
+
+    expect = pdf
+    for i in range(20):
+        expect = expect.assign(z=expect.x + i)
+        expect = expect[expect.y >= 0]
+    dd.assert_eq(out, expect)
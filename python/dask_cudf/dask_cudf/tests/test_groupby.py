@@ -40,10 +40,8 @@ def test_groupby_basic_aggs(agg):
     "func",
     [
         lambda df: df.groupby("x").agg({"y": "max"}),
-        pytest.param(
-            lambda df: df.groupby("x").y.agg(["sum", "max"]),
-            marks=pytest.mark.skip,
-        ),
+        lambda df: df.groupby("x").y.agg(["sum", "max"]),
+        lambda df: df.groupby("x").agg({"y": ["sum", "mean"]}),
     ],
 )
 def test_groupby_agg(func):
@@ -69,6 +67,35 @@ def test_groupby_agg(func):
     dd.assert_eq(a, b)
 
 
+@pytest.mark.parametrize("split_every", [2, 8, False])
+@pytest.mark.parametrize("split_out", [1, 3])
+@pytest.mark.parametrize("agg", ["sum", "mean", "count", "min", "max"])
+def test_groupby_split_every_split_out(agg, split_every, split_out):
+    pdf = pd.DataFrame(
+        {
+            "x": np.random.randint(0, 1000, size=10000),
+            "y": np.random.normal(size=10000),
+        }
+    )
+
+    gdf = cudf.DataFrame.from_pandas(pdf)
+
+    ddf = dask_cudf.from_cudf(gdf, npartitions=10)
+
+    a = getattr(gdf.groupby("x"), agg)().to_pandas()
+    b = getattr(ddf.groupby("x"), agg)(
+        split_every=split_every, split_out=split_out
+    )
+    assert b.npartitions == split_out
+    b = b.compute().to_pandas().sort_index()
+
+    if agg == "count":
+        a["y"] = a["y"].astype(np.int64)
+        b["y"] = b["y"].astype(np.int64)
+
+    dd.assert_eq(a, b, check_names=False)
+
+
 @pytest.mark.xfail(reason="cudf issues")
 @pytest.mark.parametrize(
     "func",
@@ -159,3 +186,44 @@ def test_reset_index_multiindex():
         .reset_index()
         .merge(ddf_lookup, on="id_1"),
     )
+
+
+@pytest.mark.parametrize(
+    "func",
+    [
+        lambda df: df.groupby("x").size(),
+        lambda df: df.groupby("x").y.agg("first"),
+        lambda df: df.groupby("x", group_keys=True).y.sum(),
+    ],
+)
+def test_groupby_fallback(func):
+    pdf = pd.DataFrame(
+        {
+            "x": np.random.randint(0, 5, size=1000),
+            "y": np.random.normal(size=1000),
+        }
+    )
+
+    ddf = dask_cudf.from_cudf(cudf.DataFrame.from_pandas(pdf), npartitions=5)
+
+    a = func(pdf)
+    b = func(ddf).compute().to_pandas()
+
+    dd.assert_eq(a, b, check_names=False, check_dtype=False)
+
+
+@pytest.mark.parametrize("split_every", [2, False])
+def test_groupby_var_large_mean(split_every):
+    pdf = pd.DataFrame(
+        {
+            "x": np.random.randint(0, 5, size=10000),
+            "y": np.random.normal(loc=1e9, size=10000),
+        }
+    )
+
+    ddf = dask_cudf.from_cudf(cudf.DataFrame.from_pandas(pdf), npartitions=8)
+
+    a = pdf.groupby("x").y.var()
+    b = ddf.groupby("x").y.var(split_every=split_every).compute().to_pandas()
+
+    dd.assert_eq(a, b, check_names=False)
@@ -330,3 +330,22 @@ def test_single_partition():
     m2 = dleft.merge(right, how="inner")
     assert len(m2.dask) < len(dleft.dask) * 3
     assert len(m2) == 100
+
+
+@pytest.mark.parametrize("how", ["leftsemi", "leftanti"])
+def test_merge_leftsemi_leftanti(how):
+    np.random.seed(0)
+    left = cudf.DataFrame(
+        {"x": np.random.randint(0, 8, size=20), "a": np.arange(20.0)}
+    )
+    right = cudf.DataFrame(
+        {"x": np.random.randint(0, 8, size=10), "b": np.arange(10.0)}
+    )
+    expect = left.merge(right, on="x", how=how).to_pandas()
+    expect = expect.sort_values("a").reset_index(drop=True)
+
+    dleft = dgd.from_cudf(left, chunksize=6)
+    for dright in [dgd.from_cudf(right, chunksize=4), right]:
+        got = dleft.merge(dright, on="x", how=how).compute().to_pandas()
+        got = got.sort_values("a").reset_index(drop=True)
+        dd.assert_eq(expect, got)
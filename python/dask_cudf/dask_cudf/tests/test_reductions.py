@@ -42,3 +42,94 @@ def test_series_reduce(reducer):
     got = reducer(gdf.x)
     exp = reducer(df.x)
     assert_eq(got, exp)
+
+
+@pytest.mark.parametrize("split_every", [2, None])
+@pytest.mark.parametrize("split_out", [1, 3])
+def test_drop_duplicates(split_every, split_out):
+    np.random.seed(0)
+    df, gdf = _make_random_frame(1000, npartitions=10)
+
+    got = gdf.drop_duplicates(
+        subset=["x"], split_every=split_every, split_out=split_out
+    )
+    assert got.npartitions == split_out
+    got = got.compute().to_pandas()
+    assert sorted(got.x) == sorted(df.x.unique())
+
+    got = gdf.x.drop_duplicates(split_every=split_every, split_out=split_out)
+    assert sorted(got.compute().to_array()) == sorted(df.x.unique())
+
+
+@pytest.mark.parametrize("split_every", [2, None])
+@pytest.mark.parametrize("split_out", [1, 3])
+def test_drop_duplicates_keep_false(split_every, split_out):
+    df = pd.DataFrame({"x": [1, 2, 1, 3, 4, 3, 5, 1], "y": range(8)})
+    gdf = dgd.from_cudf(gd.DataFrame.from_pandas(df), npartitions=4)
+
+    got = gdf.drop_duplicates(
+        subset="x", keep=False, split_every=split_every, split_out=split_out
+    )
+    got = got.compute().to_pandas()
+    expect = df.drop_duplicates(subset="x", keep=False)
+    assert sorted(got.y) == sorted(expect.y)
+
+
+@pytest.mark.parametrize("split_out", [1, 3])
+def test_nunique(split_out):
+    np.random.seed(0)
+    df = pd.DataFrame({"x": np.random.randint(0, 500, size=10000)})
+    gdf = dgd.from_cudf(gd.DataFrame.from_pandas(df), npartitions=10)
+
+    assert gdf.x.nunique(split_out=split_out).compute() == df.x.nunique()
+
+
+def test_nunique_approx():
+    np.random.seed(0)
+    df = pd.DataFrame({"x": np.random.randint(0, 50000, size=100000)})
+    gdf = dgd.from_cudf(gd.DataFrame.from_pandas(df), npartitions=10)
+
+    expect = df.x.nunique()
+    got = gdf.x.nunique_approx().compute()
+    assert abs(got - expect) / expect < 0.05
+
+    got = gdf.nunique_approx(split_every=2).compute()
+    assert abs(got - expect) / expect < 0.05
+
+
+@pytest.mark.parametrize("q", [0.5, [0.0, 0.1, 0.5, 0.9, 1.0]])
+@pytest.mark.parametrize("split_every", [2, None])
+def test_series_quantile(q, split_every):
+    np.random.seed(0)
+    df = pd.DataFrame({"x": np.random.normal(size=100000)})
+    gdf = dgd.from_cudf(gd.DataFrame.from_pandas(df), npartitions=10)
+
+    got = gdf.x.quantile(q, split_every=split_every).compute()
+    expect = df.x.quantile(q)
+    if np.isscalar(q):
+        np.testing.assert_allclose(got, expect, atol=0.02)
+    else:
+        got = got.to_pandas()
+        np.testing.assert_allclose(got.values, expect.values, atol=0.02)
+        np.testing.assert_array_equal(got.index, expect.index)
+
+
+def test_series_describe():
+    np.random.seed(0)
+    df = pd.DataFrame({"x": np.random.normal(size=100000)})
+    gdf = dgd.from_cudf(gd.DataFrame.from_pandas(df), npartitions=10)
+
+    got = gdf.x.describe().compute().to_pandas()
+    expect = df.x.describe()
+    assert list(got.index) == list(expect.index)
+    np.testing.assert_allclose(got.values, expect.values, atol=0.02)
+
+
+def test_series_describe_large_mean():
+    np.random.seed(0)
+    df = pd.DataFrame({"x": np.random.normal(loc=1e9, size=100000)})
+    gdf = dgd.from_cudf(gd.DataFrame.from_pandas(df), npartitions=10)
+
+    got = gdf.x.describe(split_every=2).compute().to_pandas()
+    np.testing.assert_allclose(got["std"], df.x.std(), rtol=1e-6)
+    np.testing.assert_allclose(got["mean"], df.x.mean(), rtol=1e-12)
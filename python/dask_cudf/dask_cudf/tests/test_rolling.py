@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import dask.dataframe as dd
+
+import cudf
+
+import dask_cudf
+
+
+@pytest.mark.parametrize("window", [1, 3, 10])
+@pytest.mark.parametrize("center", [True, False])
+@pytest.mark.parametrize("agg", ["sum", "min", "max", "mean", "count"])
+def test_rolling_series(window, center, agg):
+    np.random.seed(0)
+    psr = pd.Series(np.random.randint(0, 100, size=50).astype("float64"))
+    gsr = cudf.Series.from_pandas(psr)
+    # Partitions shorter than the window need rows from several neighbours
+    dsr = dask_cudf.from_cudf(gsr, npartitions=8)
+
+    expect = getattr(gsr.rolling(window, center=center), agg)()
+    got = getattr(dsr.rolling(window, center=center), agg)()
+
+    dd.assert_eq(expect, got)
+
+
+@pytest.mark.parametrize("window", [2, 4])
+def test_rolling_dataframe(window):
+    np.random.seed(0)
+    pdf = pd.DataFrame(
+        {"x": np.random.normal(size=40), "y": np.random.normal(size=40)}
+    )
+    gdf = cudf.DataFrame.from_pandas(pdf)
+    ddf = dask_cudf.from_cudf(gdf, npartitions=5)
+
+    dd.assert_eq(
+        gdf.rolling(window, min_periods=1).sum(),
+        ddf.rolling(window, min_periods=1).sum(),
+    )
+    dd.assert_eq(gdf.rolling(window).x.mean(), ddf.rolling(window).x.mean())
+
+
+@pytest.mark.parametrize("window", ["2s", "5s"])
+def test_rolling_offset(window):
+    index = pd.date_range("2019-01-01", periods=60, freq="1s")
+    pdf = pd.DataFrame({"x": np.arange(60, dtype="float64")}, index=index)
+    gdf = cudf.DataFrame.from_pandas(pdf)
+    ddf = dask_cudf.from_cudf(gdf, npartitions=7)
+
+    dd.assert_eq(gdf.rolling(window).sum(), ddf.rolling(window).sum())